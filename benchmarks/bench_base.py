@@ -0,0 +1,184 @@
+"""Micro-benchmarks of the hot functions in 'commands/base.py', with a complexity check for CI.
+
+Each function is timed on synthetic configs of increasing size (like 'timeit', best of '--repeat').
+The exponent 'k' of 'time ~ nodes^k' is fitted over the sizes and compared to the expected complexity:
+- per config (resolve, validate, target names): linear, k ~ 1
+- per group or node (scopes and capabilities of one group): constant, k ~ 0
+A fitted exponent above 'expected + tolerance' (like an accidental quadratic scan) exits with 1.
+Exponents are independent of the machine, unlike absolute timings, so no baselines are required.
+
+A command is created in dry-run mode against the local CDF stand-in, with all target datasets
+'deployed' in its cache, which is the state 'generate_groups()' runs in.
+
+Usage:
+    poetry run python -m benchmarks.bench_base [--nodes 100 300 1000] [--json bench-base.json]
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from cognite.client.data_classes import DataSet, DataSetList
+
+from bootstrap.app_config import CommandMode, RoleType, ScopeCtxType
+from bootstrap.commands.deploy import CommandDeploy
+from bootstrap.common.tracing import TRACER
+from tests.cdf_standin import CdfStandin
+
+from .synthetic_config import write_config
+from .timing import best_of
+
+CDF_PROJECT = "benchmark"
+# expected exponent of 'time ~ nodes^k'
+CONSTANT, LINEAR = 0, 1
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    expected: int
+    # nodes : seconds per call
+    seconds: dict[int, float] = field(default_factory=dict)
+    exponent: float = 0.0
+
+
+def create_command(config_path: Path) -> CommandDeploy:
+    command = CommandDeploy(str(config_path), command=CommandMode.DEPLOY, debug=False, dry_run=True)
+    target_datasets = command.generate_target_datasets()
+    command.deployed.datasets.create(
+        resources=DataSetList(
+            [
+                DataSet(id=i, name=name, external_id=details["external_id"])
+                for i, (name, details) in enumerate(target_datasets.items(), 1)
+            ]
+        )
+    )
+    # like 'CommandDeploy.command()' before generating the groups
+    command.all_scoped_ctx = {
+        ScopeCtxType.RAWDB: list(command.generate_target_raw_dbs()),
+        ScopeCtxType.DATASET: list(target_datasets),
+        ScopeCtxType.SPACE: list(command.generate_target_spaces()),
+    }
+    return command
+
+
+def get_benchmarks(command: CommandDeploy) -> dict[str, tuple[int, Callable[[], Any]]]:
+    """name : (expected exponent, function to time)"""
+    # a node in the middle of the config, with its namespace
+    namespace = command.bootstrap_config.namespaces[len(command.bootstrap_config.namespaces) // 2]
+    node = namespace.ns_nodes[len(namespace.ns_nodes) // 2]
+    ns_name = namespace.ns_name
+    scope_ctx = command.get_scope_ctx_groupedby_role_type(RoleType.OWNER, ns_name, node)[RoleType.OWNER]
+
+    return {
+        # per config
+        "resolve_config": (LINEAR, command.resolve_config),
+        "validate_config_length_limits": (LINEAR, command.validate_config_length_limits),
+        "validate_config_shared_access": (CONSTANT, command.validate_config_shared_access),
+        "generate_target_datasets": (LINEAR, command.generate_target_datasets),
+        "generate_target_raw_dbs": (LINEAR, command.generate_target_raw_dbs),
+        "generate_target_spaces": (LINEAR, command.generate_target_spaces),
+        "dataset_names_to_ids (all)": (LINEAR, lambda: command.dataset_names_to_ids(list(command.resolved.datasets))),
+        "generate_group (root level)": (
+            LINEAR,
+            lambda: command.generate_group_name_and_capabilities(role_type=RoleType.OWNER),
+        ),
+        # per group
+        "get_scope_ctx_groupedby_role_type": (
+            CONSTANT,
+            lambda: command.get_scope_ctx_groupedby_role_type(RoleType.OWNER, ns_name, node),
+        ),
+        "generate_scope (datasets)": (CONSTANT, lambda: command.generate_scope("datasets", scope_ctx)),
+        "generate_scope (raw)": (CONSTANT, lambda: command.generate_scope("raw", scope_ctx)),
+        "dataset_names_to_ids (node)": (
+            CONSTANT,
+            lambda: command.dataset_names_to_ids(scope_ctx[ScopeCtxType.DATASET]),
+        ),
+        "generate_group (node level)": (
+            CONSTANT,
+            lambda: command.generate_group_name_and_capabilities(role_type=RoleType.OWNER, ns_name=ns_name, node=node),
+        ),
+    }
+
+
+def fit_exponent(seconds: dict[int, float]) -> float:
+    """Least-squares slope of log(seconds) over log(nodes)"""
+    xs = [math.log(nodes) for nodes in seconds]
+    ys = [math.log(max(s, 1e-9)) for s in seconds.values()]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / variance if variance else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[100, 300, 1_000])
+    parser.add_argument("--nodes-per-namespace", type=int, default=50)
+    parser.add_argument("--shared-access-fanout", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="accepted exponent above the expected one")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args()
+    if len(args.nodes) < 2:
+        parser.error("at least two '--nodes' sizes are required to fit the complexity")
+
+    # the commands log each resolved scope and dry-run action
+    logging.disable(logging.INFO)
+    results: dict[str, BenchmarkResult] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir, CdfStandin(project=CDF_PROJECT) as cdf:
+        os.environ.update(cdf.envs())
+        for nodes in sorted(args.nodes):
+            config_path = write_config(
+                Path(tmp_dir) / f"config-{nodes}.yml",
+                nodes,
+                args.nodes_per_namespace,
+                cdf_project=CDF_PROJECT,
+                shared_access_fanout=args.shared_access_fanout,
+            )
+            command = create_command(config_path)
+            for name, (expected, func) in get_benchmarks(command).items():
+                result = results.setdefault(name, BenchmarkResult(name=name, expected=expected))
+                result.seconds[nodes] = best_of(args.repeat, func, autorange=True)
+                # spans of the '@traced' functions
+                TRACER.reset()
+
+    sizes = sorted(args.nodes)
+    print(f"{'function':<36} " + " ".join(f"{f'{n} [ms]':>12}" for n in sizes) + f" {'k':>6} {'expected':>9}")
+    regressions = []
+    for result in results.values():
+        result.exponent = round(fit_exponent(result.seconds), 2)
+        print(
+            f"{result.name:<36} "
+            + " ".join(f"{result.seconds[n] * 1000:>12.4f}" for n in sizes)
+            + f" {result.exponent:>6.2f} {result.expected:>9}"
+        )
+        if result.exponent > result.expected + args.tolerance:
+            regressions.append(f"{result.name}: nodes^{result.exponent}, expected nodes^{result.expected}")
+
+    if args.json:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "nodes": sizes,
+            "benchmarks": {
+                r.name: {"expected_exponent": r.expected, "exponent": r.exponent, "seconds": r.seconds}
+                for r in results.values()
+            },
+        }
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if regressions:
+        print("\nCOMPLEXITY REGRESSIONS:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nNo complexity regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Offline benchmark of the cli commands against the CDF stand-in ('tests/cdf_standin.py').
+
+Per synthetic config size it runs in one process with a real CogniteClient
+- 'deploy' into an empty project, and again as no-op redeploy
+- 'diff' of the deployed project (read-only)
+- a no-op tick of a running 'reconcile', without its startup
+- 'delete' of all deployed groups, spaces, RAW DBs and datasets (which are deprecated)
+- 'prepare'
+and reports wall-clock time, API calls and bytes sent. The stand-in can add latency, a rate limit
+and random (retryable) errors to each request, to see how the commands behave under CDF-like conditions.
+
+Usage:
+    poetry run python -m benchmarks.bench_commands [--nodes 10 100 1000] [--latency 0.05] [--rate-limit 50]
+        [--max-workers 10] [--max-retries 3] [--max-retry-backoff 2]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.delete import CommandDelete
+from bootstrap.commands.deploy import CommandDeploy
+from bootstrap.commands.diff import CommandDiff
+from bootstrap.commands.prepare import CommandPrepare
+from bootstrap.commands.reconcile import CommandReconcile
+from bootstrap.common.api_metrics import API_METRICS
+from tests.cdf_standin import CdfStandin
+
+from .synthetic_config import dump_config, generate_config
+
+CDF_PROJECT = "benchmark"
+
+
+def deploy(config_path: Path) -> None:
+    (
+        CommandDeploy(str(config_path), command=CommandMode.DEPLOY, debug=False)
+        .validate_config_length_limits()
+        .validate_config_shared_access()
+        .validate_config_is_cdf_project_in_mappings()
+        .command(with_raw_capability=True)
+    )
+
+
+def diff(config_path: Path) -> None:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        CommandDiff(str(config_path), command=CommandMode.DIFF, debug=False).command()
+
+
+def start_reconcile(config_path: Path) -> CommandReconcile:
+    """Started 'reconcile' after its first tick, with the target groups computed"""
+    reconciler = CommandReconcile(str(config_path), command=CommandMode.RECONCILE, debug=False)
+    reconciler.reconcile(refresh=False)
+    return reconciler
+
+
+def delete(config_path: Path) -> None:
+    CommandDelete(str(config_path), command=CommandMode.DELETE, debug=False).command()
+
+
+def prepare(config_path: Path) -> None:
+    CommandPrepare(str(config_path), command=CommandMode.PREPARE, debug=False).command(idp_source_id="benchmark")
+
+
+def write_delete_config(path: Path, cdf: CdfStandin, cognite: dict) -> Path:
+    """Delete config with everything found in the stand-in"""
+    config = {
+        "delete_or_deprecate": {
+            "groups": cdf.names("groups"),
+            "spaces": cdf.names("spaces"),
+            "raw_dbs": cdf.names("raw_dbs"),
+            "datasets": cdf.names("datasets"),
+        },
+        "cognite": cognite,
+    }
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return path
+
+
+def run(scenario: str, command, config_path: Path, cdf: CdfStandin) -> dict:
+    API_METRICS.reset()
+    responses_before = sum(cdf.responses.values())
+    start = time.perf_counter()
+    command(config_path)
+    elapsed = time.perf_counter() - start
+    summary = API_METRICS.summary()
+    return {
+        "scenario": scenario,
+        "seconds": round(elapsed, 3),
+        "api_calls": API_METRICS.calls(),
+        "requests": sum(cdf.responses.values()) - responses_before,
+        "request_bytes": sum(s["request_bytes"] for s in summary.values()),
+        "retries": sum(s["retries"] for s in summary.values()),
+    }
+
+
+def benchmark_size(nodes: int, args: argparse.Namespace, tmp_dir: Path) -> list[dict]:
+    config = generate_config(nodes, args.nodes_per_namespace, cdf_project=CDF_PROJECT, only_mapped_groups=False)
+    # SDK settings of the 'cognite' section
+    config["cognite"] = {
+        **config["cognite"],
+        **({"max-workers": args.max_workers} if args.max_workers else {}),
+        "connection": {
+            key: value
+            for key, value in {"max-retries": args.max_retries, "max-retry-backoff": args.max_retry_backoff}.items()
+            if value is not None
+        },
+    }
+    config_path = tmp_dir / f"config-{nodes}.yml"
+    with open(config_path, "w") as f:
+        dump_config(config, f)
+    with CdfStandin(
+        project=CDF_PROJECT,
+        latency_s=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+    ) as cdf:
+        os.environ.update(cdf.envs())
+        results = [
+            run("deploy", deploy, config_path, cdf),
+            run("deploy (no-op)", deploy, config_path, cdf),
+            run("diff", diff, config_path, cdf),
+        ]
+        reconciler = start_reconcile(config_path)
+        results.append(run("reconcile (tick)", lambda _: reconciler.reconcile(), config_path, cdf))
+        delete_config_path = write_delete_config(tmp_dir / f"config-delete-{nodes}.yml", cdf, config["cognite"])
+        results.append(run("delete", delete, delete_config_path, cdf))
+        results.append(run("prepare", prepare, config_path, cdf))
+    return [{"nodes": nodes, **result} for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 100, 1_000])
+    parser.add_argument("--nodes-per-namespace", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each request")
+    parser.add_argument("--rate-limit", type=float, help="requests per second, above that answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 503")
+    parser.add_argument("--max-workers", type=int, help="'cognite.max-workers' (SDK default: 5)")
+    parser.add_argument("--max-retries", type=int, help="'cognite.connection.max-retries' (SDK default: 10)")
+    parser.add_argument("--max-retry-backoff", type=int, help="'cognite.connection.max-retry-backoff' (default: 30)")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args()
+
+    # the commands log each created resource
+    logging.disable(logging.INFO)
+    results = []
+    print(f"{'nodes':>6} {'scenario':<16} {'seconds':>8} {'calls':>6} {'requests':>9} {'sent':>10} {'retries':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for nodes in args.nodes:
+            for r in benchmark_size(nodes, args, Path(tmp_dir)):
+                results.append(r)
+                print(
+                    f"{r['nodes']:>6} {r['scenario']:<16} {r['seconds']:>8.2f} {r['api_calls']:>6} "
+                    f"{r['requests']:>9} {r['request_bytes']:>10} {r['retries']:>8}"
+                )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
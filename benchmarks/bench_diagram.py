@@ -0,0 +1,94 @@
+"""Benchmark of 'diagram --all-projects': rendering the diagrams of several CDF projects one at a time,
+in a thread pool and in a process pool.
+
+Rendering is CPU-bound Python, so the GIL serializes the threads and they are no faster than rendering
+one project after the other. A process pool needs the expanded config in each worker, which only 'fork'
+shares without pickling it, and pays for starting the workers and pickling the diagrams back.
+
+Usage:
+    poetry run python -m benchmarks.bench_diagram [--nodes 1000] [--projects 4] [--repeat 3]
+"""
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.diagram import CommandDiagram
+
+from .bench_yaml_loading import BENCHMARK_ENVS
+from .synthetic_config import dump_config, generate_config
+from .timing import best_of
+
+# the command of the forked workers, inherited from the parent process
+COMMAND: Optional[CommandDiagram] = None
+
+
+def render(cdf_project: str) -> str:
+    assert COMMAND
+    stream = io.StringIO()
+    COMMAND.write_graph(COMMAND.build_graph(cdf_project), stream)
+    return stream.getvalue()
+
+
+def render_sequential(cdf_projects: list[str]) -> list[str]:
+    return [render(cdf_project) for cdf_project in cdf_projects]
+
+
+def render_threads(cdf_projects: list[str]) -> list[str]:
+    with ThreadPoolExecutor(max_workers=len(cdf_projects)) as executor:
+        return list(executor.map(render, cdf_projects))
+
+
+def render_processes(cdf_projects: list[str]) -> list[str]:
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=len(cdf_projects), mp_context=context) as executor:
+        return list(executor.map(render, cdf_projects))
+
+
+def main():
+    global COMMAND
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=1_000)
+    parser.add_argument("--projects", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.update(BENCHMARK_ENVS)
+    logging.disable(logging.INFO)
+    config = generate_config(args.nodes)
+    idp_cdf_mapping = config["bootstrap"]["idp-cdf-mappings"][0]
+    cdf_projects = [f"benchmark-{i}" for i in range(args.projects)]
+    config["bootstrap"]["idp-cdf-mappings"] = [
+        {**idp_cdf_mapping, "cdf-project": cdf_project} for cdf_project in cdf_projects
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = Path(tmp_dir) / "config.yml"
+        with open(config_path, "w") as stream:
+            dump_config(config, stream)
+        COMMAND = CommandDiagram(str(config_path), command=CommandMode.DIAGRAM, debug=False)
+        # expanded once, shared by all renders
+        COMMAND.resolved
+
+    variants = [("sequential", render_sequential), ("thread pool", render_threads)]
+    if "fork" in multiprocessing.get_all_start_methods():
+        variants.append(("process pool (fork)", render_processes))
+
+    print(f"{args.nodes} nodes, {args.projects} projects, {os.cpu_count()} CPUs, best of {args.repeat}")
+    print(f"{'':<22} {'time [s]':>9} {'speedup':>8}")
+    baseline = 0.0
+    for name, func in variants:
+        seconds = best_of(args.repeat, func, cdf_projects)
+        baseline = baseline or seconds
+        print(f"{name:<22} {seconds:>9.2f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
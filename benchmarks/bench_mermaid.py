@@ -0,0 +1,86 @@
+"""Micro-benchmark of the Mermaid diagram elements: construction, memory and render cost.
+
+Compares the slotted dataclasses of 'diagram_utils/mermaid.py' with an equivalent pydantic model,
+as used before, for '--nodes' nodes (and as many edges).
+
+Usage:
+    poetry run python -m benchmarks.bench_mermaid [--nodes 10000] [--repeat 5]
+"""
+import argparse
+import io
+import tracemalloc
+from typing import Callable, Optional
+
+from pydantic import BaseModel
+
+from bootstrap.commands.diagram_utils.mermaid import (
+    Edge,
+    GraphRegistry,
+    RoundedEdgesNode,
+)
+
+from .timing import best_of
+
+
+class PydanticNode(BaseModel):
+    """Reference: the former pydantic based element, with the same fields"""
+
+    id_name: str
+    comments: Optional[list[str]]
+    display: str
+
+
+def construct_pydantic(nodes: int) -> list:
+    return [PydanticNode(id_name=f"node{i}", display=f"Node {i}", comments=[]) for i in range(nodes)]
+
+
+def construct_dataclasses(nodes: int) -> list:
+    return [RoundedEdgesNode(id_name=f"node{i}", display=f"Node {i}", comments=[]) for i in range(nodes)]
+
+
+def build_graph(nodes: int) -> GraphRegistry:
+    """Graph shaped like 'diagram' output: nested subgraphs, scope nodes and one edge per node"""
+    graph = GraphRegistry()
+    outer = graph.get_or_create("outer")
+    graph.elements.append(outer)
+    for i in range(nodes):
+        subgraph = graph.get_or_create(f"ns{i // 100}")
+        if subgraph.add(RoundedEdgesNode(id_name=f"node{i}", display=f"Node {i}", comments=[])) and i % 100 == 0:
+            outer.add(subgraph)
+        graph.add_edge(Edge(id_name=f"node{i}", dest=f"node{(i + 1) % nodes}", annotation=None, comments=[]))
+    return graph
+
+
+def allocated_bytes(func: Callable, *args) -> int:
+    tracemalloc.start()
+    result = func(*args)  # noqa: F841 keep alive until measured
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.nodes} nodes, best of {args.repeat}")
+    print(f"{'':<26} {'time [ms]':>10} {'memory [KiB]':>13}")
+    for name, construct in (
+        ("construct pydantic", construct_pydantic),
+        ("construct dataclasses", construct_dataclasses),
+    ):
+        seconds = best_of(args.repeat, construct, args.nodes)
+        memory = allocated_bytes(construct, args.nodes)
+        print(f"{name:<26} {seconds * 1000:>10.1f} {memory / 1024:>13.0f}")
+
+    graph = build_graph(args.nodes)
+    print(f"{'build graph (+edges)':<26} {best_of(args.repeat, build_graph, args.nodes) * 1000:>10.1f}")
+    print(f"{'render to_mermaid()':<26} {best_of(args.repeat, graph.to_mermaid) * 1000:>10.1f}")
+    stream_seconds = best_of(args.repeat, lambda: graph.write_mermaid(io.StringIO()))
+    print(f"{'render write_mermaid()':<26} {stream_seconds * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Cold-start benchmark of the 'bootstrap-cli' entry point, with regression check against stored baselines.
+
+Per scenario ('--help', 'diagram', dry-run 'deploy' against a local CDF stand-in) it measures
+- wall-clock time of a fresh interpreter running 'bootstrap.__main__:main' (best and median of '--repeat' runs)
+- the '-X importtime' total and breakdown of the slowest imports
+- the time spent in 'init_container' (yaml loading, validation, logging setup)
+
+Usage:
+    poetry run python -m benchmarks.bench_startup                    # compare to baselines, exit 1 on regression
+    poetry run python -m benchmarks.bench_startup --update-baseline  # store new baselines
+
+Baselines are machine-specific, update them on the machine which runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from tests.cdf_standin import CdfStandin
+
+ROOT_DIRECTORY = Path(__file__).resolve().parent.parent
+BASELINE_FILE = ROOT_DIRECTORY / "benchmarks/baselines/startup.json"
+EXAMPLE_CONFIG = ROOT_DIRECTORY / "tests/example/config-deploy-example-01.0.yml"
+EXAMPLE_DOTENV = ROOT_DIRECTORY / "tests/example/.env_mock"
+
+# 'cli-args' and the command-mode for 'init_container' (None: no container)
+SCENARIOS: dict[str, tuple[list[str], Optional[str]]] = {
+    "help": (["--help"], None),
+    "diagram": (["--dotenv-path", str(EXAMPLE_DOTENV), "diagram", str(EXAMPLE_CONFIG)], "diagram"),
+    "deploy-dry-run": (["--dry-run", "deploy", str(EXAMPLE_CONFIG)], "deploy"),
+}
+
+# prints the seconds spent in 'init_container', in a fresh interpreter after all imports are done
+INIT_CONTAINER_SNIPPET = """
+import sys, time
+from bootstrap.app_config import CommandMode
+from bootstrap.app_container import ContainerSelector, init_container
+start = time.perf_counter()
+init_container(ContainerSelector[CommandMode(sys.argv[1])], sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+print(time.perf_counter() - start)
+"""
+
+
+@dataclass
+class StartupResult:
+    scenario: str
+    wall_best_s: float
+    wall_median_s: float
+    import_s: float
+    init_container_s: Optional[float] = None
+    # (module, cumulative seconds) of the slowest top-level imports and their direct sub-imports
+    top_imports: list[tuple[str, float]] = field(default_factory=list)
+
+
+def run_python(args: list[str], env: dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True, cwd=ROOT_DIRECTORY, env=env
+    )
+
+
+def parse_importtime(stderr: str, top: int) -> tuple[float, list[tuple[str, float]]]:
+    """Total import time of a run and its slowest top-level imports (with their direct sub-imports)"""
+    rows: list[tuple[int, str, float]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # top-level imports are indented by one space, each nesting level adds two
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative) / 1e6))
+
+    total = sum(seconds for depth, _, seconds in rows if depth == 0)
+    top_imports = sorted(((name, seconds) for depth, name, seconds in rows if depth <= 1), key=lambda r: -r[1])
+    return total, top_imports[:top]
+
+
+def benchmark_scenario(name: str, repeat: int, top: int, env: dict[str, str]) -> StartupResult:
+    cli_args, command_mode = SCENARIOS[name]
+
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_python(["-m", "bootstrap", *cli_args], env)
+        wall_times.append(time.perf_counter() - start)
+
+    # imports of the whole command run, as the command modules (and the SDK) are imported lazily
+    importtime = run_python(["-X", "importtime", "-m", "bootstrap", *cli_args], env)
+    import_s, top_imports = parse_importtime(importtime.stderr, top)
+
+    init_container_s = None
+    if command_mode:
+        container_args = [command_mode, str(EXAMPLE_CONFIG)]
+        if command_mode == "diagram":
+            container_args.append(str(EXAMPLE_DOTENV))
+        init_container_s = min(
+            float(run_python(["-c", INIT_CONTAINER_SNIPPET, *container_args], env).stdout.strip().splitlines()[-1])
+            for _ in range(repeat)
+        )
+
+    return StartupResult(
+        scenario=name,
+        wall_best_s=round(min(wall_times), 4),
+        wall_median_s=round(statistics.median(wall_times), 4),
+        import_s=round(import_s, 4),
+        init_container_s=round(init_container_s, 4) if init_container_s is not None else None,
+        top_imports=[(module, round(seconds, 4)) for module, seconds in top_imports],
+    )
+
+
+def find_regressions(results: list[StartupResult], baselines: dict, tolerance: float, slack_s: float) -> list[str]:
+    """A metric regressed, if it is slower than 'baseline * (1 + tolerance) + slack'"""
+    regressions = []
+    for result in results:
+        baseline = baselines.get("scenarios", {}).get(result.scenario)
+        if not baseline:
+            continue
+        for metric in ("wall_best_s", "import_s", "init_container_s"):
+            current, expected = getattr(result, metric), baseline.get(metric)
+            if current is None or expected is None:
+                continue
+            if current > expected * (1 + tolerance) + slack_s:
+                regressions.append(f"{result.scenario}.{metric}: {current:.3f}s > baseline {expected:.3f}s")
+    return regressions
+
+
+def print_results(results: list[StartupResult]) -> None:
+    print(f"{'scenario':<16} {'best [s]':>9} {'median [s]':>11} {'import [s]':>11} {'init_container [s]':>19}")
+    for r in results:
+        init_container = f"{r.init_container_s:.3f}" if r.init_container_s is not None else "-"
+        wall = f"{r.scenario:<16} {r.wall_best_s:>9.3f} {r.wall_median_s:>11.3f}"
+        print(f"{wall} {r.import_s:>11.3f} {init_container:>19}")
+
+    for r in results:
+        print(f"\nslowest imports of '{r.scenario}' (cumulative):")
+        for module, seconds in r.top_imports:
+            print(f"  {seconds * 1000:>8.1f}ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=list(SCENARIOS), nargs="+", default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative slowdown accepted, default 25%%")
+    parser.add_argument("--slack", type=float, default=0.05, help="absolute slowdown accepted in seconds")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args()
+
+    with CdfStandin(project="shiny-prod") as cdf:
+        env = dict(os.environ, PYTHONPATH=str(ROOT_DIRECTORY / "src"), **cdf.envs())
+        results = [benchmark_scenario(name, args.repeat, args.top, env) for name in args.scenario]
+
+    print_results(results)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {r.scenario: asdict(r) for r in results},
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaselines stored in {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baselines found in {args.baseline}, run with '--update-baseline' first")
+        return
+
+    regressions = find_regressions(results, json.loads(args.baseline.read_text()), args.tolerance, args.slack)
+    if regressions:
+        print("\nREGRESSIONS:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\nNo regressions against baselines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Compare yaml loading of large configs: pure-Python 'SafeLoader' vs C-accelerated 'CSafeLoader'.
+
+Usage:
+    poetry run python -m benchmarks.bench_yaml_loading [--nodes 1000 10000] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from dependency_injector import providers
+
+from bootstrap.app_container import get_yaml_loader
+
+from .synthetic_config import write_config
+from .timing import best_of
+
+# values for the '${..}' markers in the synthetic 'cognite' section
+BENCHMARK_ENVS = {
+    "BOOTSTRAP_CDF_HOST": "https://bluefield.cognitedata.com",
+    "BOOTSTRAP_CDF_PROJECT": "benchmark",
+    "BOOTSTRAP_IDP_CLIENT_ID": "client-id",
+    "BOOTSTRAP_IDP_CLIENT_SECRET": "client-secret",
+    "BOOTSTRAP_IDP_SCOPES": "https://bluefield.cognitedata.com/.default",
+    "BOOTSTRAP_IDP_TOKEN_URL": "https://login.microsoftonline.com/tenant/oauth2/v2.0/token",
+}
+
+
+def load_config(config_path: Path, fast: bool) -> dict:
+    """Same call as 'init_container' uses"""
+    config = providers.Configuration()
+    config.from_yaml(config_path, required=True, loader=get_yaml_loader(fast=fast))
+    return config()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.update(BENCHMARK_ENVS)
+    print(f"{'nodes':>8} {'size [MiB]':>11} {'SafeLoader [s]':>15} {'CSafeLoader [s]':>16} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for nodes in args.nodes:
+            config_path = write_config(Path(tmp_dir) / f"config-{nodes}.yml", nodes)
+            # both paths must produce the same interpolated config
+            assert load_config(config_path, fast=False) == load_config(config_path, fast=True)
+
+            slow = best_of(args.repeat, load_config, config_path, False)
+            fast = best_of(args.repeat, load_config, config_path, True)
+            size = config_path.stat().st_size / 2**20
+            print(f"{nodes:>8} {size:>11.2f} {slow:>15.3f} {fast:>16.3f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
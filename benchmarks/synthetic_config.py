@@ -0,0 +1,188 @@
+"""Synthetic bootstrap configurations for benchmarks and scale tests.
+
+Generates valid 'BootstrapCoreConfig' configs with a configurable number of namespaces and 'ns-nodes',
+shaped like the examples in 'tests/example', including the '${ENV_NAME}' markers of the 'cognite' section.
+Optional space variants, RAW variants, shared-access fan-out and IdP mappings allow to scale the parts
+of the config, which drive group generation, validation and diagram rendering.
+
+All names stay within the length limits of 'validate_config_length_limits()' up to 99.999 nodes,
+and shared-access only references existing nodes ('validate_config_shared_access()').
+The output is deterministic, same arguments produce the same config.
+
+Usage:
+    poetry run python -m benchmarks.synthetic_config --nodes 10000 --space-variants 2 \\
+        --raw-variants 2 --shared-access-fanout 3 --idp-mappings 50 -o config-10k.yml
+"""
+import argparse
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+COGNITE_SECTION = {
+    "host": "${BOOTSTRAP_CDF_HOST}",
+    "project": "${BOOTSTRAP_CDF_PROJECT}",
+    "idp-authentication": {
+        "client-id": "${BOOTSTRAP_IDP_CLIENT_ID}",
+        "secret": "${BOOTSTRAP_IDP_CLIENT_SECRET}",
+        "scopes": ["${BOOTSTRAP_IDP_SCOPES}"],
+        "token-url": "${BOOTSTRAP_IDP_TOKEN_URL}",
+    },
+}
+# with the default features, group names are '<group-prefix>:<node-name>:<role>'
+GROUP_PREFIX = "cdf"
+AGGREGATED_LEVEL_NAME = "allprojects"
+ROLES = ("owner", "read")
+
+
+def get_node_name(ns_name: str, index: int) -> str:
+    # 'ns000:00042:node:rawdb:state' has to fit the 32 characters of RAW DB names
+    return f"{ns_name}:{index:05d}:node"
+
+
+def get_raw_variants(count: int) -> list[str]:
+    """'rawdb-additional-variants', starting with the default 'state'"""
+    return ["state", *(f"raw{i}" for i in range(1, count))][:count]
+
+
+def get_shared_nodes(node_names: list[str], index: int, offset: int, fanout: int) -> list[dict[str, str]]:
+    # the next nodes in config order (wrapping around), never the node itself
+    return [{"node-name": node_names[(index + offset + i) % len(node_names)]} for i in range(1, fanout + 1)]
+
+
+def generate_config(
+    nodes: int,
+    nodes_per_namespace: int = 100,
+    cdf_project: str = "benchmark",
+    space_variants: int = 0,
+    raw_variants: int = 1,
+    shared_access_fanout: int = 0,
+    idp_mappings: int = 1,
+    only_mapped_groups: bool = True,
+) -> dict[str, Any]:
+    """Config with 'nodes' ns-nodes, spread over namespaces of 'nodes_per_namespace' each
+
+    Args:
+        space_variants: number of 'space-variants' per node, creating one more space each
+        raw_variants: number of 'rawdb-additional-variants' (default feature is 1, 'state')
+        shared_access_fanout: number of other nodes each node has 'owner' and (different ones) 'read' access to
+        idp_mappings: number of cdf-groups mapped to an IdP group, starting with the aggregated levels
+        only_mapped_groups: 'create-only-mapped-cdf-groups' of the 'cdf_project'
+    """
+    # 'owner' and 'read' reference different nodes, which requires 2 * fanout other nodes
+    shared_access_fanout = min(shared_access_fanout, max(0, (nodes - 1) // 2))
+
+    ns_names = [f"ns{i // nodes_per_namespace:03d}" for i in range(nodes)]
+    node_names = [get_node_name(ns_name, i) for i, ns_name in enumerate(ns_names)]
+
+    namespaces: dict[str, dict[str, Any]] = {}
+    for i, (ns_name, node_name) in enumerate(zip(ns_names, node_names)):
+        ns_node: dict[str, Any] = {
+            "node-name": node_name,
+            "description": f"Node {i}",
+            "external-id": node_name,
+            "metadata": {"created-by": "benchmark", "index": i},
+        }
+        if space_variants:
+            ns_node["space-variants"] = [f"v{v}" for v in range(1, space_variants + 1)]
+        if shared_access_fanout:
+            ns_node["shared-access"] = {
+                "owner": get_shared_nodes(node_names, i, 0, shared_access_fanout),
+                "read": get_shared_nodes(node_names, i, shared_access_fanout, shared_access_fanout),
+            }
+        namespace = namespaces.setdefault(
+            ns_name, {"ns-name": ns_name, "description": f"Namespace {ns_name}", "ns-nodes": []}
+        )
+        namespace["ns-nodes"].append(ns_node)
+
+    # aggregated levels first, like an IdP setup usually starts
+    group_names = (
+        [f"{GROUP_PREFIX}:{AGGREGATED_LEVEL_NAME}:{role}" for role in ROLES]
+        + [f"{GROUP_PREFIX}:{ns_name}:{AGGREGATED_LEVEL_NAME}:{role}" for ns_name in namespaces for role in ROLES]
+        + [f"{GROUP_PREFIX}:{node_name}:{role}" for node_name in node_names for role in ROLES]
+    )
+    mappings = [
+        {
+            "cdf-group": group_name,
+            # deterministic UUIDs, like IdP object-ids
+            "idp-source-id": str(uuid.UUID(int=i)),
+            "idp-source-name": group_name.replace(":", "_").upper(),
+        }
+        for i, group_name in enumerate(group_names[:idp_mappings])
+    ]
+
+    features: dict[str, Any] = {
+        "with-datamodel-capability": True,
+        "group-prefix": GROUP_PREFIX,
+        "aggregated-level-name": AGGREGATED_LEVEL_NAME,
+    }
+    if raw_variants != 1:
+        features["rawdb-additional-variants"] = get_raw_variants(raw_variants)
+
+    return {
+        "bootstrap": {
+            "features": features,
+            "idp-cdf-mappings": [
+                {
+                    "cdf-project": cdf_project,
+                    "create-only-mapped-cdf-groups": only_mapped_groups,
+                    "mappings": mappings,
+                }
+            ],
+            "namespaces": list(namespaces.values()),
+        },
+        "cognite": COGNITE_SECTION,
+    }
+
+
+def dump_config(config: dict[str, Any], stream) -> None:
+    yaml.dump(config, stream, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
+
+
+def write_config(path: str | Path, nodes: int, nodes_per_namespace: int = 100, **options: Any) -> Path:
+    """Writes 'generate_config()' to 'path', 'options' are its keyword arguments"""
+    path = Path(path)
+    with open(path, "w") as f:
+        dump_config(generate_config(nodes, nodes_per_namespace, **options), f)
+    return path
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--nodes", type=int, default=1_000, help="total number of ns-nodes")
+    size.add_argument("--namespaces", type=int, help="number of namespaces, each with '--nodes-per-namespace' nodes")
+    parser.add_argument("--nodes-per-namespace", type=int, default=100)
+    parser.add_argument("--cdf-project", default="benchmark")
+    parser.add_argument("--space-variants", type=int, default=0)
+    parser.add_argument("--raw-variants", type=int, default=1)
+    parser.add_argument("--shared-access-fanout", type=int, default=0)
+    parser.add_argument("--idp-mappings", type=int, default=1)
+    parser.add_argument(
+        "--all-groups", action="store_true", help="create all groups, not only the ones with an IdP mapping"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="config file to write, stdout if not provided")
+    args = parser.parse_args(argv)
+
+    nodes = args.namespaces * args.nodes_per_namespace if args.namespaces else args.nodes
+    config = generate_config(
+        nodes,
+        args.nodes_per_namespace,
+        cdf_project=args.cdf_project,
+        space_variants=args.space_variants,
+        raw_variants=args.raw_variants,
+        shared_access_fanout=args.shared_access_fanout,
+        idp_mappings=args.idp_mappings,
+        only_mapped_groups=not args.all_groups,
+    )
+    if args.output:
+        with open(args.output, "w") as f:
+            dump_config(config, f)
+    else:
+        dump_config(config, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
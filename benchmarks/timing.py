@@ -0,0 +1,22 @@
+"""Timing helper shared by the benchmarks."""
+import time
+import timeit
+from typing import Callable
+
+
+def best_of(repeat: int, func: Callable, *args, autorange: bool = False) -> float:
+    """Best of 'repeat' timings of 'func(*args)' in seconds.
+
+    With 'autorange' each timing calls 'func' as often as 'timeit' needs for 0.2 seconds and the time
+    per call is returned, for functions too fast to time a single call.
+    """
+    if autorange:
+        timer = timeit.Timer(lambda: func(*args))
+        number, _ = timer.autorange()
+        return min(timer.repeat(repeat=repeat, number=number)) / number
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
@@ -128,6 +128,7 @@
 #   - atm existing datasets (not created by bootstrap) can be referenced too
 
 import logging
+import sys
 from typing import Optional
 
 import click
@@ -137,10 +138,8 @@ from click import Context
 from . import __version__
 from .app_config import CommandMode, YesNoType
 from .app_exceptions import BootstrapConfigError
-from .commands.delete import CommandDelete
-from .commands.deploy import CommandDeploy
-from .commands.diagram import CommandDiagram
-from .commands.prepare import CommandPrepare
+
+# command modules are imported inside each click-command, so 'diagram' and '--help' never load the Cognite SDK
 
 # share the root-logger, which get's later configured by extractor-utils LoggingConfig too
 # that we can switch the logLevel for all logging through the '--debug' cli-flag
@@ -215,10 +214,129 @@ logging = logging.getLogger()
     "The 'BOOTSTRAP_IDP_AUDIENCE' environment variable can be used instead.",
     envvar="BOOTSTRAP_IDP_AUDIENCE",
 )
+@click.option(
+    "--token-cache-dir",
+    help="[optional] Directory for an encrypted on-disk cache of IdP access tokens, keyed by token URL, "
+    "client ID and scopes. Later runs reuse a valid token instead of requesting a new one. "
+    "Overrides 'cognite.idp-authentication.token-cache-dir', "
+    "the 'BOOTSTRAP_IDP_TOKEN_CACHE_DIR' environment variable can be used instead.",
+    envvar="BOOTSTRAP_IDP_TOKEN_CACHE_DIR",
+)
+@click.option(
+    "--max-workers",
+    type=click.IntRange(min=1),
+    help="[optional] Parallel requests of one CDF API call, like chunked creates of datasets "
+    "(SDK default: 5). Overrides 'cognite.max-workers', the 'BOOTSTRAP_CDF_MAX_WORKERS' environment "
+    "variable can be used instead.",
+    envvar="BOOTSTRAP_CDF_MAX_WORKERS",
+)
+@click.option(
+    "--timeout",
+    type=click.IntRange(min=1),
+    help="[optional] Seconds to wait for a CDF API response (SDK default: 30). Overrides 'cognite.timeout', "
+    "the 'BOOTSTRAP_CDF_TIMEOUT' environment variable can be used instead.",
+    envvar="BOOTSTRAP_CDF_TIMEOUT",
+)
+@click.option(
+    "--max-retries",
+    type=click.IntRange(min=0),
+    help="[optional] Retries of throttled (429) and unavailable CDF API requests (SDK default: 10). "
+    "Overrides 'cognite.connection.max-retries', the 'BOOTSTRAP_CDF_MAX_RETRIES' environment variable "
+    "can be used instead.",
+    envvar="BOOTSTRAP_CDF_MAX_RETRIES",
+)
+@click.option(
+    "--max-retry-backoff",
+    type=click.IntRange(min=0),
+    help="[optional] Max seconds of the exponential backoff between retries (SDK default: 30). "
+    "Overrides 'cognite.connection.max-retry-backoff', the 'BOOTSTRAP_CDF_MAX_RETRY_BACKOFF' environment "
+    "variable can be used instead.",
+    envvar="BOOTSTRAP_CDF_MAX_RETRY_BACKOFF",
+)
+@click.option(
+    "--max-connection-pool-size",
+    type=click.IntRange(min=1),
+    help="[optional] Open HTTP connections kept for reuse, not lower than '--max-workers' (SDK default: 50). "
+    "Overrides 'cognite.connection.max-connection-pool-size', the 'BOOTSTRAP_CDF_MAX_CONNECTION_POOL_SIZE' "
+    "environment variable can be used instead.",
+    envvar="BOOTSTRAP_CDF_MAX_CONNECTION_POOL_SIZE",
+)
 @click.option(
     "--dotenv-path",
     help="Provide a relative or absolute path to an .env file (for command line usage only)",
 )
+@click.option(
+    "--config-cache-dir",
+    help="[optional] Directory for an on-disk cache of the validated configuration, keyed by a hash of "
+    "the config file, the environment variables it uses and the bootstrap-cli version. "
+    "Repeated runs with an unchanged configuration skip parsing and validation. "
+    "The 'BOOTSTRAP_CONFIG_CACHE_DIR' environment variable can be used instead.",
+    envvar="BOOTSTRAP_CONFIG_CACHE_DIR",
+)
+@click.option(
+    "--api-metrics-json",
+    type=click.Path(dir_okay=False, writable=True),
+    help="[optional] File to write the CDF API call summary to as JSON: calls, items, payload bytes, "
+    "latency percentiles, retries and throttled (429) responses per endpoint.",
+)
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="[optional] File to write the tracing spans of the command phases to "
+    "(config loading, validation, CDF cache loads, target generation, resource and group writes).",
+)
+@click.option(
+    "--trace-format",
+    type=click.Choice(["otel", "chrome"], case_sensitive=False),
+    default="otel",
+    show_default=True,
+    help="Format of the '--trace' file: OpenTelemetry OTLP/JSON or Chrome trace (chrome://tracing, Perfetto).",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Flag to run the command under cProfile. Writes a '.prof' file and a '.txt' report "
+    "with the top hotspots to '--profile-output'.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, writable=True),
+    default="bootstrap-cli-profile",
+    show_default=True,
+    help="Path of the '--profile' results, the suffixes '.prof' and '.txt' are added.",
+)
+@click.option(
+    "--profile-top",
+    type=click.IntRange(min=1),
+    default=25,
+    show_default=True,
+    help="Number of hotspots in the '--profile' report.",
+)
+@click.option(
+    "--profile-memory",
+    is_flag=True,
+    help="Flag to trace memory allocations with tracemalloc during '--profile', "
+    "adding the peak memory per phase to the report (slows down the run, "
+    "and runs the parallel deploy stages one at a time).",
+)
+@click.option(
+    "--log-format",
+    type=click.Choice(["text", "json"], case_sensitive=False),
+    default="text",
+    show_default=True,
+    help="Format of all log handlers, 'json' writes one JSON object per line for log collectors. "
+    "The 'BOOTSTRAP_LOG_FORMAT' environment variable can be used instead.",
+    envvar="BOOTSTRAP_LOG_FORMAT",
+)
+@click.option(
+    "--log-queue",
+    is_flag=True,
+    help="Flag to write logs from a background thread (QueueHandler/QueueListener), "
+    "so file and console output no longer block the command. "
+    "The 'BOOTSTRAP_LOG_QUEUE' environment variable can be used instead.",
+    envvar="BOOTSTRAP_LOG_QUEUE",
+)
 @click.option(
     "--debug",
     is_flag=True,
@@ -243,9 +361,26 @@ def bootstrap_cli(
     scopes: Optional[str] = None,
     token_url: Optional[str] = None,
     audience: Optional[str] = None,
+    token_cache_dir: Optional[str] = None,
+    # cdf api client
+    max_workers: Optional[int] = None,
+    timeout: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    max_retry_backoff: Optional[int] = None,
+    max_connection_pool_size: Optional[int] = None,
     # cli
     # TODO: dotenv_path: Optional[click.Path] = None,
     dotenv_path: Optional[str] = None,
+    config_cache_dir: Optional[str] = None,
+    api_metrics_json: Optional[str] = None,
+    trace_file: Optional[str] = None,
+    trace_format: str = "otel",
+    profile: bool = False,
+    profile_output: str = "bootstrap-cli-profile",
+    profile_top: int = 25,
+    profile_memory: bool = False,
+    log_format: str = "text",
+    log_queue: bool = False,
     debug: bool = False,
     dry_run: bool = False,
 ) -> None:
@@ -264,12 +399,78 @@ def bootstrap_cli(
         "scopes": scopes,
         "token_url": token_url,
         "audience": audience,
+        # cdf api client, merged over the 'cognite' config section
+        "cognite_settings": get_cognite_settings(
+            token_cache_dir=token_cache_dir,
+            max_workers=max_workers,
+            timeout=timeout,
+            max_retries=max_retries,
+            max_retry_backoff=max_retry_backoff,
+            max_connection_pool_size=max_connection_pool_size,
+        ),
         # cli
         "dotenv_path": dotenv_path,
+        "config_cache_dir": config_cache_dir,
+        "logging_settings": {"log_format": log_format.lower(), "log_queue": log_queue},
         "debug": debug,
         "dry_run": dry_run,
     }
 
+    if api_metrics_json:
+        from .common.api_metrics import API_METRICS
+
+        # only written to the JSON, not worth parsing all bodies again otherwise
+        API_METRICS.count_items = True
+    context.call_on_close(lambda: report_api_metrics(api_metrics_json))
+
+    if profile:
+        from .common.profiling import CommandProfiler
+
+        # registered first to stop last, after the root span ended and the trace is written
+        profiler = CommandProfiler(profile_output, top=profile_top, with_memory=profile_memory).start()
+        context.call_on_close(profiler.stop)
+
+    if trace_file:
+        from .common.tracing import TRACER, TraceFormat
+
+        TRACER.recording = True
+        # closed in reverse order: the root span ends before the trace is written
+        context.call_on_close(lambda: TRACER.write(trace_file, TraceFormat(trace_format.lower())))
+        context.with_resource(TRACER.span(f"bootstrap-cli {context.invoked_subcommand}", dry_run=dry_run))
+
+
+def get_cognite_settings(
+    token_cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    timeout: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    max_retry_backoff: Optional[int] = None,
+    max_connection_pool_size: Optional[int] = None,
+) -> dict:
+    """The given cli parameters in the structure of the 'cognite' config section"""
+    connection = {
+        "max-retries": max_retries,
+        "max-retry-backoff": max_retry_backoff,
+        "max-connection-pool-size": max_connection_pool_size,
+    }
+    settings = {
+        "idp-authentication": {"token-cache-dir": token_cache_dir} if token_cache_dir else {},
+        "max-workers": max_workers,
+        "timeout": timeout,
+        "connection": {key: value for key, value in connection.items() if value is not None},
+    }
+    return {key: value for key, value in settings.items() if value not in (None, {})}
+
+
+def report_api_metrics(api_metrics_json: Optional[str] = None) -> None:
+    """Logs the summary of all CDF API calls of the command, and writes it as JSON if requested"""
+    from .common.api_metrics import API_METRICS
+
+    if API_METRICS.calls():
+        logging.info(f"CDF API calls:\n{API_METRICS.format_summary()}")
+    if api_metrics_json:
+        API_METRICS.write_json(api_metrics_json)
+
 
 @click.command(help="Deploy a bootstrap configuration from a configuration file.")
 @click.argument(
@@ -289,6 +490,8 @@ def deploy(
     config_file: str,
     with_raw_capability: YesNoType,
 ) -> None:
+    from .commands.deploy import CommandDeploy
+
     click.echo(click.style("Deploying CDF Project bootstrap...", fg="red"))
 
     try:
@@ -298,7 +501,10 @@ def deploy(
                 command=CommandMode.DEPLOY,
                 debug=obj["debug"],
                 dry_run=obj["dry_run"],
-                dotenv_path=obj["dotenv_path"]
+                dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+                cognite_settings=obj["cognite_settings"],
             )
             .validate_config_length_limits()
             .validate_config_shared_access()
@@ -340,6 +546,8 @@ def prepare(
     idp_source_id: str,
     dry_run: YesNoType = YesNoType.no,
 ) -> None:
+    from .commands.prepare import CommandPrepare
+
     click.echo(click.style("Prepare CDF Project ...", fg="red"))
 
     try:
@@ -349,7 +557,10 @@ def prepare(
                 command=CommandMode.PREPARE,
                 debug=obj["debug"],
                 dry_run=obj["dry_run"],
-                dotenv_path=obj["dotenv_path"]
+                dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+                cognite_settings=obj["cognite_settings"],
             )
             # .validate_config() # TODO
             .command(idp_source_id=idp_source_id)
@@ -376,6 +587,8 @@ def delete(
     obj: dict,
     config_file: str,
 ) -> None:
+    from .commands.delete import CommandDelete
+
     click.echo(click.style("Delete CDF Project ...", fg="red"))
 
     try:
@@ -386,6 +599,9 @@ def delete(
                 debug=obj["debug"],
                 dry_run=obj["dry_run"],
                 dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+                cognite_settings=obj["cognite_settings"],
             )
             # .validate_config() # TODO
             .command()
@@ -422,6 +638,53 @@ def delete(
     "--cdf-project",
     help="[optional] Provide the CDF project name to use for the diagram 'idp-cdf-mappings'.",
 )
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, writable=True, allow_dash=True),
+    help="[optional] File to write the diagram to, streamed while it is generated. Defaults to stdout.",
+)
+@click.option(
+    "--namespace",
+    "ns_names",
+    multiple=True,
+    help="[optional] Limit the diagram to this namespace, like 'src'. Can be repeated.",
+)
+@click.option(
+    "--node",
+    "node_names",
+    multiple=True,
+    help="[optional] Limit the diagram to this node, like 'src:001:sap'. Can be repeated. "
+    "Nodes referenced by 'shared-access' are included.",
+)
+@click.option(
+    "--depth",
+    type=click.IntRange(1, 4),
+    default=4,
+    show_default=True,
+    help="Hierarchy levels to render: 1 top-level groups, 2 namespace groups, 3 node groups, 4 scopes.",
+)
+@click.option(
+    "--format",
+    "diagram_format",
+    type=click.Choice(["mermaid", "dot", "json"], case_sensitive=False),
+    default="mermaid",
+    show_default=True,
+    help="Output format: Mermaid, Graphviz DOT (for large configs) or a compact JSON adjacency "
+    "of nodes, edges and subgraph membership.",
+)
+@click.option(
+    "--all-projects",
+    is_flag=True,
+    default=False,
+    help="[optional] Render one diagram per 'idp-cdf-mappings' CDF project into '--output-dir', "
+    "expanding the configuration only once. Unchanged files are not rewritten.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, writable=True),
+    help="[optional] Folder for the '--all-projects' diagrams, named '<cdf-project>.<mmd|md|dot|json>'.",
+)
 @click.pass_obj
 def diagram(
     # click.core.Context obj
@@ -430,22 +693,55 @@ def diagram(
     markdown: YesNoType,
     with_raw_capability: YesNoType,
     cdf_project: str,
+    output: Optional[str],
+    ns_names: tuple[str, ...],
+    node_names: tuple[str, ...],
+    depth: int,
+    diagram_format: str,
+    all_projects: bool,
+    output_dir: Optional[str],
 ) -> None:
+    from .commands.diagram import CommandDiagram, DiagramDepth
+    from .commands.diagram_utils.exporters import DiagramFormat
+
     # click.echo(click.style("Diagram CDF Project ...", fg="red"))
 
+    if all_projects and not output_dir:
+        raise click.UsageError("'--all-projects' requires an '--output-dir'")
+    if all_projects and (cdf_project or output):
+        raise click.UsageError("'--all-projects' cannot be combined with '--cdf-project' or '--output'")
+
     try:
-        (
-            CommandDiagram(config_file, command=CommandMode.DIAGRAM, debug=obj["debug"], dotenv_path=obj["dotenv_path"])
+        command_diagram = (
+            CommandDiagram(
+                config_file,
+                command=CommandMode.DIAGRAM,
+                debug=obj["debug"],
+                dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+            )
             .validate_config_length_limits()
             .validate_config_shared_access()
-            .validate_cdf_project_available(cdf_project_from_cli=cdf_project)
-            .validate_config_is_cdf_project_in_mappings(cdf_project_from_cli=cdf_project)
-            .command(
-                to_markdown=markdown,
-                with_raw_capability=with_raw_capability,
-                cdf_project=cdf_project,
-            )
         )  # fmt:skip
+        if not all_projects:
+            (
+                command_diagram
+                .validate_cdf_project_available(cdf_project_from_cli=cdf_project)
+                .validate_config_is_cdf_project_in_mappings(cdf_project_from_cli=cdf_project)
+            )  # fmt:skip
+        command_diagram.command(
+            to_markdown=markdown,
+            with_raw_capability=with_raw_capability,
+            cdf_project=cdf_project,
+            output=output,
+            ns_names=ns_names,
+            node_names=node_names,
+            depth=DiagramDepth(depth),
+            diagram_format=DiagramFormat(diagram_format.lower()),
+            all_projects=all_projects,
+            output_dir=output_dir,
+        )
 
         # click.echo(
         #     click.style(
@@ -458,10 +754,116 @@ def diagram(
         exit(e.message)
 
 
+@click.command(
+    help="Compares a bootstrap configuration with the deployed CDF project, without any changes. "
+    "Reports missing, extra and divergent datasets, RAW databases, spaces and groups (down to their capabilities) "
+    "as JSON, and exits with code 2 if the CDF project drifted from the configuration."
+)
+@click.argument(
+    "config_file",
+    default="./config-bootstrap.yml",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    help="[optional] File to write the JSON report to. Defaults to stdout.",
+)
+@click.pass_obj
+def diff(
+    # click.core.Context obj
+    obj: dict,
+    config_file: str,
+    output: Optional[str] = None,
+) -> None:
+    from .commands.diff import DRIFT_EXIT_CODE, CommandDiff
+
+    # stdout is reserved for the report
+    click.echo(click.style("Comparing CDF Project with bootstrap configuration...", fg="red"), err=True)
+
+    try:
+        has_drift = (
+            CommandDiff(
+                config_file,
+                command=CommandMode.DIFF,
+                debug=obj["debug"],
+                dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+                cognite_settings=obj["cognite_settings"],
+            )
+            .validate_config_length_limits()
+            .validate_config_shared_access()
+            .validate_config_is_cdf_project_in_mappings()
+            .command(output=output)
+        )  # fmt:skip
+
+    except BootstrapConfigError as e:
+        exit(e.message)
+
+    if has_drift:
+        click.echo(click.style("CDF Project drifted from the configuration", fg="yellow"), err=True)
+        sys.exit(DRIFT_EXIT_CODE)
+    click.echo(click.style("CDF Project matches the configuration", fg="blue"), err=True)
+
+
+@click.command(
+    help="Keeps a CDF project converged with a bootstrap configuration. Runs until stopped, and every "
+    "'--interval' seconds reloads the configuration if its file changed, lists the deployed resources and "
+    "creates or updates only the missing and divergent ones. The CDF client and the validated configuration "
+    "stay loaded between the runs."
+)
+@click.argument(
+    "config_file",
+    default="./config-bootstrap.yml",
+)
+@click.option(
+    "--interval",
+    type=click.IntRange(min=1),
+    default=300,
+    show_default=True,
+    help="Seconds from the start of one reconcile run to the next.",
+)
+@click.pass_obj
+def reconcile(
+    # click.core.Context obj
+    obj: dict,
+    config_file: str,
+    interval: int,
+) -> None:
+    from .commands.reconcile import CommandReconcile
+
+    click.echo(click.style(f"Reconciling CDF Project every {interval}s...", fg="red"))
+
+    try:
+        (
+            CommandReconcile(
+                config_file,
+                command=CommandMode.RECONCILE,
+                debug=obj["debug"],
+                dry_run=obj["dry_run"],
+                dotenv_path=obj["dotenv_path"],
+                config_cache_dir=obj["config_cache_dir"],
+                logging_settings=obj["logging_settings"],
+                cognite_settings=obj["cognite_settings"],
+            )
+            .validate_config_length_limits()
+            .validate_config_shared_access()
+            .validate_config_is_cdf_project_in_mappings()
+            .command(interval=interval)
+        )  # fmt:skip
+
+        click.echo(click.style("CDF Project reconcile stopped", fg="blue"))
+
+    except BootstrapConfigError as e:
+        exit(e.message)
+
+
 bootstrap_cli.add_command(deploy)
 bootstrap_cli.add_command(prepare)
 bootstrap_cli.add_command(delete)
 bootstrap_cli.add_command(diagram)
+bootstrap_cli.add_command(diff)
+bootstrap_cli.add_command(reconcile)
 
 
 def main() -> None:
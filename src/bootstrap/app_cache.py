@@ -11,6 +11,8 @@ from cognite.client.data_classes.data_modeling.spaces import Space
 from cognite.client.utils import _json
 from cognite.client.utils._time import convert_and_isoformat_time_attrs
 
+from .common.tracing import TRACER
+
 
 class CogniteResourceCache(UserList):
     """Implement own CogniteResourceList class
@@ -40,6 +42,8 @@ class CogniteResourceCache(UserList):
         # a) unpack ResourceList to simple list
         # b) is single element, pack it in list
         self.data = [r for r in resources] if isinstance(resources, CogniteResourceList) else [resources]
+        # lazy index for 'get_ids_by_name()', reset on changes
+        self._ids_by_name: dict[str, list[int]] | None = None
 
     def __str__(self) -> str:
         """From CogniteResourceList v7.73.9
@@ -83,6 +87,19 @@ class CogniteResourceCache(UserList):
 
         return [(get_identifier(resource) or "") for resource in self.data]
 
+    def get_ids_by_name(self) -> dict[str, list[int]]:
+        """Index of the resource ids by name, as names are not unique (like for groups)
+
+        Returns:
+            dict[str, list[int]]: ids in order of the cache
+        """
+        if self._ids_by_name is None:
+            ids_by_name: dict[str, list[int]] = {}
+            for name, resource in zip(self.get_names(), self.data):
+                ids_by_name.setdefault(name, []).append(resource.id)
+            self._ids_by_name = ids_by_name
+        return self._ids_by_name
+
     def select(self, values):
         return [c for c in self.data if getattr(c, self.SELECTOR_FIELD) in values]
 
@@ -96,6 +113,7 @@ class CogniteResourceCache(UserList):
         # handle single-element, with CogniteResourceList and List are Iterable
         resources = resources if isinstance(resources, Iterable) else [resources]
         self.data.extend([r for r in resources])
+        self._ids_by_name = None
 
     def delete(self, resources: CogniteResource | CogniteResourceList | list) -> None:
         """Find existing resource and replace it
@@ -111,6 +129,7 @@ class CogniteResourceCache(UserList):
         # delete if exists
         matching_in_cache = self.select(values=[getattr(r, self.SELECTOR_FIELD) for r in resources])
         [self.data.remove(m) for m in matching_in_cache]
+        self._ids_by_name = None
 
     def update(self, resources: CogniteResource | CogniteResourceList | list) -> None:
         """Find existing resource and replace it
@@ -151,7 +170,9 @@ class CogniteDeployedCache:
 
         self.groups_only = groups_only
         self.client: CogniteClient = client
-        self.groups = CogniteResourceCache(RESOURCE=Group, resources=self.client.iam.groups.list(all=True))
+        with TRACER.span("deployed_cache.groups", resource_type="groups") as span:
+            self.groups = CogniteResourceCache(RESOURCE=Group, resources=self.client.iam.groups.list(all=True))
+            span.set(count=len(self.groups))
 
         if self.groups_only:
             #
@@ -160,11 +181,19 @@ class CogniteDeployedCache:
             self.cache = {"groups": self.groups}
             return
 
-        self.datasets = CogniteResourceCache(RESOURCE=DataSet, resources=self.client.data_sets.list(limit=NOLIMIT))
-        self.raw_dbs = CogniteResourceCache(RESOURCE=Database, resources=self.client.raw.databases.list(limit=NOLIMIT))
-        self.spaces = CogniteResourceCache(
-            RESOURCE=Space, resources=self.client.data_modeling.spaces.list(limit=NOLIMIT)  # type: ignore
-        )
+        with TRACER.span("deployed_cache.datasets", resource_type="datasets") as span:
+            self.datasets = CogniteResourceCache(RESOURCE=DataSet, resources=self.client.data_sets.list(limit=NOLIMIT))
+            span.set(count=len(self.datasets))
+        with TRACER.span("deployed_cache.raw_dbs", resource_type="raw_dbs") as span:
+            self.raw_dbs = CogniteResourceCache(
+                RESOURCE=Database, resources=self.client.raw.databases.list(limit=NOLIMIT)
+            )
+            span.set(count=len(self.raw_dbs))
+        with TRACER.span("deployed_cache.spaces", resource_type="spaces") as span:
+            self.spaces = CogniteResourceCache(
+                RESOURCE=Space, resources=self.client.data_modeling.spaces.list(limit=NOLIMIT)  # type: ignore
+            )
+            span.set(count=len(self.spaces))
 
     def log_counts(self):
         if self.groups_only:
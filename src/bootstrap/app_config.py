@@ -148,6 +148,8 @@ class CommandMode(str, ReprEnum):
     DEPLOY = "deploy"
     DELETE = "delete"
     DIAGRAM = "diagram"
+    DIFF = "diff"
+    RECONCILE = "reconcile"
 
 
 class CacheUpdateMode(str, ReprEnum):
@@ -169,6 +171,37 @@ class IdpCdfMapping(Model):
     idp_source_name: Optional[str]
 
 
+class IdpCdfMappingsByGroup(dict[str, IdpCdfMapping]):
+    """IdpCdfMappings of one cdf_project by cdf_group.
+    Like 'get_idp_cdf_mapping_for_group', a cdf_group with more than one mapping only fails when it is looked up.
+    """
+
+    def __init__(self, cdf_project: str):
+        super().__init__()
+        self.cdf_project = cdf_project
+        self.duplicated_groups: set[str] = set()
+
+    def add(self, mapping: IdpCdfMapping) -> None:
+        if mapping.cdf_group in self:
+            self.duplicated_groups.add(mapping.cdf_group)
+        else:
+            self[mapping.cdf_group] = mapping
+
+    def _check_unique(self, cdf_group: str) -> None:
+        if cdf_group in self.duplicated_groups:
+            raise BootstrapConfigError(
+                f"Found more than one mapping for cdf_group {cdf_group} in cdf_project {self.cdf_project}"
+            )
+
+    def __getitem__(self, cdf_group: str) -> IdpCdfMapping:
+        self._check_unique(cdf_group)
+        return super().__getitem__(cdf_group)
+
+    def get(self, cdf_group: str, default: Any = None) -> Any:
+        self._check_unique(cdf_group)
+        return super().get(cdf_group, default)
+
+
 class IdpCdfMappingProjects(Model):
     cdf_project: str
     create_only_mapped_cdf_groups: bool = True
@@ -199,6 +232,15 @@ class Namespace(Model):
     ns_nodes: list[NamespaceNode]
 
 
+class NamespaceFragment(Model):
+    """
+    Content of a file listed in 'bootstrap.includes',
+    providing additional namespaces (or nodes of an existing namespace)
+    """
+
+    namespaces: list[Namespace] = []
+
+
 class BootstrapFeatures(Model):
     with_raw_capability: bool = True
     with_datamodel_capability: bool = True
@@ -236,6 +278,9 @@ class BootstrapCoreConfig(Model):
     # [] works too > https://stackoverflow.com/a/63808835/1104502
     namespaces: list[Namespace] = []  # Field(default_factory=list)
 
+    # files or directories (relative to the config file) with additional 'namespaces' fragments
+    includes: list[str] = []
+
     idp_cdf_mappings: Optional[list[IdpCdfMappingProjects]] = []
 
     def create_only_mapped_cdf_groups(self, cdf_project) -> bool:
@@ -271,6 +316,19 @@ class BootstrapCoreConfig(Model):
 
         return mappings[0] if mappings else IdpCdfMapping(cdf_group=cdf_group, idp_source_id=None, idp_source_name=None)
 
+    def get_idp_cdf_mappings_by_group(self, cdf_project) -> IdpCdfMappingsByGroup:
+        """
+        Index of all IdpCdfMappings for the given cdf_project by cdf_group,
+        for constant time lookups instead of 'get_idp_cdf_mapping_for_group' per group
+        """
+        mappings_by_group = IdpCdfMappingsByGroup(cdf_project)
+        for idp_cdf_mapping_project in self.idp_cdf_mappings or []:
+            if cdf_project != idp_cdf_mapping_project.cdf_project:
+                continue
+            for mapping in idp_cdf_mapping_project.mappings:
+                mappings_by_group.add(mapping)
+        return mappings_by_group
+
 
 class BootstrapDeleteConfig(Model):
     """
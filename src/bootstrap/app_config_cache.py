@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import os
+import pickle
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from . import __version__
+from .app_config import BootstrapCoreConfig, Namespace
+from .app_config_includes import get_include_paths
+from .app_resolved_config import ResolvedConfig
+
+# same pattern as dependency-injector uses to interpolate '${ENV_NAME}' or '${ENV_NAME:default}'
+ENV_MARKER_RE = re.compile(r"\${(?P<name>[^}^{:]+)(?P<separator>:?)(?P<default>.*?)}")
+
+# never written to disk, as they contain the IdP client-secret
+SENSITIVE_CONFIG_KEYS = ("idp-authentication", "idp_authentication")
+
+
+def get_env_marker_names(config_content: str) -> list[str]:
+    """All environment variable names referenced by '${..}' markers in a configuration"""
+    return sorted({match.group("name") for match in ENV_MARKER_RE.finditer(config_content)})
+
+
+def hash_config_file(config_path: str | Path, digest: Optional["hashlib._Hash"] = None) -> str:
+    """Hash of the configuration file content and the values of all environment variables it references.
+
+    Args:
+        config_path (str | Path): path to a yaml configuration (or fragment)
+        digest (hashlib._Hash, optional): to continue an existing digest. Defaults to a new sha256.
+
+    Returns:
+        str: hexdigest
+    """
+    digest = digest or hashlib.sha256()
+    config_content = Path(config_path).read_bytes()
+    digest.update(config_content)
+    for env_name in get_env_marker_names(config_content.decode("utf-8", errors="replace")):
+        # unset and empty envvars must give different hashes
+        env_value = os.getenv(env_name)
+        digest.update(f"\0{env_name}={'<unset>' if env_value is None else env_value}".encode())
+    return digest.hexdigest()
+
+
+def without_sensitive_keys(config: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a 'container.config()' without secrets, to be stored in the cache"""
+    return {
+        key: (without_sensitive_keys(value) if isinstance(value, dict) else value)
+        for key, value in config.items()
+        if key not in SENSITIVE_CONFIG_KEYS
+    }
+
+
+@dataclass
+class ConfigCacheEntry:
+    # interpolated 'container.config()', w/o 'cognite.idp-authentication'
+    config: dict[str, Any]
+    # validated 'bootstrap' section, if available for the command
+    bootstrap: Optional[BootstrapCoreConfig] = None
+    # expanded namespace tree, if computed by the command
+    resolved: Optional[ResolvedConfig] = None
+    # fragment-path : hash of all files from 'bootstrap.includes', merged into 'bootstrap'
+    fragment_hashes: dict[str, str] = field(default_factory=dict)
+
+
+def hash_include_files(config: dict[str, Any], config_path: Path) -> dict[str, str]:
+    """Hashes of all fragments listed in 'bootstrap.includes' of an (interpolated) config"""
+    includes = (config.get("bootstrap") or {}).get("includes") or []
+    return {str(path): hash_config_file(path) for path in get_include_paths(includes, config_path.parent)}
+
+
+class ConfigCache:
+    """Opt-in on-disk cache of the validated configuration.
+
+    The cache key is a hash of
+    - the configuration file content
+    - the values of all environment variables referenced in it
+    - the bootstrap-cli version (as model and resolution logic can change between releases)
+
+    An entry is only a hit if all 'bootstrap.includes' fragments are unchanged too.
+    Each fragment is additionally cached on its own, so a change to one fragment only re-validates that one.
+
+    With a cache hit the 'diagram' command skips yaml parsing, pydantic validation and scope resolution.
+    Commands which need the 'cognite' section still parse the yaml (secrets are never cached),
+    but skip validation of the 'bootstrap' section and scope resolution.
+
+    The cache uses pickle, so only point it to a directory you own.
+    """
+
+    def __init__(self, cache_dir: str | Path, config_path: str | Path):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.config_path = Path(config_path)
+        self._key: Optional[str] = None
+        # last loaded entry, None for a cache miss
+        self.entry: Optional[ConfigCacheEntry] = None
+
+    @property
+    def key(self) -> str:
+        # computed on first access, after 'init_container' loaded the .env file
+        if self._key is None:
+            digest = hashlib.sha256(f"bootstrap-cli v{__version__}\0".encode())
+            self._key = hash_config_file(self.config_path, digest)
+        return self._key
+
+    @property
+    def cache_file(self) -> Path:
+        return self.cache_dir / f"config-{self.key}.pickle"
+
+    def _read(self, cache_file: Path) -> Any:
+        try:
+            with open(cache_file, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            logging.debug(f"Config cache miss: {cache_file}")
+        except Exception as e:
+            # corrupt or incompatible entries are treated as a miss and overwritten later
+            logging.warning(f"Ignoring unreadable config cache entry {cache_file}: {e}")
+        return None
+
+    def _write(self, cache_file: Path, entry: Any) -> None:
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # write to a temp-file and rename, so parallel runs never read a partial entry
+            with tempfile.NamedTemporaryFile("wb", dir=self.cache_dir, delete=False, suffix=".tmp") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f.name, cache_file)
+            logging.debug(f"Config cache stored: {cache_file}")
+        except OSError as e:
+            # caching is an optimisation only, never fail a command because of it
+            logging.warning(f"Unable to store config cache entry {cache_file}: {e}")
+
+    def load(self) -> Optional[ConfigCacheEntry]:
+        entry = self._read(self.cache_file)
+        if entry is None:
+            return None
+
+        if not isinstance(entry, ConfigCacheEntry):
+            logging.warning(f"Ignoring unexpected config cache entry {self.cache_file}")
+            return None
+
+        try:
+            fragment_hashes = hash_include_files(entry.config, self.config_path)
+        except Exception as e:
+            logging.debug(f"Config cache miss, included fragments not readable: {e}")
+            return None
+        if fragment_hashes != getattr(entry, "fragment_hashes", {}):
+            logging.debug(f"Config cache miss, included fragments changed: {self.cache_file}")
+            return None
+
+        logging.debug(f"Config cache hit: {self.cache_file}")
+        self.entry = entry
+        return entry
+
+    def store(self, entry: ConfigCacheEntry) -> None:
+        if not entry.fragment_hashes:
+            entry.fragment_hashes = hash_include_files(entry.config, self.config_path)
+        self._write(self.cache_file, entry)
+
+    def fragment_cache_file(self, fragment_path: Path) -> Path:
+        digest = hashlib.sha256(f"bootstrap-cli v{__version__}\0".encode())
+        return self.cache_dir / f"fragment-{hash_config_file(fragment_path, digest)}.pickle"
+
+    def load_fragment(self, fragment_path: Path) -> Optional[list[Namespace]]:
+        namespaces = self._read(self.fragment_cache_file(fragment_path))
+        if namespaces is not None:
+            logging.debug(f"Config cache hit for fragment: {fragment_path}")
+        return namespaces
+
+    def store_fragment(self, fragment_path: Path, namespaces: list[Namespace]) -> None:
+        self._write(self.fragment_cache_file(fragment_path), namespaces)
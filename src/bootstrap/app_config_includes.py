@@ -0,0 +1,121 @@
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Type
+
+import yaml
+from dependency_injector import providers
+
+from .app_config import BootstrapCoreConfig, Namespace, NamespaceFragment
+from .app_exceptions import BootstrapConfigError
+
+if TYPE_CHECKING:
+    from .app_config_cache import ConfigCache
+
+FRAGMENT_FILE_PATTERNS = ("*.yml", "*.yaml")
+
+
+def get_include_paths(includes: list[str], base_dir: str | Path) -> list[Path]:
+    """Expands 'bootstrap.includes' to the list of fragment files.
+
+    Args:
+        includes (list[str]): files or directories, relative paths are resolved from 'base_dir'
+        base_dir (str | Path): folder of the main config file
+
+    Returns:
+        list[Path]: fragment files, directories expanded to their '*.yml' and '*.yaml' files in sorted order
+    """
+    include_paths: list[Path] = []
+    for include in includes:
+        include_path = Path(base_dir) / Path(include).expanduser()
+        if include_path.is_dir():
+            include_paths.extend(
+                sorted(path for pattern in FRAGMENT_FILE_PATTERNS for path in include_path.glob(pattern))
+            )
+        elif include_path.is_file():
+            include_paths.append(include_path)
+        else:
+            raise BootstrapConfigError(f"Included config fragment {include_path} does not exist")
+    return include_paths
+
+
+def load_namespace_fragment(
+    fragment_path: Path, config_cache: Optional["ConfigCache"] = None, loader: Type = yaml.SafeLoader
+) -> list[Namespace]:
+    """Parses and validates one fragment, or takes it from the cache if the file (and used envvars) didn't change"""
+    if config_cache and (namespaces := config_cache.load_fragment(fragment_path)) is not None:
+        return namespaces
+
+    # same '${ENV_NAME}' interpolation as the main config
+    fragment_config = providers.Configuration()
+    fragment_config.from_yaml(fragment_path, required=True, loader=loader)
+    namespaces = NamespaceFragment.model_validate(fragment_config() or {}).namespaces
+    logging.debug(f"Validated config fragment {fragment_path} with {len(namespaces)} namespaces")
+
+    if config_cache:
+        config_cache.store_fragment(fragment_path, namespaces)
+    return namespaces
+
+
+def merge_namespaces(namespaces_by_source: list[tuple[Path, list[Namespace]]]) -> list[Namespace]:
+    """Merges namespaces from the main config and all fragments.
+
+    Namespaces with the same 'ns-name' are merged into one by appending their nodes,
+    so teams can own single nodes of a shared namespace. A node-name must be unique over all files.
+    """
+    merged: dict[str, Namespace] = {}
+    node_sources: dict[str, Path] = {}
+    for source, namespaces in namespaces_by_source:
+        for ns in namespaces:
+            for ns_node in ns.ns_nodes:
+                if ns_node.node_name in node_sources:
+                    raise BootstrapConfigError(
+                        f"Node-name {ns_node.node_name} from {source} "
+                        f"is already defined in {node_sources[ns_node.node_name]}"
+                    )
+                node_sources[ns_node.node_name] = source
+
+            if ns.ns_name in merged:
+                # new validated instances, never modify the (cached) fragment results
+                existing = merged[ns.ns_name]
+                merged[ns.ns_name] = Namespace.model_validate(
+                    {
+                        "ns_name": existing.ns_name,
+                        "description": existing.description or ns.description,
+                        "ns_nodes": existing.ns_nodes + ns.ns_nodes,
+                    }
+                )
+            else:
+                merged[ns.ns_name] = ns
+    return list(merged.values())
+
+
+def load_bootstrap_config(
+    bootstrap: dict,
+    config_path: str | Path,
+    config_cache: Optional["ConfigCache"] = None,
+    loader: Type = yaml.SafeLoader,
+) -> BootstrapCoreConfig:
+    """Validates the 'bootstrap' section and merges the namespaces of all 'includes' fragments into it.
+
+    Args:
+        bootstrap (dict): interpolated 'bootstrap' section of the main config
+        config_path (str | Path): main config file, relative 'includes' are resolved from its folder
+        config_cache (ConfigCache, optional): to skip validation of unchanged fragments. Defaults to None.
+        loader (Type, optional): yaml loader for the fragments. Defaults to yaml.SafeLoader.
+
+    Returns:
+        BootstrapCoreConfig: with the merged namespaces
+    """
+    bootstrap_config = BootstrapCoreConfig.model_validate(bootstrap)
+    if not bootstrap_config.includes:
+        return bootstrap_config
+
+    config_path = Path(config_path)
+    namespaces_by_source = [(config_path, bootstrap_config.namespaces)] + [
+        (fragment_path, load_namespace_fragment(fragment_path, config_cache, loader))
+        for fragment_path in get_include_paths(bootstrap_config.includes, config_path.parent)
+    ]
+    # validated again, unlike 'model_copy(update=..)', the already validated nodes are not copied
+    return BootstrapCoreConfig.model_validate(
+        {**dict(bootstrap_config), "namespaces": merge_namespaces(namespaces_by_source)}
+    )
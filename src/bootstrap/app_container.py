@@ -3,17 +3,43 @@ import os
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional, Type
 
+import yaml
 from dependency_injector import containers, providers
 from dotenv import load_dotenv
 
 from .app_config import BootstrapCoreConfig, BootstrapDeleteConfig, CommandMode
+from .app_config_cache import ConfigCache, ConfigCacheEntry
+from .app_config_includes import load_bootstrap_config
 from .common.cognite_client import CogniteConfig, get_cognite_client
+from .common.logs import set_json_formatter, start_queue_logging, stop_queue_logging
+
+
+def get_yaml_loader(fast: bool = True) -> Type:
+    """Yaml loader used to parse the configuration.
+
+    The C-accelerated 'CSafeLoader' is used if PyYAML was built with libyaml, else the pure-Python 'SafeLoader'.
+    Both share the same constructors and resolvers as the dependency-injector default 'YamlLoader',
+    and the '${ENV_NAME}' interpolation is done on the raw text before parsing, so results are identical.
+
+    Args:
+        fast (bool, optional): use the C-accelerated loader if available. Defaults to True.
+
+    Returns:
+        Type: yaml loader class
+    """
+    if fast and getattr(yaml, "__with_libyaml__", False):
+        return yaml.CSafeLoader
+    return yaml.SafeLoader
 
 
 def init_container(
     container_cls: Type[containers.Container],
     config_path: str | Path = "/etc/f25e/config.yaml",
     dotenv_path: str | Path | None = None,
+    config_cache: Optional[ConfigCache] = None,
+    logging_settings: Optional[dict] = None,
+    cognite_settings: Optional[dict] = None,
+    keep_logging: bool = False,
 ) -> containers.Container:
     """Spinning up container and
 
@@ -21,6 +47,12 @@ def init_container(
         container_cls (containers.Container): support different
         config_path (str | Path, optional): _description_. Defaults to "/etc/f25e/config.yaml".
         dotenv_path (str | Path, optional): _description_. Defaults to None.
+        config_cache (ConfigCache, optional): opt-in cache of the validated configuration. Defaults to None.
+        logging_settings (dict, optional): 'log_format' and 'log_queue' from the cli. Defaults to None.
+        cognite_settings (dict, optional): merged over the 'cognite' section, like 'max-workers' from the cli.
+            Defaults to None.
+        keep_logging (bool, optional): keep the active logging instead of configuring it again,
+            for a configuration reloaded by a running command. Defaults to False.
 
     Returns:
         _type_: _description_
@@ -34,9 +66,32 @@ def init_container(
         # -v "/home/runner/work/cdf-config-hub/cdf-config-hub":"/github/workspace"
         # the buildpack image starts in the workspace-folder "/workspace",
         # which requires to extend the path to load the config
-        container.config.from_yaml(Path("/github/workspace") / config_path, required=True)  # type: ignore
+        config_path = Path("/github/workspace") / config_path
+
+    cache_entry: Optional[ConfigCacheEntry] = None
+    if config_cache:
+        config_cache.config_path = Path(config_path)
+        cache_entry = config_cache.load()
+
+    if cache_entry and not issubclass(container_cls, CogniteContainer):
+        # skip yaml parsing, the cached config contains everything but the (secret) IdP authentication
+        container.config.from_dict(cache_entry.config)
     else:
-        container.config.from_yaml(config_path, required=True)  # type: ignore
+        container.config.from_yaml(config_path, required=True, loader=get_yaml_loader())  # type: ignore
+
+    if cache_entry and cache_entry.bootstrap and hasattr(container, "bootstrap"):
+        # skip pydantic validation of the 'bootstrap' section
+        container.bootstrap.override(providers.Object(cache_entry.bootstrap))  # type: ignore
+    elif hasattr(container, "bootstrap") and container.config.bootstrap.includes():
+        # merge the namespaces from all 'includes' fragments, unchanged fragments come from the cache
+        bootstrap_config = load_bootstrap_config(
+            container.config.bootstrap(), config_path, config_cache=config_cache, loader=get_yaml_loader()
+        )
+        container.bootstrap.override(providers.Object(bootstrap_config))  # type: ignore
+
+    if cognite_settings and issubclass(container_cls, CogniteContainer):
+        # cli parameters take precedence over the 'cognite' section
+        container.config.cognite.from_dict(cognite_settings)
 
     # TODO: inject an empty {} if not present for 'bootstrap' to trigger a default?
     # how to make this smarter in pydantic?
@@ -45,15 +100,30 @@ def init_container(
         container.config()["bootstrap"] = {}
     logging.debug(f"{container.config()=}")
 
+    if keep_logging:
+        # 'init_logging()' would truncate the log files and restart the queue listener
+        container.logging.override(providers.Object(logging.getLogger()))  # type: ignore
+    elif logging_settings:
+        container.logging.add_kwargs(**logging_settings)
+
     container.init_resources()  # i.e.logging
 
     return container
 
 
-def init_logging(logging_config: Optional[dict], deprecated_logger_config: Optional[dict]):
+def init_logging(
+    logging_config: Optional[dict],
+    deprecated_logger_config: Optional[dict],
+    log_format: str = "text",
+    log_queue: bool = False,
+):
     # https://docs.python.org/3/howto/logging-cookbook.html#logging-to-a-single-file-from-multiple-processes
     # from logging-cookbook examples for 'logging_config' dict
     # TODO: needed to handle missing log folders?
+
+    # handlers of a previous container go back to the root logger, to be replaced by the new config
+    stop_queue_logging()
+
     if logging_config:
         logging.config.dictConfig(logging_config)
 
@@ -95,8 +165,16 @@ def init_logging(logging_config: Optional[dict], deprecated_logger_config: Optio
             ],
         )
 
+    if log_format == "json":
+        set_json_formatter()
+    if log_queue:
+        # the configured handlers write from a listener thread, the command only enqueues records
+        start_queue_logging()
+
     yield logging.getLogger()
 
+    stop_queue_logging()
+
 
 def shutdown_container(container):
     logging.debug("function to handle additional shutdown of resources")
@@ -164,4 +242,7 @@ ContainerSelector: dict[CommandMode, Type[containers.Container]] = {
     CommandMode.DIAGRAM: DiagramCommandContainer,
     CommandMode.DEPLOY: DeployCommandContainer,
     CommandMode.DELETE: DeleteCommandContainer,
+    # same configuration as 'deploy'
+    CommandMode.DIFF: DeployCommandContainer,
+    CommandMode.RECONCILE: DeployCommandContainer,
 }
@@ -0,0 +1,49 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from .app_config import NamespaceNode, RoleType, ScopeCtxType
+
+# scopes of one role-type, like {ScopeCtxType.RAWDB: ('src:001:sap:rawdb', ..), ScopeCtxType.DATASET: (..), ..}
+ResolvedScopeCtx = dict[ScopeCtxType, tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class ResolvedGroup:
+    """A CDF group from the namespace hierarchy with all its scopes expanded,
+    including the scopes from 'shared-access' nodes.
+    """
+
+    group_name: str
+    role_type: RoleType
+    ns_name: str
+    # None for namespace-level groups like 'cdf:src:all:owner'
+    node_name: Optional[str]
+    scope_ctx_by_role_type: dict[RoleType, ResolvedScopeCtx]
+
+
+@dataclass(frozen=True)
+class ResolvedConfig:
+    """Result of expanding the 'bootstrap.namespaces' tree exactly once per run.
+
+    Contains every target name (datasets, RAW DBs, spaces), the scopes of all node- and
+    namespace-level groups and the node lookups required by validation.
+    It is shared by validation, 'deploy' and 'diagram'. Frozen only prevents reassigning its fields,
+    it holds plain dicts to stay picklable for the config cache. Commands get deep copies of the dicts
+    they can change ('generate_target_datasets()', 'get_scope_ctx_groupedby_role_type()').
+    """
+
+    # dataset_name : {description, metadata, external_id}
+    datasets: dict[str, dict[str, Any]]
+    raw_dbs: frozenset[str]
+    spaces: frozenset[str]
+    # explicit node-names from config, by node-name
+    nodes: dict[str, NamespaceNode]
+    # explicit and aggregated node-names (like 'all' or 'src:all'), valid as shared-access reference
+    node_names: frozenset[str]
+    # (role_type, ns_name, node_name) : ResolvedGroup, insertion-ordered like 'generate_groups()'
+    groups: dict[tuple[RoleType, str, Optional[str]], ResolvedGroup]
+    # (node_name, role_type, shared_node_name) for each shared-access reference which doesn't exist
+    invalid_shared_access: tuple[tuple[str, RoleType, str], ...] = field(default_factory=tuple)
+
+    def get_group(self, role_type: RoleType, ns_name: str, node_name: Optional[str] = None) -> ResolvedGroup:
+        return self.groups[(role_type, ns_name, node_name)]
@@ -1,32 +1,22 @@
+from __future__ import annotations
+
+import copy
 import logging
 import re
+from collections.abc import Mapping, Sequence
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Generator, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 import yaml
-from cognite.client import CogniteClient
-from cognite.client.data_classes import (
-    Database,
-    DatabaseList,
-    DataSet,
-    DataSetList,
-    DataSetUpdate,
-    Group,
-)
-from cognite.client.data_classes.capabilities import Capability
-from cognite.client.data_classes.data_modeling.spaces import (
-    Space,
-    SpaceApply,
-    SpaceList,
-)
 
 from .. import __version__
-from ..app_cache import CogniteDeployedCache
 from ..app_config import (
     NEWLINE,
     AclAdminTypes,
     AclAllScopeOnlyTypes,
+    AclDefaultTypes,
     BootstrapCoreConfig,
     BootstrapDeleteConfig,
     CommandMode,
@@ -36,11 +26,22 @@ from ..app_config import (
     RoleTypeActions,
     ScopeCtxType,
     SharedAccess,
-    SharedNode,
     getAllAclTypes,
 )
+from ..app_config_cache import ConfigCache, ConfigCacheEntry, without_sensitive_keys
 from ..app_container import ContainerSelector, init_container
 from ..app_exceptions import BootstrapValidationError
+from ..app_resolved_config import ResolvedConfig, ResolvedGroup, ResolvedScopeCtx
+from ..common.tracing import TRACER, traced
+
+if TYPE_CHECKING:
+    # the Cognite SDK is only imported at runtime by commands talking to CDF, to keep 'diagram' startup fast
+    from cognite.client import CogniteClient
+    from cognite.client.data_classes import Database, DatabaseList, DataSetList, Group
+    from cognite.client.data_classes.data_modeling.spaces import Space, SpaceList
+
+# 'AclDefaultTypes' before disabled features removed some of them
+ALL_ACL_DEFAULT_TYPES = tuple(AclDefaultTypes)
 
 
 class CommandBase:
@@ -62,10 +63,26 @@ class CommandBase:
         debug: bool,
         dry_run: bool = False,
         dotenv_path: str | Path | None = None,
+        config_cache_dir: str | Path | None = None,
+        logging_settings: Optional[dict] = None,
+        cognite_settings: Optional[dict] = None,
     ):
+        # opt-in cache of the validated config and resolved scopes
+        self.config_cache: Optional[ConfigCache] = (
+            ConfigCache(cache_dir=config_cache_dir, config_path=config_path) if config_cache_dir else None
+        )
+
         # validate and load config according to command-mode
         ContainerCls = ContainerSelector[command]
-        self.container = init_container(ContainerCls, config_path=config_path, dotenv_path=dotenv_path)
+        with TRACER.span("init_container", command=str(command), config_cache=self.config_cache is not None):
+            self.container = init_container(
+                ContainerCls,
+                config_path=config_path,
+                dotenv_path=dotenv_path,
+                config_cache=self.config_cache,
+                logging_settings=logging_settings,
+                cognite_settings=cognite_settings,
+            )
 
         # instance variable declaration
         self.deployed: CogniteDeployedCache
@@ -83,11 +100,20 @@ class CommandBase:
 
         # init command-specific parts
         # if subclass(ContainerCls, CogniteContainer):
-        if command in (CommandMode.DEPLOY, CommandMode.DELETE, CommandMode.PREPARE):
+        if command in (
+            CommandMode.DEPLOY,
+            CommandMode.DELETE,
+            CommandMode.PREPARE,
+            CommandMode.DIFF,
+            CommandMode.RECONCILE,
+        ):
             #
             # Cognite initialisation
             #
-            self.client: CogniteClient = self.container.cognite_client()
+            from ..app_cache import CogniteDeployedCache
+
+            with TRACER.span("cognite_client"):
+                self.client: CogniteClient = self.container.cognite_client()
             # TODO: support: token_custom_args
             # client_name="inso-bootstrap-cli", token_custom_args=self.config.token_custom_args
 
@@ -95,17 +121,17 @@ class CommandBase:
             logging.info(f"Successful connection to CDF client to project: '{self.cdf_project}'")
 
             # load CDF group, dataset, rawdb config
-            self.deployed = CogniteDeployedCache(self.client, groups_only=(command == CommandMode.PREPARE))
+            with TRACER.span("deployed_cache", groups_only=command == CommandMode.PREPARE):
+                self.deployed = CogniteDeployedCache(self.client, groups_only=(command == CommandMode.PREPARE))
             self.deployed.log_counts()
 
         # not perfect refactoring yet, to handle the container/config parsing and loading for the different CommandModes
         match command:
             case CommandMode.DELETE:
                 self.delete_or_deprecate: BootstrapDeleteConfig = self.container.delete_or_deprecate()
-            case CommandMode.DEPLOY | CommandMode.DIAGRAM:
+            case CommandMode.DEPLOY | CommandMode.DIAGRAM | CommandMode.DIFF | CommandMode.RECONCILE:
                 # TODO: correct for DIAGRAM?!
-                self.bootstrap_config: BootstrapCoreConfig = self.container.bootstrap()
-                self.idp_cdf_mappings = self.bootstrap_config.idp_cdf_mappings
+                self.load_bootstrap_config()
 
                 if command == CommandMode.DIAGRAM:
                     # diagram, doesn't contain 'cognite' config
@@ -114,41 +140,6 @@ class CommandBase:
                     # Accessing the 'container.config()' directly to check availability
                     # TODO: how to configure an optional 'cognite' section in container directly?
                     self.cdf_project = self.container.config().get("cognite", {}).get("project")
-
-                #
-                # load 'bootstrap.features'
-                #
-                # unpack and process features
-                features = self.bootstrap_config.features
-
-                # TODO: not available for 'delete' but there must be a smarter solution
-                logging.debug(
-                    "Features from config.yaml or defaults (can be overridden by cli-parameters!): " f"{features=}"
-                )
-
-                # [OPTIONAL] default: True
-                self.with_raw_capability: bool = features.with_raw_capability
-                # [OPTIONAL] default: False
-                self.with_datamodel_capability: bool = features.with_datamodel_capability
-                # [OPTIONAL] default: False
-                self.with_undocumented_capabilities: bool = features.with_datamodel_capability
-
-                # [OPTIONAL] default: "allprojects"
-                CommandBase.AGGREGATED_LEVEL_NAME = features.aggregated_level_name
-                # [OPTIONAL] default: "cdf:"
-                # support for '' empty string
-                CommandBase.GROUP_NAME_PREFIX = f"{features.group_prefix}:" if features.group_prefix else ""
-                # [OPTIONAL] default: "dataset"
-                # support for '' empty string
-                CommandBase.DATASET_SUFFIX = f":{features.dataset_suffix}" if features.dataset_suffix else ""
-                # [OPTIONAL] default: "space"
-                # support for '' empty string
-                CommandBase.SPACE_SUFFIX = f":{features.space_suffix}" if features.space_suffix else ""
-                # [OPTIONAL] default: "rawdb"
-                # support for '' empty string
-                CommandBase.RAW_SUFFIX = f":{features.rawdb_suffix}" if features.rawdb_suffix else ""
-                # [OPTIONAL] default: ["", ":state"]
-                CommandBase.RAW_VARIANTS = [""] + [f":{suffix}" for suffix in features.rawdb_additional_variants]
             case CommandMode.PREPARE:
                 # set to 'cdf' as PREPARE has an optional 'bootstrap_config.features.group-prefix' config
                 # app_container.init_container provides the default if missing
@@ -157,6 +148,66 @@ class CommandBase:
                 features = self.bootstrap_config.features
                 CommandBase.GROUP_NAME_PREFIX = f"{features.group_prefix}:" if features.group_prefix else ""
 
+        self.store_config_cache(command)
+
+    def store_config_cache(self, command: CommandMode) -> None:
+        """Stores the validated config and resolved scopes for the next run, if not loaded from the cache"""
+        if self.config_cache and not self.config_cache.entry:
+            self.config_cache.store(
+                ConfigCacheEntry(
+                    config=without_sensitive_keys(self.container.config()),
+                    bootstrap=getattr(self, "bootstrap_config", None),
+                    resolved=(
+                        self.resolved
+                        if command in (CommandMode.DEPLOY, CommandMode.DIAGRAM, CommandMode.DIFF, CommandMode.RECONCILE)
+                        else None
+                    ),
+                )
+            )
+
+    def load_bootstrap_config(self) -> None:
+        """Loads the 'bootstrap' section from the container and applies its features,
+        again after each configuration change of 'reconcile'
+        """
+        self.bootstrap_config: BootstrapCoreConfig = self.container.bootstrap()
+        self.idp_cdf_mappings = self.bootstrap_config.idp_cdf_mappings
+
+        #
+        # load 'bootstrap.features'
+        #
+        # unpack and process features
+        features = self.bootstrap_config.features
+
+        # TODO: not available for 'delete' but there must be a smarter solution
+        logging.debug(
+            "Features from config.yaml or defaults (can be overridden by cli-parameters!): features=%r",
+            features,
+        )
+
+        # [OPTIONAL] default: True
+        self.with_raw_capability: bool = features.with_raw_capability
+        # [OPTIONAL] default: False
+        self.with_datamodel_capability: bool = features.with_datamodel_capability
+        # [OPTIONAL] default: False
+        self.with_undocumented_capabilities: bool = features.with_datamodel_capability
+
+        # [OPTIONAL] default: "allprojects"
+        CommandBase.AGGREGATED_LEVEL_NAME = features.aggregated_level_name
+        # [OPTIONAL] default: "cdf:"
+        # support for '' empty string
+        CommandBase.GROUP_NAME_PREFIX = f"{features.group_prefix}:" if features.group_prefix else ""
+        # [OPTIONAL] default: "dataset"
+        # support for '' empty string
+        CommandBase.DATASET_SUFFIX = f":{features.dataset_suffix}" if features.dataset_suffix else ""
+        # [OPTIONAL] default: "space"
+        # support for '' empty string
+        CommandBase.SPACE_SUFFIX = f":{features.space_suffix}" if features.space_suffix else ""
+        # [OPTIONAL] default: "rawdb"
+        # support for '' empty string
+        CommandBase.RAW_SUFFIX = f":{features.rawdb_suffix}" if features.rawdb_suffix else ""
+        # [OPTIONAL] default: ["", ":state"]
+        CommandBase.RAW_VARIANTS = [""] + [f":{suffix}" for suffix in features.rawdb_additional_variants]
+
     @staticmethod
     def acl_template(actions: list[str], scope: dict[str, dict[str, Any]]) -> dict[str, Any]:
         return {"actions": actions, "scope": scope}
@@ -189,6 +240,7 @@ class CommandBase:
     def get_timestamp():
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+    @traced()
     def validate_config_length_limits(self):
         """
         Validate features in config
@@ -213,14 +265,11 @@ class CommandBase:
         # TODO: space extid limit?
         SPACE_EXTERNALID_LENGTH_LIMIT = 44
 
-        # create all required scopes to check name lengths
+        # all required scopes to check name lengths
         all_scopes = {
-            # generate_target_raw_dbs -> returns a Set[str]
-            "raw": self.generate_target_raw_dbs(),  # all raw_dbs
-            # generate_target_datasets -> returns a Dict[str, Any]
-            "datasets": self.generate_target_datasets(),  # all datasets
-            # # generate_target_spaces -> returns a Set[str]
-            "spaces": self.generate_target_spaces(),  # all spaces
+            "raw": self.resolved.raw_dbs,  # all raw_dbs
+            "datasets": self.resolved.datasets,  # all datasets
+            "spaces": self.resolved.spaces,  # all spaces
         }
 
         errors = []
@@ -274,38 +323,15 @@ class CommandBase:
         # return self for chaining
         return self
 
+    @traced()
     def validate_config_shared_access(self):
         """Check shared-access configuration, that all node-names exist
 
         Returns:
             self: allows validation chaining
         """
-        errors = []
-
-        # collect all explicit node-names
-        ns_node_names = [ns_node.node_name for ns in self.bootstrap_config.namespaces for ns_node in ns.ns_nodes]
-
-        # add aggregated node-names (using AGGREGATED_LEVEL_NAME)
-        ns_node_names.extend(
-            [CommandBase.get_allprojects_name_template()]  # top-level
-            + [
-                CommandBase.get_allprojects_name_template(ns_name=ns.ns_name)  # ns-level
-                for ns in self.bootstrap_config.namespaces
-            ]
-        )
-
-        # check for each node-name if a shared-access exists
-        for node_name in ns_node_names:
-            if shared_access := self.get_ns_node_shared_access_by_name(node_name):
-                errors.extend(
-                    [
-                        # collect node | role | invalid shared-access node-name
-                        (node_name, role, shared_node.node_name)
-                        for role in [RoleType.OWNER, RoleType.READ]
-                        for shared_node in getattr(shared_access, role)
-                        if shared_node.node_name not in ns_node_names
-                    ]
-                )
+        # unresolvable shared-access references are collected once during 'resolve_config()'
+        errors = self.resolved.invalid_shared_access
 
         if errors:
             raise BootstrapValidationError(
@@ -334,6 +360,7 @@ class CommandBase:
         # return self for chaining
         return self
 
+    @traced()
     def validate_config_is_cdf_project_in_mappings(self, cdf_project_from_cli: Optional[str] = None):
         # check if mapping exists for configured cdf-project
         # or for explicit configured cli parameter ('diagram' only)
@@ -349,6 +376,15 @@ class CommandBase:
         # return self for chainingself.core.
         return self
 
+    def exclude_disabled_acl_types(self) -> None:
+        """Without RAW DBs or spaces, their capabilities are not created either.
+        Updates the (module-level) default types in place, safe to call again after the features changed.
+        """
+        disabled_acl_types = ([] if self.with_raw_capability else ["raw"]) + (
+            [] if self.with_datamodel_capability else ["dataModels", "dataModelInstances"]
+        )
+        AclDefaultTypes[:] = [acl_type for acl_type in ALL_ACL_DEFAULT_TYPES if acl_type not in disabled_acl_types]
+
     def generate_default_actions(self, role_type: RoleType, acl_type: str) -> list[str]:
         """bootstrap-cli supports two roles: READ, OWNER (called 'role_type' as parameter)
         Each acl and role resolves to a list of default or custom actions.
@@ -367,243 +403,229 @@ class CommandBase:
     def generate_admin_actions(self, acl_admin_type):
         return RoleTypeActions[RoleType.ADMIN][acl_admin_type]
 
-    def get_ns_nodes_by_sharednode(self, shared_nodes: list[SharedNode]) -> Generator[NamespaceNode, None, None]:
-        # with 3.13 this is legit code: -> Generator[NamespaceNode]
-        # https://stackoverflow.com/questions/57363181/proper-use-generator-typing
-        """Gets a list of SharedNodes and returns the corresponding NamespaceNodes
+    @cached_property
+    def resolved(self) -> ResolvedConfig:
+        """The namespace tree expanded into all target names and group scopes.
+        Computed on first access, after the naming features have been loaded in '__init__',
+        or taken from the config cache.
+        """
+        if self.config_cache and self.config_cache.entry and self.config_cache.entry.resolved:
+            return self.config_cache.entry.resolved
+        return self.resolve_config()
 
-        Args:
-            shared_nodes (list[SharedNode]): either .owner or .read list of SharedAccess
+    @traced()
+    def resolve_config(self) -> ResolvedConfig:
+        """Single pass over 'bootstrap.namespaces' to compute
+        - all target datasets, RAW DBs and spaces
+        - the scopes of all node- and namespace-level groups, including 'shared-access' expansion
+        - the node lookups required by validation
 
-        Yields:
-            Generator[NamespaceNode]: one by one NamespaceNode
+        Returns:
+            ResolvedConfig: frozen structure shared by validation, 'deploy' and 'diagram'
         """
-        lookup_node: Optional[NamespaceNode] = None
-        for shared_node in shared_nodes:
-            if shared_node.node_name.endswith(CommandBase.AGGREGATED_LEVEL_NAME):
-                # this is the top-level or ns-level node, which cannot be found in the config
-                # create 'fake node'
-                lookup_node = NamespaceNode(
-                    node_name=shared_node.node_name,  # type: ignore
-                )
-            for ns in self.bootstrap_config.namespaces:
-                for ns_node in ns.ns_nodes:
-                    if shared_node.node_name == ns_node.node_name:
-                        lookup_node = ns_node
-                        break  # found and exit loop
-            # must exist, so if not found, raise error
-            assert lookup_node is not None, f"Node {shared_node} not found in config"
-            yield lookup_node
+        namespaces = self.bootstrap_config.namespaces
 
-    def get_ns_node_shared_access_by_name(self, node_name: str) -> SharedAccess:
-        for ns in self.bootstrap_config.namespaces:
-            for ns_node in ns.ns_nodes:
-                if node_name == ns_node.node_name:
-                    assert ns_node.shared_access
-                    return ns_node.shared_access
-        return SharedAccess(owner=[], read=[])
+        dataset_name_template = self.get_dataset_name_template()
+        raw_dbs_name_template = self.get_raw_dbs_name_template()
 
-    def get_raw_dbs_groupedby_role_type(self, role_type: RoleType, ns_name: str, node: Optional[NamespaceNode] = None):
-        raw_db_names: dict[RoleType, list[str]] = {RoleType.OWNER: [], RoleType.READ: []}
-        if node:
-            raw_db_names[role_type].extend(
-                # the dataset which belongs directly to this node_name
-                [
-                    self.get_raw_dbs_name_template().format(node_name=node.node_name, raw_variant=raw_variant)
-                    for raw_variant in CommandBase.RAW_VARIANTS
-                ]
+        def dataset_name(node_name: str) -> str:
+            return dataset_name_template.format(node_name=node_name)
+
+        def raw_db_names(node_name: str) -> tuple[str, ...]:
+            return tuple(
+                raw_dbs_name_template.format(node_name=node_name, raw_variant=raw_variant)
+                for raw_variant in CommandBase.RAW_VARIANTS
             )
 
-            # for owner groups add "shared_owner_access" raw_dbs too
-            if role_type == RoleType.OWNER:
-                raw_db_names[RoleType.OWNER].extend(
-                    [
-                        self.get_raw_dbs_name_template().format(
-                            node_name=shared_node.node_name, raw_variant=raw_variant
-                        )
-                        # find the group_config which matches the name,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).owner
-                        )
-                        for raw_variant in CommandBase.RAW_VARIANTS
-                    ]
-                )
-                raw_db_names[RoleType.READ].extend(
-                    [
-                        self.get_raw_dbs_name_template().format(
-                            node_name=shared_node.node_name, raw_variant=raw_variant
-                        )
-                        # find the group_config which matches the name,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).read
-                        )
-                        for raw_variant in CommandBase.RAW_VARIANTS
-                    ]
-                )
+        def space_names(node: NamespaceNode) -> tuple[str, ...]:
+            # variants can be different for each node
+            return tuple(
+                self.get_space_name_template(node_name=node.node_name, space_variant=space_variant)
+                for space_variant in [""] + node.space_variants
+            )
 
-        else:  # handling the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME}
-            raw_db_names[role_type].extend(
-                [
-                    self.get_raw_dbs_name_template().format(node_name=ns_node.node_name, raw_variant=raw_variant)
-                    for ns in self.bootstrap_config.namespaces
-                    if ns.ns_name == ns_name
-                    for ns_node in ns.ns_nodes
-                    for raw_variant in CommandBase.RAW_VARIANTS
-                ]
-                # adding the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME} rawdbs
-                + [  # noqa
-                    self.get_raw_dbs_name_template().format(
-                        node_name=self.get_allprojects_name_template(ns_name=ns_name), raw_variant=raw_variant
+        nodes: dict[str, NamespaceNode] = {}
+        ns_nodes_by_ns_name: dict[str, list[NamespaceNode]] = {}
+        for ns in namespaces:
+            ns_nodes_by_ns_name.setdefault(ns.ns_name, []).extend(ns.ns_nodes)
+            nodes.update({ns_node.node_name: ns_node for ns_node in ns.ns_nodes})
+
+        # aggregated node-names, like 'all' (top-level) and 'src:all' (ns-level)
+        aggregated_node_names = {self.get_allprojects_name_template()} | {
+            self.get_allprojects_name_template(ns_name=ns_name) for ns_name in ns_nodes_by_ns_name
+        }
+        node_names = frozenset(nodes) | frozenset(aggregated_node_names)
+
+        #
+        # targets
+        #
+        datasets: dict[str, dict[str, Any]] = {
+            # dataset_name : {Optional[dataset_description], Optional[dataset_metadata], ..}
+            (fq_ns_name := dataset_name(ns_node.node_name)): {
+                "description": ns_node.description,
+                "metadata": ns_node.metadata,
+                # if not explicit provided, same template as name
+                "external_id": ns_node.external_id or fq_ns_name,
+            }
+            for ns_node in nodes.values()
+        }
+        raw_dbs: set[str] = {raw_db for node_name in nodes for raw_db in raw_db_names(node_name)}
+        spaces: set[str] = {space for ns_node in nodes.values() for space in space_names(ns_node)}
+
+        # include 'allproject' and '{ns_name}:{AGGREGATED_LEVEL_NAME}' targets
+        # creating 'all' at group type level + top-level
+        for ns_name in list(ns_nodes_by_ns_name) + [""]:
+            aggregated_node_name = self.get_allprojects_name_template(ns_name=ns_name)
+            datasets[dataset_name(aggregated_node_name)] = {
+                "description": f"Dataset for '{CommandBase.AGGREGATED_LEVEL_NAME}' Owner groups",
+                # "metadata": "",
+                "external_id": aggregated_node_name,
+            }
+            raw_dbs.update(raw_db_names(aggregated_node_name))
+            spaces.add(self.get_space_name_template(node_name=aggregated_node_name))
+
+        #
+        # shared-access expansion, once per node
+        #
+        invalid_shared_access: list[tuple[str, RoleType, str]] = []
+
+        def get_shared_nodes(ns_node: NamespaceNode, role_type: RoleType) -> list[NamespaceNode]:
+            shared_nodes: list[NamespaceNode] = []
+            assert ns_node.shared_access
+            for shared_node in getattr(ns_node.shared_access, role_type):
+                if shared_node.node_name in nodes:
+                    shared_nodes.append(nodes[shared_node.node_name])
+                elif shared_node.node_name in aggregated_node_names:
+                    # this is the top-level or ns-level node, which cannot be found in the config
+                    # create 'fake node'
+                    shared_nodes.append(NamespaceNode(node_name=shared_node.node_name))  # type: ignore
+                else:
+                    # reported by 'validate_config_shared_access()'
+                    invalid_shared_access.append((ns_node.node_name, role_type, shared_node.node_name))
+            return shared_nodes
+
+        def empty_scope_ctx() -> dict[ScopeCtxType, list[str]]:
+            return {ScopeCtxType.RAWDB: [], ScopeCtxType.DATASET: [], ScopeCtxType.SPACE: []}
+
+        def add_node_scopes(scope_ctx: dict[ScopeCtxType, list[str]], ns_node: NamespaceNode) -> None:
+            scope_ctx[ScopeCtxType.RAWDB].extend(raw_db_names(ns_node.node_name))
+            scope_ctx[ScopeCtxType.DATASET].append(dataset_name(ns_node.node_name))
+            scope_ctx[ScopeCtxType.SPACE].extend(space_names(ns_node))
+
+        def freeze(
+            scope_ctx_by_role_type: dict[RoleType, dict[ScopeCtxType, list[str]]]
+        ) -> dict[RoleType, ResolvedScopeCtx]:
+            return {
+                role_type: {scope_type: tuple(scopes) for scope_type, scopes in scope_ctx.items()}
+                for role_type, scope_ctx in scope_ctx_by_role_type.items()
+            }
+
+        shared_nodes_by_node_name = {
+            node_name: {
+                role_type: get_shared_nodes(ns_node, role_type) for role_type in [RoleType.OWNER, RoleType.READ]
+            }
+            for node_name, ns_node in nodes.items()
+        }
+
+        #
+        # groups, in the same order as 'generate_groups()'
+        #
+        groups: dict[tuple[RoleType, str, Optional[str]], ResolvedGroup] = {}
+        for role_type in [RoleType.READ, RoleType.OWNER]:  # w/o 'admin'
+            for ns_name, ns_nodes in ns_nodes_by_ns_name.items():
+                for ns_node in ns_nodes:
+                    # detail level like cdf:src:001:public:read
+                    scope_ctx_by_role_type = {RoleType.OWNER: empty_scope_ctx(), RoleType.READ: empty_scope_ctx()}
+                    # the scopes which belong directly to this node_name
+                    add_node_scopes(scope_ctx_by_role_type[role_type], ns_node)
+                    # for owner groups add "shared_access" scopes too
+                    if role_type == RoleType.OWNER:
+                        for shared_role_type, shared_nodes in shared_nodes_by_node_name[ns_node.node_name].items():
+                            for shared_node in shared_nodes:
+                                add_node_scopes(scope_ctx_by_role_type[shared_role_type], shared_node)
+
+                    groups[(role_type, ns_name, ns_node.node_name)] = ResolvedGroup(
+                        group_name=f"{CommandBase.GROUP_NAME_PREFIX}{ns_node.node_name}:{role_type}",
+                        role_type=role_type,
+                        ns_name=ns_name,
+                        node_name=ns_node.node_name,
+                        scope_ctx_by_role_type=freeze(scope_ctx_by_role_type),
                     )
-                    for raw_variant in CommandBase.RAW_VARIANTS
-                ]
-            )
-            # **aggregated** ns-groups, don't support shared-access
-            # this bug was fixed for v3
-
-        # returns clear names grouped by role_type
-        return raw_db_names
-
-    def get_spaces_groupedby_role_type(self, role_type, ns_name, node: Optional[NamespaceNode] = None):
-        spaces_by_role_type: dict[RoleType, list[str]] = {RoleType.OWNER: [], RoleType.READ: []}
-        # for example fac:001:wasit, uc:002:meg, etc.
-        if node:
-            spaces_by_role_type[role_type].extend(
-                # the dataset which belongs directly to this node_name
-                [
-                    self.get_space_name_template(node_name=node.node_name, space_variant=space_variant)
-                    for space_variant in [""] + node.space_variants  # can be different for each node
-                ]
-            )
 
-            # for owner groups add "shared_access" datasets too
-            if role_type == RoleType.OWNER:
-                spaces_by_role_type[RoleType.OWNER].extend(
-                    [
-                        self.get_space_name_template(
-                            node_name=shared_node.node_name, space_variant=shared_space_variant
-                        )
-                        # find the group_config which matches the id,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).owner
-                        )
-                        for shared_space_variant in [""] + shared_node.space_variants  # can be different for each node
-                    ]
+                # group-type level like cdf:src:all:read
+                # (access to all datasets/ raw-dbs which belong to this group-type)
+                aggregated_node_name = self.get_allprojects_name_template(ns_name=ns_name)
+                scope_ctx_by_role_type = {RoleType.OWNER: empty_scope_ctx(), RoleType.READ: empty_scope_ctx()}
+                scope_ctx = scope_ctx_by_role_type[role_type]
+                scope_ctx[ScopeCtxType.RAWDB].extend(
+                    [raw_db for ns_node in ns_nodes for raw_db in raw_db_names(ns_node.node_name)]
+                    + list(raw_db_names(aggregated_node_name))
                 )
-                spaces_by_role_type[RoleType.READ].extend(
-                    [
-                        self.get_space_name_template(
-                            node_name=shared_node.node_name, space_variant=shared_space_variant
-                        )
-                        # find the group_config which matches the id,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).read
-                        )
-                        for shared_space_variant in [""] + shared_node.space_variants  # can be different for each node
-                    ]
+                scope_ctx[ScopeCtxType.DATASET].extend(
+                    [dataset_name(ns_node.node_name) for ns_node in ns_nodes] + [dataset_name(aggregated_node_name)]
                 )
-        # for example src, fac, uc, ca
-        else:  # handling the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME}
-            spaces_by_role_type[role_type].extend(
-                [
-                    # all datasets for each of the nodes of the given namespace
-                    self.get_space_name_template(node_name=ns_node.node_name)
-                    for ns in self.bootstrap_config.namespaces
-                    if ns.ns_name == ns_name
-                    for ns_node in ns.ns_nodes
-                ]
-                # adding the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME} dataset
-                + [self.get_space_name_template(node_name=self.get_allprojects_name_template(ns_name=ns_name))]  # noqa
-            )
-            # **aggregated** ns-groups, don't support shared-access
-
-        # returns clear names
-        return spaces_by_role_type
-
-    def get_datasets_groupedby_role_type(self, role_type: RoleType, ns_name: str, node: Optional[NamespaceNode] = None):
-        dataset_names: dict[RoleType, list[str]] = {RoleType.OWNER: [], RoleType.READ: []}
-        # for example fac:001:wasit, uc:002:meg, etc.
-        if node:
-            dataset_names[role_type].extend(
-                # the dataset which belongs directly to this node_name
-                [self.get_dataset_name_template().format(node_name=node.node_name)]
-            )
-
-            # for owner groups add "shared_access" datasets too
-            if role_type == RoleType.OWNER:
-                dataset_names[RoleType.OWNER].extend(
-                    [
-                        self.get_dataset_name_template().format(node_name=shared_node.node_name)
-                        # find the group_config which matches the id,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).owner
-                        )
-                    ]
+                # only the default space of each node, w/o space-variants
+                scope_ctx[ScopeCtxType.SPACE].extend(
+                    [self.get_space_name_template(node_name=ns_node.node_name) for ns_node in ns_nodes]
+                    + [self.get_space_name_template(node_name=aggregated_node_name)]
                 )
-                dataset_names[RoleType.READ].extend(
-                    [
-                        self.get_dataset_name_template().format(node_name=shared_node.node_name)
-                        # find the group_config which matches the id,
-                        # and check the "shared_access" groups list (else [])
-                        for shared_node in self.get_ns_nodes_by_sharednode(
-                            self.get_ns_node_shared_access_by_name(node.node_name).read
-                        )
-                    ]
+                # **aggregated** ns-groups, don't support shared-access
+
+                groups[(role_type, ns_name, None)] = ResolvedGroup(
+                    group_name=f"{CommandBase.GROUP_NAME_PREFIX}{aggregated_node_name}:{role_type}",
+                    role_type=role_type,
+                    ns_name=ns_name,
+                    node_name=None,
+                    scope_ctx_by_role_type=freeze(scope_ctx_by_role_type),
                 )
-        # for example src, fac, uc, ca
-        else:  # handling the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME} like 'uc:all:owner'
-            dataset_names[role_type].extend(
-                [
-                    # all datasets for each of the nodes of the given namespace
-                    self.get_dataset_name_template().format(node_name=ns_node.node_name)
-                    for ns in self.bootstrap_config.namespaces
-                    if ns.ns_name == ns_name
-                    for ns_node in ns.ns_nodes
-                ]
-                # adding the {ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME} dataset
-                + [  # noqa
-                    self.get_dataset_name_template().format(
-                        node_name=self.get_allprojects_name_template(ns_name=ns_name)
-                    )
-                ]
-            )
 
-            # **aggregated** ns-groups, don't support shared-access
-            # this bug was fixed for v3
+        return ResolvedConfig(
+            datasets=datasets,
+            raw_dbs=frozenset(raw_dbs),
+            spaces=frozenset(spaces),
+            nodes=nodes,
+            node_names=node_names,
+            groups=groups,
+            invalid_shared_access=tuple(invalid_shared_access),
+        )
 
-        # returns clear names
-        return dataset_names
+    def get_ns_node_shared_access_by_name(self, node_name: str) -> SharedAccess:
+        if ns_node := self.resolved.nodes.get(node_name):
+            assert ns_node.shared_access
+            return ns_node.shared_access
+        return SharedAccess(owner=[], read=[])
 
     def dataset_names_to_ids(self, dataset_names):
+        # called for each acl of each group, a lookup instead of scanning all deployed datasets
+        ids_by_name = self.deployed.datasets.get_ids_by_name()
         return [
             # get id for all dataset names
-            ds.id
-            for ds in self.deployed.datasets
-            if ds.name in dataset_names
+            ds_id
+            for dataset_name in dict.fromkeys(dataset_names)
+            for ds_id in ids_by_name.get(dataset_name, [])
         ]
 
     def get_scope_ctx_groupedby_role_type(
-        self, role_type: RoleType, ns_name: str, node: Optional[NamespaceNode] = None
-    ) -> dict[RoleType, dict[ScopeCtxType, list[str]]]:
-        rawdbs_by_role_type = self.get_raw_dbs_groupedby_role_type(role_type, ns_name, node)
-        ds_by_role_type = self.get_datasets_groupedby_role_type(role_type, ns_name, node)
-        spaces_by_role_type = self.get_spaces_groupedby_role_type(role_type, ns_name, node)
-
-        return {
-            role_type: {
-                ScopeCtxType.RAWDB: rawdbs_by_role_type[role_type],
-                ScopeCtxType.DATASET: ds_by_role_type[role_type],
-                ScopeCtxType.SPACE: spaces_by_role_type[role_type],
-            }
-            for role_type in [RoleType.OWNER, RoleType.READ]
-        }  # fmt: skip
+        self, role_type: RoleType, ns_name: str, node: Optional[NamespaceNode | str] = None
+    ) -> dict[RoleType, ResolvedScopeCtx]:
+        """Lookup of the resolved scopes for a node- or namespace-level group
+
+        Args:
+            role_type (RoleType): role of the group
+            ns_name (str): namespace of the group
+            node (NamespaceNode | str, optional): node or node-name for node-level groups. Defaults to None.
 
-    def generate_scope(self, acl_type: str, scope_ctx: dict[ScopeCtxType, list[str]]) -> dict[str, dict[str, Any]]:
+        Returns:
+            dict[RoleType, ResolvedScopeCtx]: copy of the scopes by role-type, including shared-access scopes
+        """
+        node_name = node.node_name if isinstance(node, NamespaceNode) else node
+        scope_ctx_by_role_type = self.resolved.get_group(role_type, ns_name, node_name).scope_ctx_by_role_type
+        # the scope names are tuples already
+        return {scope_role_type: dict(scope_ctx) for scope_role_type, scope_ctx in scope_ctx_by_role_type.items()}
+
+    def generate_scope(
+        self, acl_type: str, scope_ctx: Mapping[ScopeCtxType, Sequence[str]]
+    ) -> dict[str, dict[str, Any]]:
         # first handle acl types **without** scope support:
         if acl_type in AclAllScopeOnlyTypes:
             return {"all": {}}
@@ -781,6 +803,7 @@ class CommandBase:
         """
         return [g.id for g in self.deployed.groups if g.name == group_name]
 
+    @traced()
     def create_group(
         self,
         group_name: str,
@@ -805,6 +828,11 @@ class CommandBase:
             Optional[Group]: the new created CDF group or None if it is skipped
         """
 
+        from cognite.client.data_classes import Group
+        from cognite.client.data_classes.capabilities import Capability
+
+        TRACER.set_attributes(group_name=group_name)
+
         # configuration per cdf-project if cdf-groups creation should be limited to IdP mapped only
         create_only_mapped_cdf_groups: bool
         idp_source_id, idp_source_name = None, None
@@ -856,9 +884,9 @@ class CommandBase:
         else:
             if self.is_dry_run:
                 logging.info(f"Dry run - Creating group with name: <{new_group.name}>")
-                logging.debug(f"Dry run - Creating group details: <{new_group}>")
+                logging.debug("Dry run - Creating group details: <%s>", new_group)
             else:
-                logging.debug(f"  creating: {new_group.name} [idp source: {new_group.source_id or '-'}]")
+                logging.debug("  creating: %s [idp source: %s]", new_group.name, new_group.source_id or "-")
                 response = self.client.iam.groups.create(new_group)
                 assert isinstance(response, Group)  # confirm response is not a GroupList
                 new_group = response
@@ -897,47 +925,14 @@ class CommandBase:
 
     def generate_target_datasets(self) -> dict[str, Any]:
         # list of all targets: autogenerated dataset names
-        target_datasets = {
-            # dictionary generator
-            # dataset_name : {Optional[dataset_description], Optional[dataset_metadata], ..}
-            # key:
-            (fq_ns_name := self.get_dataset_name_template().format(node_name=ns_node.node_name)):
-            # value
-            {
-                "description": ns_node.description,
-                "metadata": ns_node.metadata,
-                # if not explicit provided, same template as name
-                "external_id": ns_node.external_id or fq_ns_name,
-            }
-            for ns in self.bootstrap_config.namespaces
-            for ns_node in ns.ns_nodes
-        }
-
-        # update target datasets to include 'allproject' and '{ns_name}:{BootstrapCore.AGGREGATED_GROUP_NAME}' datasets
-        target_datasets.update(
-            {  # dictionary generator
-                # key:
-                self.get_dataset_name_template().format(
-                    node_name=f"{ns_name}:{CommandBase.AGGREGATED_LEVEL_NAME}"
-                    if ns_name
-                    else CommandBase.AGGREGATED_LEVEL_NAME
-                ):
-                # value
-                {
-                    "description": f"Dataset for '{CommandBase.AGGREGATED_LEVEL_NAME}' Owner groups",
-                    # "metadata": "",
-                    "external_id": f"{ns_name}:{CommandBase.AGGREGATED_LEVEL_NAME}"
-                    if ns_name
-                    else CommandBase.AGGREGATED_LEVEL_NAME,
-                }
-                # creating 'all' at group type level + top-level
-                for ns_name in list([ns.ns_name for ns in self.bootstrap_config.namespaces]) + [""]
-            }
-        )
-
-        return target_datasets
+        # dataset_name : {Optional[dataset_description], Optional[dataset_metadata], ..}
+        # a deep copy, the nested metadata of the shared 'resolved' must not change
+        return copy.deepcopy(self.resolved.datasets)
 
+    @traced()
     def generate_missing_datasets(self) -> tuple[set[str], set[str]]:
+        from cognite.client.data_classes import DataSet, DataSetUpdate
+
         target_datasets = self.generate_target_datasets()
 
         # which targets are not already deployed?
@@ -960,7 +955,7 @@ class CommandBase:
             ]
             if self.is_dry_run:
                 logging.info(f"Dry run - Creating missing datasets: {[name for name in missing_datasets]}")
-                logging.debug(f"Dry run - Creating missing datasets (details): <{datasets_to_be_created}>")
+                logging.debug("Dry run - Creating missing datasets (details): <%s>", datasets_to_be_created)
             else:
                 created_datasets: DataSet | DataSetList = self.client.data_sets.create(datasets_to_be_created)
                 self.deployed.datasets.create(resources=created_datasets)
@@ -992,7 +987,7 @@ class CommandBase:
                 # cannot get easy the ds.name out of a DataSetUpdate object > using existing_datasets for logging
                 logging.info(f"Dry run - Updating existing datasets: {[name for name in existing_datasets]}")
                 # dump of DataSetUpdate object
-                logging.debug(f"Dry run - Updating existing datasets (details): <{datasets_to_be_updated}>")
+                logging.debug("Dry run - Updating existing datasets (details): <%s>", datasets_to_be_updated)
             else:
                 updated_datasets: DataSet | DataSetList = self.client.data_sets.update(datasets_to_be_updated)
                 self.deployed.datasets.update(resources=updated_datasets)
@@ -1001,31 +996,9 @@ class CommandBase:
 
     def generate_target_raw_dbs(self) -> set[str]:
         # list of all targets: autogenerated raw_db names
-        target_raw_db_names = set(
-            [
-                self.get_raw_dbs_name_template().format(node_name=ns_node.node_name, raw_variant=raw_variant)
-                for ns in self.bootstrap_config.namespaces
-                for ns_node in ns.ns_nodes
-                for raw_variant in CommandBase.RAW_VARIANTS
-            ]
-        )
-        target_raw_db_names.update(
-            # add RAW DBs for 'all' users
-            [
-                self.get_raw_dbs_name_template().format(
-                    node_name=f"{ns_name}:{CommandBase.AGGREGATED_LEVEL_NAME}"
-                    if ns_name
-                    else CommandBase.AGGREGATED_LEVEL_NAME,
-                    raw_variant=raw_variant,
-                )
-                # creating allprojects at group type level + top-level
-                for ns_name in list([ns.ns_name for ns in self.bootstrap_config.namespaces]) + [""]
-                for raw_variant in CommandBase.RAW_VARIANTS
-            ]
-        )
-
-        return target_raw_db_names
+        return set(self.resolved.raw_dbs)
 
+    @traced()
     def generate_missing_raw_dbs(self) -> tuple[set[str], set[str]]:
         target_raw_db_names = self.generate_target_raw_dbs()
 
@@ -1049,30 +1022,12 @@ class CommandBase:
 
     def generate_target_spaces(self) -> set[str]:
         # list of all targets: autogenerated space names
-        target_space_names = set(
-            [
-                self.get_space_name_template(node_name=ns_node.node_name, space_variant=space_variant)
-                for ns in self.bootstrap_config.namespaces
-                for ns_node in ns.ns_nodes
-                for space_variant in [""] + ns_node.space_variants
-            ]
-        )
-        target_space_names.update(
-            # add SPACEs for 'all' users
-            [
-                self.get_space_name_template(
-                    node_name=f"{ns_name}:{CommandBase.AGGREGATED_LEVEL_NAME}"
-                    if ns_name
-                    else CommandBase.AGGREGATED_LEVEL_NAME,
-                )
-                # creating allprojects at group type level + top-level
-                for ns_name in list([ns.ns_name for ns in self.bootstrap_config.namespaces]) + [""]
-            ]
-        )
-
-        return target_space_names
+        return set(self.resolved.spaces)
 
+    @traced()
     def generate_missing_spaces(self) -> tuple[set[str], set[str]]:
+        from cognite.client.data_classes.data_modeling.spaces import SpaceApply
+
         target_space_names = self.generate_target_spaces()
 
         try:
@@ -1097,6 +1052,7 @@ class CommandBase:
         return target_space_names, missing_space_names
 
     # generate all groups - iterating through the 3-level hierarchy
+    @traced()
     def generate_groups(self):
         """Loop through
             RoleType
@@ -1106,25 +1062,31 @@ class CommandBase:
         Store all created groups for other commands in `generated_groups`.
         """
 
-        groups: list[Optional[Group]] = []
+        groups: list[Optional[Group]] = [self.process_group(**group_level) for group_level in self.get_group_levels()]
+
+        # filter out None
+        self.generated_groups = [g for g in groups if g]
+
+    def get_group_levels(self) -> list[dict[str, Any]]:
+        """Parameters of 'process_group()' for all groups of the configuration, in creation order"""
+        group_levels: list[dict[str, Any]] = []
 
         # permutate the combinations
         for role_type in [RoleType.READ, RoleType.OWNER]:  # w/o 'admin'
             for ns in self.bootstrap_config.namespaces:
                 for ns_node in ns.ns_nodes:
                     # group for each dedicated group-type id
-                    groups.append(self.process_group(role_type=role_type, ns_name=ns.ns_name, node=ns_node))
+                    group_levels.append(dict(role_type=role_type, ns_name=ns.ns_name, node=ns_node))
                 # 'all' groups on group-type level
                 # (access to all datasets/ raw-dbs which belong to this group-type)
-                groups.append(self.process_group(role_type=role_type, ns_name=ns.ns_name))
+                group_levels.append(dict(role_type=role_type, ns_name=ns.ns_name))
             # 'all' groups on role_type level (no limits to datasets or raw-dbs)
-            groups.append(self.process_group(role_type=role_type))
+            group_levels.append(dict(role_type=role_type))
         # creating CDF group for root_account (highest admin-level)
         for root_account in ["root"]:
-            groups.append(self.process_group(root_account=root_account))
+            group_levels.append(dict(root_account=root_account))
 
-        # filter out None
-        self.generated_groups = [g for g in groups if g]
+        return group_levels
 
     # prepare a yaml for "delete" job
     def dump_delete_template_to_yaml(self) -> None:
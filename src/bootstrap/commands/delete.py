@@ -1,5 +1,6 @@
 import logging
 
+from ..common.tracing import traced
 from .base import CommandBase
 
 
@@ -13,6 +14,7 @@ class CommandDelete(CommandBase):
     #  888   888  888    .o  888  888    .o   888 . 888    .o
     #  `Y8bod88P" `Y8bod8P' o888o `Y8bod8P'   "888" `Y8bod8P'
     # '''
+    @traced()
     def command(self):
         # groups
         group_names = self.delete_or_deprecate.groups
@@ -1,6 +1,9 @@
 import logging
 
-from ..app_config import AclDefaultTypes, ScopeCtxType, YesNoType
+from ..app_config import ScopeCtxType, YesNoType
+from ..common.logs import Lazy
+from ..common.task_graph import TaskGraph
+from ..common.tracing import traced
 from .base import CommandBase
 
 
@@ -16,33 +19,43 @@ class CommandDeploy(CommandBase):
     #                        888                       .o..P'
     #                       o888o                      `Y8P'
     # '''
+    @traced()
     def command(self, with_raw_capability: YesNoType) -> None:
         # debug new features and override with cli-parameters
         logging.debug(f"From cli: {with_raw_capability=}")
         logging.debug(f"Effective: {self.with_raw_capability=}")
 
         # load deployed groups, datasets, raw_dbs with their ids and metadata
-        logging.debug(f"RAW_DBS in CDF:\n{self.deployed.raw_dbs.get_names()}")
-        logging.debug(f"DATASETS in CDF:\n{self.deployed.datasets.get_names()}")
-        logging.debug(f"SPACES in CDF:\n{self.deployed.spaces.get_names()}")
-        logging.debug(f"GROUPS in CDF:\n{self.deployed.groups.get_names()}")
+        logging.debug("RAW_DBS in CDF:\n%s", Lazy(self.deployed.raw_dbs.get_names))
+        logging.debug("DATASETS in CDF:\n%s", Lazy(self.deployed.datasets.get_names))
+        logging.debug("SPACES in CDF:\n%s", Lazy(self.deployed.spaces.get_names))
+        logging.debug("GROUPS in CDF:\n%s", Lazy(self.deployed.groups.get_names))
 
-        # run generate steps (only print results atm)
+        # the deploy is modelled as a small DAG of stages:
+        # RAW DBs, spaces and datasets are independent of each other and run in parallel,
+        # groups only depend on datasets, as they need the dataset ids for their scopes
+        # RAW DB and space scopes are referenced by name, and their target names are known upfront
+        deploy_graph = TaskGraph("deploy")
+        self.exclude_disabled_acl_types()
 
         #
         # raw_dbs
         #
         target_raw_db_names: set[str] = set()
         if self.with_raw_capability:
-            target_raw_db_names, new_created_raw_db_names = self.generate_missing_raw_dbs()
-            logging.info(f"All RAW_DBS from config:\n{sorted(target_raw_db_names)}")
-            logging.info(f"New RAW_DBS to CDF:\n{sorted(new_created_raw_db_names)}")
+            target_raw_db_names = self.generate_target_raw_dbs()
+
+            def deploy_raw_dbs() -> None:
+                target_raw_db_names, new_created_raw_db_names = self.generate_missing_raw_dbs()
+                logging.info(f"All RAW_DBS from config:\n{sorted(target_raw_db_names)}")
+                logging.info(f"New RAW_DBS to CDF:\n{sorted(new_created_raw_db_names)}")
+
+            deploy_graph.add_stage("raw_dbs", deploy_raw_dbs)
         else:
             # no RAW DBs means no access to RAW at all
             # which means no 'rawAcl' capability to create
             # remove it form the default types
             logging.info("Creating no RAW_DBS and no 'rawAcl' capability")
-            AclDefaultTypes.remove("raw")
 
         #
         # spaces
@@ -50,40 +63,56 @@ class CommandDeploy(CommandBase):
         target_space_names: set[str] = set()
 
         if self.with_datamodel_capability:
-            target_space_names, new_created_space_names = self.generate_missing_spaces()
-            logging.info(f"All SPACES from config:\n{sorted(target_space_names)}")
-            logging.info(f"New SPACES to CDF:\n{sorted(new_created_space_names)}")
+            target_space_names = self.generate_target_spaces()
+
+            def deploy_spaces() -> None:
+                target_space_names, new_created_space_names = self.generate_missing_spaces()
+                logging.info(f"All SPACES from config:\n{sorted(target_space_names)}")
+                logging.info(f"New SPACES to CDF:\n{sorted(new_created_space_names)}")
+
+            deploy_graph.add_stage("spaces", deploy_spaces)
         else:
             # no SPACESs means no access to FDM at all
             # which means no 'dataModels' and 'dataModelInstances' capabilities to create
             # remove it form the default types
             logging.info("Creating no SPACEs and no 'dataModels' and 'dataModelInstances' capabilities")
-            AclDefaultTypes.remove("dataModels")
-            AclDefaultTypes.remove("dataModelInstances")
 
         #
         # datasets
         #
-        target_dataset_names, new_created_dataset_names = self.generate_missing_datasets()
-        logging.info(f"All DATASETS from config:\n{sorted(target_dataset_names)}")
-        logging.info(f"New DATASETS to CDF:\n{sorted(new_created_dataset_names)}")
-
-        # store all raw_dbs and datasets in scope of this configuration
-        self.all_scoped_ctx = {
-            ScopeCtxType.RAWDB: list(target_raw_db_names),  # all raw_dbs
-            ScopeCtxType.DATASET: list(target_dataset_names),  # all datasets
-            ScopeCtxType.SPACE: list(target_space_names),  # all spaces
-        }
-
-        # CDF groups from configuration
-        self.generate_groups()
-        if not self.is_dry_run:
-            logging.info("Created new CDF groups")
-
-        logging.debug(f"Final RAW_DBS in CDF:\n{sorted(self.deployed.raw_dbs.get_names())}")
-        logging.debug(f"Final DATASETS in CDF:\n{sorted(self.deployed.datasets.get_names())}")
-        logging.debug(f"Final SPACES in CDF:\n{sorted(self.deployed.spaces.get_names())}")
-        logging.debug(f"Final GROUPS in CDF\n{sorted(self.deployed.groups.get_names())}")
+        def deploy_datasets() -> set[str]:
+            target_dataset_names, new_created_dataset_names = self.generate_missing_datasets()
+            logging.info(f"All DATASETS from config:\n{sorted(target_dataset_names)}")
+            logging.info(f"New DATASETS to CDF:\n{sorted(new_created_dataset_names)}")
+            return target_dataset_names
+
+        deploy_graph.add_stage("datasets", deploy_datasets)
+
+        #
+        # groups
+        #
+        def deploy_groups() -> None:
+            # store all raw_dbs and datasets in scope of this configuration
+            self.all_scoped_ctx = {
+                ScopeCtxType.RAWDB: list(target_raw_db_names),  # all raw_dbs
+                ScopeCtxType.DATASET: list(deploy_graph.results["datasets"]),  # all datasets
+                ScopeCtxType.SPACE: list(target_space_names),  # all spaces
+            }
+
+            # CDF groups from configuration
+            self.generate_groups()
+            if not self.is_dry_run:
+                logging.info("Created new CDF groups")
+
+        deploy_graph.add_stage("groups", deploy_groups, depends_on=["datasets"])
+
+        deploy_graph.run()
+        deploy_graph.log_timing_report()
+
+        logging.debug("Final RAW_DBS in CDF:\n%s", Lazy(lambda: sorted(self.deployed.raw_dbs.get_names())))
+        logging.debug("Final DATASETS in CDF:\n%s", Lazy(lambda: sorted(self.deployed.datasets.get_names())))
+        logging.debug("Final SPACES in CDF:\n%s", Lazy(lambda: sorted(self.deployed.spaces.get_names())))
+        logging.debug("Final GROUPS in CDF\n%s", Lazy(lambda: sorted(self.deployed.groups.get_names())))
 
         # dump all configs to yaml, as cope/paste template for delete_or_deprecate step
         logging.info("Finished creating CDF Groups and required scopes (data-sets, raw-dbs, spaces)")
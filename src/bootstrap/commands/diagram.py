@@ -1,10 +1,20 @@
+import io
 import logging
+import re
+import sys
+from collections.abc import Sequence
 from enum import ReprEnum  # new in 3.11
-from typing import Optional, Type
+from pathlib import Path
+from typing import Optional, TextIO, Type
 
-from ..app_config import RoleType, ScopeCtxType, YesNoType
+from ..app_config import IdpCdfMapping, RoleType, ScopeCtxType, YesNoType
+from ..app_exceptions import BootstrapConfigError
+from ..app_resolved_config import ResolvedScopeCtx
+from ..common.tracing import TRACER, traced
 from .base import CommandBase
+from .diagram_utils.exporters import DiagramFormat, write_dot, write_json
 from .diagram_utils.mermaid import (
+    NEWLINE,
     AssymetricNode,
     DottedEdge,
     Edge,
@@ -16,6 +26,19 @@ from .diagram_utils.mermaid import (
     TrapezoidAltNode,
 )
 
+DIAGRAM_FILE_SUFFIXES = {
+    DiagramFormat.mermaid: ".mmd",
+    DiagramFormat.dot: ".dot",
+    DiagramFormat.json: ".json",
+}
+
+# the only line of a diagram which changes with each run
+MERMAID_TIMESTAMP_LINE = re.compile(r"^%% .* - Script generated Mermaid diagram$", re.MULTILINE)
+
+
+def without_timestamp(diagram: str) -> str:
+    return MERMAID_TIMESTAMP_LINE.sub("", diagram, count=1)
+
 
 class SubgraphTypes(str, ReprEnum):
     idp = "IdP Groups"
@@ -31,6 +54,14 @@ class SubgraphTypes(str, ReprEnum):
     scope_read = "Scopes (Read)"
 
 
+# hierarchy levels rendered with '--depth'
+class DiagramDepth(int, ReprEnum):
+    top = 1  # like 'cdf:allprojects:owner'
+    namespace = 2  # like 'cdf:src:allprojects:owner'
+    node = 3  # like 'cdf:src:001:sap:owner'
+    scope = 4  # datasets, RAW DBs and spaces of each group (default)
+
+
 class CommandDiagram(CommandBase):
     # '''
     #        .o8   o8o
@@ -44,11 +75,67 @@ class CommandDiagram(CommandBase):
     #                             "Y88888P'
     # '''
 
+    def get_diagram_selection(
+        self, ns_names: Sequence[str] = (), node_names: Sequence[str] = ()
+    ) -> Optional[tuple[set[str], set[str]]]:
+        """Subtree to diagram, from the '--namespace' and '--node' selectors.
+
+        Includes all nodes of the selected namespaces, the selected nodes
+        and the nodes (or namespaces) referenced by their 'shared-access'.
+
+        Args:
+            ns_names (Sequence[str], optional): selected namespaces like 'src'. Defaults to ().
+            node_names (Sequence[str], optional): selected nodes like 'src:001:sap'. Defaults to ().
+
+        Returns:
+            Optional[tuple[set[str], set[str]]]: (ns_names, node_names) to render, None to render all
+        """
+        if not ns_names and not node_names:
+            return None
+
+        namespaces = {ns.ns_name: ns for ns in self.bootstrap_config.namespaces}
+        unknown = [name for name in ns_names if name not in namespaces] + [
+            name for name in node_names if name not in self.resolved.nodes
+        ]
+        if unknown:
+            raise BootstrapConfigError(f"Unknown namespaces or nodes selected for the diagram: {unknown}")
+
+        selected_nodes = set(node_names) | {
+            ns_node.node_name for ns_name in ns_names for ns_node in namespaces[ns_name].ns_nodes
+        }
+        selected_namespaces = set(ns_names)
+        # aggregated name like 'src:allprojects' : ns_name
+        aggregated_ns_names = {self.get_allprojects_name_template(ns_name): ns_name for ns_name in namespaces}
+
+        for node_name in list(selected_nodes):
+            shared_access = self.resolved.nodes[node_name].shared_access
+            if not shared_access:
+                continue
+            for shared_node in shared_access.owner + shared_access.read:
+                if shared_node.node_name in self.resolved.nodes:
+                    selected_nodes.add(shared_node.node_name)
+                elif shared_node.node_name in aggregated_ns_names:
+                    selected_namespaces.add(aggregated_ns_names[shared_node.node_name])
+
+        # parents of selected nodes
+        selected_namespaces |= {
+            ns_name for ns_name, ns in namespaces.items() if any(n.node_name in selected_nodes for n in ns.ns_nodes)
+        }
+        return selected_namespaces, selected_nodes
+
+    @traced()
     def command(
         self,
         to_markdown: YesNoType = YesNoType.no,
         with_raw_capability: YesNoType = YesNoType.yes,
         cdf_project: Optional[str] = None,
+        output: Optional[str] = None,
+        ns_names: Sequence[str] = (),
+        node_names: Sequence[str] = (),
+        depth: DiagramDepth = DiagramDepth.scope,
+        diagram_format: DiagramFormat = DiagramFormat.mermaid,
+        all_projects: bool = False,
+        output_dir: Optional[str] = None,
     ) -> None:
         """Diagram mode used to document the given configuration as a Mermaid diagram.
 
@@ -60,6 +147,20 @@ class CommandDiagram(CommandBase):
                 - Create RAW DBs and 'rawAcl' capability. Defaults to 'YesNoType.tes'.
             cdf_project (str, optional):
                 - Provide the CDF Project to use for the diagram 'idp-cdf-mappings'.
+            output (str, optional):
+                - File to stream the diagram to. Defaults to stdout (also with '-').
+            ns_names (Sequence[str], optional):
+                - Limit the diagram to these namespaces (and the shared-access nodes they reference).
+            node_names (Sequence[str], optional):
+                - Limit the diagram to these nodes (and the shared-access nodes they reference).
+            depth (DiagramDepth, optional):
+                - Hierarchy levels to render, scopes are only expanded with 'DiagramDepth.scope' (default).
+            diagram_format (DiagramFormat, optional):
+                - 'mermaid' (default), Graphviz 'dot' or 'json' adjacency. 'to_markdown' only applies to 'mermaid'.
+            all_projects (bool, optional):
+                - Render one diagram per 'idp-cdf-mappings' CDF Project into 'output_dir', instead of 'cdf_project'.
+            output_dir (str, optional):
+                - Folder for the 'all_projects' diagrams, unchanged files are not rewritten.
 
         Example:
             # requires a 'cognite' configuration section
@@ -69,6 +170,8 @@ class CommandDiagram(CommandBase):
             ➟  poetry run bootstrap-cli diagram --cdf-project shiny-dev configs/config-deploy-example-v2.yml | clip.exe
             # precedence over configuration 'bootstrap.features.with-raw-capability'
             ➟  poetry run bootstrap-cli diagram --with-raw-capability no --cdf-project shiny-prod configs/config-deploy-example-v2.yml
+            # one diagram per 'bootstrap.idp-cdf-mappings' CDF Project
+            ➟  poetry run bootstrap-cli diagram --all-projects --output-dir docs/diagrams configs/config-deploy-example-v2.yml
         """  # noqa
 
         # availability is validate_cdf_project_available()
@@ -87,29 +190,78 @@ class CommandDiagram(CommandBase):
         # debug new features and override with cli-parameters
         logging.info(
             f"""'diagram' configured for
-            CDF Project: <{diagram_cdf_project}>
+            CDF Project: <{'all' if all_projects else diagram_cdf_project}>
             'with_raw_capability': {self.with_raw_capability}
             'with_datamodel_capability': {self.with_datamodel_capability}
             """
         )
 
+        # None renders the full hierarchy
+        selection = self.get_diagram_selection(ns_names, node_names)
+
+        if to_markdown == YesNoType.yes and diagram_format != DiagramFormat.mermaid:
+            logging.warning(f"Option 'markdown' is ignored for format '{diagram_format}'")
+
+        if all_projects:
+            assert output_dir, "'all_projects' requires an 'output_dir'"
+            written_by_project = self.write_all_projects(output_dir, selection, depth, to_markdown, diagram_format)
+            logging.info(
+                f"Generated diagrams for {len(written_by_project)} CDF Projects, "
+                f"{sum(written_by_project.values())} changed"
+            )
+            return
+
+        graph = self.build_graph(diagram_cdf_project, selection, depth)
+
+        # stream to stdout that only the diagram can be piped to clipboard or file
+        if output and output != "-":
+            with open(output, "w") as stream:
+                written = self.write_graph(graph, stream, to_markdown, diagram_format)
+        else:
+            written = self.write_graph(graph, sys.stdout, to_markdown, diagram_format)
+
+        logging.info(f"Generated {written} characters")
+
+    @traced()
+    def build_graph(
+        self,
+        diagram_cdf_project: str,
+        selection: Optional[tuple[set[str], set[str]]] = None,
+        depth: DiagramDepth = DiagramDepth.scope,
+    ) -> GraphRegistry:
+        """Builds the diagram of the resolved config for one CDF Project ('idp-cdf-mappings').
+
+        Args:
+            diagram_cdf_project (str): CDF Project of the 'idp-cdf-mappings' to diagram
+            selection (tuple[set[str], set[str]], optional):
+                (namespaces, nodes) from 'get_diagram_selection()'. Defaults to None, the full hierarchy.
+            depth (DiagramDepth, optional): hierarchy levels to render. Defaults to DiagramDepth.scope.
+
+        Returns:
+            GraphRegistry: to be written in any 'DiagramFormat'
+        """
+        TRACER.set_attributes(cdf_project=diagram_cdf_project, depth=int(depth))
+        with_scopes = depth >= DiagramDepth.scope
+
         # store all raw_dbs and datasets in scope of this configuration
         # TODO: wrong structure, actions (RoleType) are added by get_scope_ctx_groupedby_action(..)
         # diagram uses this data different then deploy
         # FIXED: made local `all_scoped_ctx_by_role_type` instead using `self.all_scoped_ctx`
-        all_scoped_ctx_by_role_type: dict[RoleType, dict[ScopeCtxType, list[str]]] = {
+        all_scoped_ctx_by_role_type: dict[RoleType, ResolvedScopeCtx] = {
             RoleType.OWNER: (
                 all_scopes := {
-                    # generate_target_raw_dbs -> returns a Set[str]
-                    ScopeCtxType.RAWDB: list(self.generate_target_raw_dbs()),  # all raw_dbs
-                    # generate_target_datasets -> returns a Dict[str, Any]
-                    ScopeCtxType.DATASET: list(self.generate_target_datasets().keys()),  # all datasets
+                    # sorted, as a re-rendered diagram must not differ from the last run
+                    ScopeCtxType.RAWDB: tuple(sorted(self.resolved.raw_dbs)),  # all raw_dbs
+                    ScopeCtxType.DATASET: tuple(self.resolved.datasets),  # all datasets
                 }
             ),
             # and copy the same to 'read'
             RoleType.READ: all_scopes,
         }
 
+        # diagram explicit given cdf_project, or configured in 'cognite' configuration section
+        idp_cdf_mappings_by_group = self.bootstrap_config.get_idp_cdf_mappings_by_group(diagram_cdf_project)
+
         def scopectx_mermaid_node_mapping(scopectx: ScopeCtxType) -> Type[Node]:
             # hide a dict access in this typed-helper method
             return {
@@ -123,7 +275,7 @@ class CommandDiagram(CommandBase):
             ns_name: Optional[str] = None,
             node_name: Optional[str] = None,
             root_account: Optional[str] = None,
-        ) -> tuple[str, dict[RoleType, dict[ScopeCtxType, list[str]]]]:
+        ) -> tuple[str, dict[RoleType, ResolvedScopeCtx]]:
             """Adopted generate_group_name_and_capabilities() and get_scope_ctx_groupedby_action()
             to respond with
             - the full-qualified CDF group name and
@@ -159,22 +311,15 @@ class CommandDiagram(CommandBase):
             """
 
             group_name_full_qualified: str = ""
-            scope_ctx_by_role_type: dict[RoleType, dict[ScopeCtxType, list[str]]] = {}
+            scope_ctx_by_role_type: dict[RoleType, ResolvedScopeCtx] = {}
 
             # detail level like cdf:src:001:public:read
-            if role_type and ns_name and node_name:
-                group_name_full_qualified = f"{CommandBase.GROUP_NAME_PREFIX}{node_name}:{role_type}"
+            # or group-type level like cdf:src:all:read
+            if role_type and ns_name:
+                resolved_group = self.resolved.get_group(role_type, ns_name, node_name)
+                group_name_full_qualified = resolved_group.group_name
                 scope_ctx_by_role_type = self.get_scope_ctx_groupedby_role_type(role_type, ns_name, node_name)
 
-            # group-type level like cdf:src:all:read
-            elif role_type and ns_name:
-                # 'all' groups on group-type level
-                # (access to all datasets/ raw-dbs which belong to this group-type)
-                group_name_full_qualified = (
-                    f"{CommandBase.GROUP_NAME_PREFIX}{ns_name}:{CommandBase.AGGREGATED_LEVEL_NAME}:{role_type}"  # noqa
-                )
-                scope_ctx_by_role_type = self.get_scope_ctx_groupedby_role_type(role_type, ns_name)
-
             # top level like cdf:all:read
             elif role_type:
                 # 'all' groups on action level (no limits to datasets or raw-dbs)
@@ -205,12 +350,13 @@ class CommandDiagram(CommandBase):
                 return
 
             group_name, scope_ctx_by_role_type = get_group_name_and_scopes(role_type, ns_name, node_name, root_account)
+            if not with_scopes:
+                # skip the scope expansion (nodes and edges) with a '--depth' limit
+                scope_ctx_by_role_type = {}
 
             # check lookup from provided config
-            mapping = self.bootstrap_config.get_idp_cdf_mapping_for_group(
-                # diagram explicit given cdf_project, or configured in 'cognite' configuration section
-                cdf_project=diagram_cdf_project,
-                cdf_group=group_name,
+            mapping = idp_cdf_mappings_by_group.get(group_name) or IdpCdfMapping(
+                cdf_group=group_name, idp_source_id=None, idp_source_name=None
             )
             # unpack
             # idp_source_id, idp_source_name = self.aad_mapping_lookup.get(node_name, [None, None])
@@ -228,14 +374,14 @@ class CommandDiagram(CommandBase):
             #
             idp_subgraph = graph.get_or_create(SubgraphTypes.idp)
             if idp_source_name and (idp_source_name not in idp_subgraph):
-                idp_subgraph.elements.append(
+                idp_subgraph.add(
                     TrapezoidAltNode(
                         id_name=idp_source_name,
                         display=idp_source_name,
                         comments=[f'IdP objectId: {idp_source_id}']
                     )
                 )  # fmt: skip
-                graph.edges.append(
+                graph.add_edge(
                     Edge(
                         id_name=idp_source_name,
                         dest=group_name,
@@ -253,7 +399,7 @@ class CommandDiagram(CommandBase):
             #   'cdf:src:001:public:read'
             #
             if role_type and ns_name and node_name:
-                node_subgraph.elements.append(
+                node_subgraph.add(
                     RoundedEdgesNode(
                         id_name=group_name,
                         display=group_name,
@@ -265,7 +411,7 @@ class CommandDiagram(CommandBase):
                 # EDGE FROM PARENT 'src:all' to 'src:001:sap'
                 #
                 edge_type_cls = Edge if role_type == RoleType.OWNER else DottedEdge
-                graph.edges.append(
+                graph.add_edge(
                     edge_type_cls(
                         # link from all:{ns}
                         # multiline f-string split as it got too long
@@ -295,11 +441,12 @@ class CommandDiagram(CommandBase):
                             # NODE DATASET or RAW scope
                             #    'src:001:sap:rawdb'
                             #
-                            if scope_name not in scope_subgraph:
+                            scope_id = f"{scope_name}__{role_type}__{scope_type}"
+                            if scope_id not in scope_subgraph:
                                 node_type_cls = scopectx_mermaid_node_mapping(scope_type)
-                                scope_subgraph.elements.append(
+                                scope_subgraph.add(
                                     node_type_cls(
-                                        id_name=f"{scope_name}__{role_type}__{scope_type}",
+                                        id_name=scope_id,
                                         display=scope_name,
                                         comments=[]
                                     )
@@ -310,10 +457,10 @@ class CommandDiagram(CommandBase):
                             #   cdf:src:001:sap:read to 'src:001:sap:rawdb'
                             #
                             edge_type_cls = Edge if shared_role_type == RoleType.OWNER else DottedEdge
-                            graph.edges.append(
+                            graph.add_edge(
                                 edge_type_cls(
                                     id_name=group_name,
-                                    dest=f"{scope_name}__{role_type}__{scope_type}",
+                                    dest=scope_id,
                                     annotation=shared_role_type,
                                     comments=[],
                                 )
@@ -323,7 +470,7 @@ class CommandDiagram(CommandBase):
             # NODE - NAMESPACE LEVEL
             #   'src:all:read' or 'src:all:owner'
             elif role_type and ns_name:
-                ns_subgraph.elements.append(
+                ns_subgraph.add(
                     Node(
                         id_name=group_name,
                         display=group_name,
@@ -336,7 +483,7 @@ class CommandDiagram(CommandBase):
                 #   'all' to 'src:all'
                 #
                 edge_type_cls = Edge if role_type == RoleType.OWNER else DottedEdge
-                graph.edges.append(
+                graph.add_edge(
                     edge_type_cls(
                         id_name=f"{CommandBase.GROUP_NAME_PREFIX}{CommandBase.AGGREGATED_LEVEL_NAME}:{role_type}", # noqa
                         dest=group_name,
@@ -367,11 +514,12 @@ class CommandDiagram(CommandBase):
                             # NODE DATASET or RAW scope
                             #    'src:all:rawdb'
                             #
-                            if scope_name not in scope_subgraph:
+                            scope_id = f"{scope_name}__{role_type}__{scope_type}"
+                            if scope_id not in scope_subgraph:
                                 node_type_cls = scopectx_mermaid_node_mapping(scope_type)
-                                scope_subgraph.elements.append(
+                                scope_subgraph.add(
                                     node_type_cls(
-                                        id_name=f"{scope_name}__{role_type}__{scope_type}",
+                                        id_name=scope_id,
                                         display=scope_name,
                                         comments=[]
                                     )
@@ -382,10 +530,10 @@ class CommandDiagram(CommandBase):
                             #   cdf:src:all:read to 'src:all:rawdb'
                             #
                             edge_type_cls = Edge if shared_role_type == RoleType.OWNER else DottedEdge
-                            graph.edges.append(
+                            graph.add_edge(
                                 edge_type_cls(
                                     id_name=group_name,
-                                    dest=f"{scope_name}__{role_type}__{scope_type}",
+                                    dest=scope_id,
                                     annotation=shared_role_type,
                                     comments=[],
                                 )
@@ -396,7 +544,7 @@ class CommandDiagram(CommandBase):
             #   like `cdf:all:read`
             #
             elif role_type:
-                ns_subgraph.elements.append(
+                ns_subgraph.add(
                     Node(
                         id_name=group_name,
                         display=group_name,
@@ -427,13 +575,14 @@ class CommandDiagram(CommandBase):
                             # NODE DATASET or RAW scope
                             #    'all:rawdb'
                             #
-                            if scope_name not in scope_subgraph:
+                            scope_id = f"{scope_name}__{role_type}__{scope_type}"
+                            if scope_id not in scope_subgraph:
                                 # logging.info(f">> add {scope_name=}__{action=}")
 
                                 node_type_cls = scopectx_mermaid_node_mapping(scope_type)
-                                scope_subgraph.elements.append(
+                                scope_subgraph.add(
                                     node_type_cls(
-                                        id_name=f"{scope_name}__{role_type}__{scope_type}",
+                                        id_name=scope_id,
                                         display=scope_name,
                                         comments=[]
                                     )
@@ -444,10 +593,10 @@ class CommandDiagram(CommandBase):
                             #   cdf:all:read to 'all:rawdb'
                             #
                             edge_type_cls = Edge if shared_role_type == RoleType.OWNER else DottedEdge
-                            graph.edges.append(
+                            graph.add_edge(
                                 edge_type_cls(
                                     id_name=group_name,
-                                    dest=f"{scope_name}__{role_type}__{scope_type}",
+                                    dest=scope_id,
                                     annotation=shared_role_type,
                                     comments=[],
                                 )
@@ -506,12 +655,18 @@ class CommandDiagram(CommandBase):
         # permutate the combinations
         for role_type in [RoleType.READ, RoleType.OWNER]:  # action_dimensions w/o 'admin'
             for ns in self.bootstrap_config.namespaces:
-                for ns_node in ns.ns_nodes:
-                    # group for each dedicated group-type id
-                    group_to_graph(graph, role_type, ns.ns_name, ns_node.node_name)
-                # 'all' groups on group-type level
-                # (access to all datasets/ raw-dbs which belong to this group-type)
-                group_to_graph(graph, role_type, ns.ns_name)
+                if selection and ns.ns_name not in selection[0]:
+                    continue
+                if depth >= DiagramDepth.node:
+                    for ns_node in ns.ns_nodes:
+                        if selection and ns_node.node_name not in selection[1]:
+                            continue
+                        # group for each dedicated group-type id
+                        group_to_graph(graph, role_type, ns.ns_name, ns_node.node_name)
+                if depth >= DiagramDepth.namespace:
+                    # 'all' groups on group-type level
+                    # (access to all datasets/ raw-dbs which belong to this group-type)
+                    group_to_graph(graph, role_type, ns.ns_name)
             # 'all' groups on action level (no limits to datasets or raw-dbs)
             group_to_graph(graph, role_type)
         # all (no limits + admin)
@@ -520,18 +675,62 @@ class CommandDiagram(CommandBase):
         for root_account in ["root"]:
             group_to_graph(graph, root_account=root_account)
 
-        mermaid_code = graph.to_mermaid()
-
-        logging.info(f"Generated {len(mermaid_code)} characters")
+        return graph
 
-        markdown_wrapper_template = """
-## auto-generated by bootstrap-cli
-```mermaid
-{mermaid_code}
-```"""
-        # print to stdout that only the diagram can be piped to clipboard or file
-        print(
-            markdown_wrapper_template.format(mermaid_code=mermaid_code)
-            if to_markdown == YesNoType.yes
-            else mermaid_code
-        )
+    @staticmethod
+    @traced("CommandDiagram.write_graph")
+    def write_graph(
+        graph: GraphRegistry,
+        stream: TextIO,
+        to_markdown: YesNoType = YesNoType.no,
+        diagram_format: DiagramFormat = DiagramFormat.mermaid,
+    ) -> int:
+        """Streams the graph in the given format, returns the number of written characters"""
+        if diagram_format == DiagramFormat.dot:
+            return write_dot(graph, stream)
+        if diagram_format == DiagramFormat.json:
+            return write_json(graph, stream) + stream.write(NEWLINE)
+        return graph.write_mermaid(stream, to_markdown=to_markdown == YesNoType.yes) + stream.write(NEWLINE)
+
+    def write_all_projects(
+        self,
+        output_dir: str | Path,
+        selection: Optional[tuple[set[str], set[str]]] = None,
+        depth: DiagramDepth = DiagramDepth.scope,
+        to_markdown: YesNoType = YesNoType.no,
+        diagram_format: DiagramFormat = DiagramFormat.mermaid,
+    ) -> dict[str, bool]:
+        """Renders one diagram per 'idp-cdf-mappings' CDF Project into 'output_dir', named '<cdf-project>.<ext>'.
+
+        The config is expanded once ('self.resolved') and shared by all renders, which run one after the other:
+        rendering is CPU-bound, threads don't speed it up and processes can't share the expanded config
+        ('benchmarks/bench_diagram.py').
+        Files with an unchanged diagram (ignoring the Mermaid timestamp) are not rewritten.
+
+        Returns:
+            dict[str, bool]: CDF Project : if its file was written
+        """
+        cdf_projects = [mapping.cdf_project for mapping in self.bootstrap_config.idp_cdf_mappings or []]
+        if not cdf_projects:
+            raise BootstrapConfigError("No 'idp-cdf-mappings' configured, nothing to diagram with '--all-projects'")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        suffix = DIAGRAM_FILE_SUFFIXES[diagram_format]
+        if diagram_format == DiagramFormat.mermaid and to_markdown == YesNoType.yes:
+            suffix = ".md"
+
+        def render(cdf_project: str) -> bool:
+            stream = io.StringIO()
+            self.write_graph(self.build_graph(cdf_project, selection, depth), stream, to_markdown, diagram_format)
+            diagram = stream.getvalue()
+
+            output_file = output_dir / f"{cdf_project}{suffix}"
+            if output_file.is_file() and without_timestamp(output_file.read_text()) == without_timestamp(diagram):
+                logging.info(f"Diagram of CDF Project <{cdf_project}> is unchanged, skipped {output_file}")
+                return False
+            output_file.write_text(diagram)
+            logging.info(f"Diagram of CDF Project <{cdf_project}> written to {output_file}")
+            return True
+
+        return {cdf_project: render(cdf_project) for cdf_project in cdf_projects}
@@ -0,0 +1,145 @@
+# std-lib
+import json
+from collections.abc import Iterator
+from enum import ReprEnum  # new in 3.11
+
+# type-hints
+from typing import Any, Optional, TextIO
+
+from .mermaid import (
+    AssymetricNode,
+    DottedEdge,
+    Edge,
+    GraphRegistry,
+    HexagonNode,
+    Node,
+    RoundedEdgesNode,
+    Subgraph,
+    SubroutineNode,
+    TrapezoidAltNode,
+    TrapezoidNode,
+)
+
+#
+# Exporters for the same GraphRegistry as used for Mermaid,
+# for tools which handle larger graphs (Graphviz) or to be consumed programmatically (JSON)
+#
+
+
+class DiagramFormat(str, ReprEnum):
+    mermaid = "mermaid"
+    dot = "dot"
+    json = "json"
+
+
+# node-class : (json shape-name, Graphviz node attributes)
+NODE_SHAPES: dict[type[Node], tuple[str, str]] = {
+    Node: ("rect", "shape=box"),
+    HexagonNode: ("hexagon", "shape=hexagon"),
+    RoundedEdgesNode: ("rounded", 'shape=box, style="rounded"'),
+    TrapezoidNode: ("trapezoid", "shape=trapezium"),
+    TrapezoidAltNode: ("trapezoid_alt", "shape=invtrapezium"),
+    AssymetricNode: ("asymmetric", "shape=cds"),
+    SubroutineNode: ("subroutine", "shape=box, peripheries=2"),
+}
+
+
+def get_node_shape(node: Node) -> tuple[str, str]:
+    # first registered class in the MRO, to support subclasses
+    return next(NODE_SHAPES[cls] for cls in type(node).__mro__ if cls in NODE_SHAPES)
+
+
+def get_edge_style(edge: Edge) -> str:
+    return "dotted" if isinstance(edge, DottedEdge) else "solid"
+
+
+def walk(
+    elements: list, parent: Optional[Subgraph] = None
+) -> Iterator[tuple[Optional[Subgraph], "Subgraph | Node | Edge"]]:
+    """Depth-first (parent, element) pairs of all nested elements, each subgraph followed by its members"""
+    for elem in elements:
+        yield parent, elem
+        if isinstance(elem, Subgraph):
+            yield from walk(elem.elements, parent=elem)
+
+
+def quote(value: str) -> str:
+    """Graphviz ID or label as double-quoted string"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(graph: GraphRegistry, stream: TextIO) -> int:
+    """Streams the graph in Graphviz DOT format, subgraphs become clusters.
+
+    Returns:
+        int: number of written characters
+    """
+
+    def write_elements(elements: list, indent: str) -> int:
+        written = 0
+        for elem in elements:
+            if elem.comments:
+                written += stream.write("".join(f"{indent}// {comment}\n" for comment in elem.comments))
+            if isinstance(elem, Subgraph):
+                written += stream.write(f"{indent}subgraph {quote('cluster_' + elem.id_name)} {{\n")
+                written += stream.write(f"{indent}  label={quote(elem.display or elem.id_name)};\n")
+                written += write_elements(elem.elements, indent + "  ")
+                written += stream.write(f"{indent}}}\n")
+            elif isinstance(elem, Edge):
+                written += write_edge(elem, indent)
+            else:
+                written += stream.write(
+                    f"{indent}{quote(elem.id_name)} [label={quote(elem.display or elem.id_name)}, "
+                    f"{get_node_shape(elem)[1]}];\n"
+                )
+        return written
+
+    def write_edge(edge: Edge, indent: str) -> int:
+        style = " [style=dashed]" if isinstance(edge, DottedEdge) else ""
+        return stream.write(f"{indent}{quote(edge.id_name)} -> {quote(edge.dest)}{style};\n")
+
+    written = stream.write('digraph "bootstrap" {\n  rankdir=LR;\n  node [fontname="Helvetica"];\n')
+    written += write_elements(graph.elements, "  ")
+    written += stream.write(f"  // all {len(graph.edges)} links connecting the above nodes\n")
+    for edge in graph.edges:
+        written += write_edge(edge, "  ")
+    written += stream.write("}\n")
+    return written
+
+
+def to_json_adjacency(graph: GraphRegistry) -> dict[str, Any]:
+    """Compact adjacency representation of the graph:
+
+    {
+        "subgraphs": {id: {"label": str, "parent": id | None}},
+        "nodes": {id: {"label": str, "shape": str, "subgraph": id | None}},
+        "edges": [[source-id, dest-id, "solid" | "dotted"], ..]
+    }
+    """
+    subgraphs: dict[str, dict[str, Any]] = {}
+    nodes: dict[str, dict[str, Any]] = {}
+    edges: list[list[str]] = []
+    for parent, elem in walk(graph.elements):
+        parent_id = parent.id_name if parent else None
+        if isinstance(elem, Subgraph):
+            subgraphs[elem.id_name] = {"label": elem.display or elem.id_name, "parent": parent_id}
+        elif isinstance(elem, Edge):
+            edges.append([elem.id_name, elem.dest, get_edge_style(elem)])
+        else:
+            nodes[elem.id_name] = {"label": elem.display, "shape": get_node_shape(elem)[0], "subgraph": parent_id}
+
+    edges.extend([edge.id_name, edge.dest, get_edge_style(edge)] for edge in graph.edges)
+    return {"subgraphs": subgraphs, "nodes": nodes, "edges": edges}
+
+
+def write_json(graph: GraphRegistry, stream: TextIO) -> int:
+    """Writes the compact JSON adjacency format, see 'to_json_adjacency()'
+
+    Returns:
+        int: number of written characters
+    """
+    written = 0
+    # iterencode writes the json in chunks, without one large string
+    for chunk in json.JSONEncoder(separators=(",", ":")).iterencode(to_json_adjacency(graph)):
+        written += stream.write(chunk)
+    return written
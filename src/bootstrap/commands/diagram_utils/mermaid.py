@@ -1,11 +1,11 @@
 # std-lib
+import io
+from dataclasses import dataclass
 from datetime import datetime
 from enum import ReprEnum  # new in 3.11
 
 # type-hints
-from typing import Optional, TypeVar
-
-from pydantic import BaseModel
+from typing import Optional, TextIO, TypeVar
 
 
 # helper function
@@ -19,10 +19,21 @@ def timestamp():
 # Subgraph can contain Subgraph, Nodes and Edges
 # Edge only reference source/dest Nodes by their (full) name
 #
+# slotted dataclasses instead of pydantic models, as 'diagram' creates thousands of them
+# and all values are generated by the command itself (no validation required)
+#
 #
 # because within f'' strings no backslash-character is allowed
 NEWLINE = "\n"
 
+# wrapping of the diagram with '--markdown yes'
+MARKDOWN_HEADER = """
+## auto-generated by bootstrap-cli
+```mermaid
+"""
+MARKDOWN_FOOTER = """
+```"""
+
 # '''
 #       888          888                      888
 #       888          888                      888
@@ -35,16 +46,22 @@ NEWLINE = "\n"
 # '''
 
 
-class MermaidFlowchartElement(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class MermaidFlowchartElement:
     id_name: str
-    comments: Optional[list[str]]
+    comments: Optional[list[str]] = None
 
     # dump comments
     def comments_to_mermaid(self):
         return f"""{NEWLINE.join([f'%% {comment}' for comment in self.comments]) + NEWLINE}""" if self.comments else ""
 
+    def write_mermaid(self, stream: TextIO) -> int:
+        """Writes the element to the stream and returns the number of written characters"""
+        return stream.write(str(self))
+
 
 # https://mermaid.js.org/syntax/flowchart.html#node-shapes
+@dataclass(slots=True, kw_only=True)
 class Node(MermaidFlowchartElement):
     display: str
 
@@ -53,6 +70,7 @@ class Node(MermaidFlowchartElement):
         return self.comments_to_mermaid() + f"""{self.id_name}""" + (rf"""["{self.display}"]""" if self.display else "")
 
 
+@dataclass(slots=True, kw_only=True)
 class HexagonNode(Node):
     def __str__(self):
         return (
@@ -63,12 +81,14 @@ class HexagonNode(Node):
         )
 
 
+@dataclass(slots=True, kw_only=True)
 class RoundedEdgesNode(Node):
     def __str__(self):
         # id1(This is the text in the box)
         return self.comments_to_mermaid() + f"""{self.id_name}""" + (rf"""("{self.display}")""" if self.display else "")
 
 
+@dataclass(slots=True, kw_only=True)
 class TrapezoidNode(Node):
     def __str__(self):
         return (
@@ -79,6 +99,7 @@ class TrapezoidNode(Node):
         )
 
 
+@dataclass(slots=True, kw_only=True)
 class TrapezoidAltNode(Node):
     def __str__(self):
         return (
@@ -89,12 +110,14 @@ class TrapezoidAltNode(Node):
         )
 
 
+@dataclass(slots=True, kw_only=True)
 class AssymetricNode(Node):
     def __str__(self):
         # id1>This is the text in the box]
         return self.comments_to_mermaid() + f"""{self.id_name}""" + (rf""">"{self.display}"]""" if self.display else "")
 
 
+@dataclass(slots=True, kw_only=True)
 class SubroutineNode(Node):
     def __str__(self):
         # id1[[This is the text in the box]]
@@ -103,6 +126,7 @@ class SubroutineNode(Node):
         )
 
 
+@dataclass(slots=True, kw_only=True)
 class Edge(MermaidFlowchartElement):
     # from / to cannot be used as "from" is a reserved keyword
     dest: str
@@ -118,6 +142,7 @@ class Edge(MermaidFlowchartElement):
         #     )
 
 
+@dataclass(slots=True, kw_only=True)
 class DottedEdge(Edge):
     def __str__(self):
         return self.comments_to_mermaid() + f"""{self.id_name}-.->{self.dest}"""
@@ -126,36 +151,123 @@ class DottedEdge(Edge):
 # type-hint for ExtpipesCore instance response
 T_Subgraph = TypeVar("T_Subgraph", bound="Subgraph")
 
-# https://docs.pydantic.dev/usage/postponed_annotations/#self-referencing-models
-# TODO: not working?
-# Subgraph = ForwardRef('Subgraph')
 
+class Elements(list):
+    """Elements of a subgraph, with an index by 'id_name' kept up to date on every change.
+    Appended elements are added to the index, any other change drops it, to be rebuilt on next lookup.
+    Like a dict built from the list, the last element of a duplicated 'id_name' is found.
+    """
+
+    __slots__ = ("_index",)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._index: Optional[dict[str, "Subgraph | Node"]] = None
+
+    def get_index(self) -> dict[str, "Subgraph | Node"]:
+        if self._index is None:
+            self._index = {elem.id_name: elem for elem in self}
+        return self._index
+
+    def append(self, elem):
+        super().append(elem)
+        if self._index is not None:
+            self._index[elem.id_name] = elem
+
+    def extend(self, elems):
+        elems = list(elems)
+        super().extend(elems)
+        if self._index is not None:
+            self._index.update((elem.id_name, elem) for elem in elems)
+
+    def __iadd__(self, elems):
+        self.extend(elems)
+        return self
+
+    # any other change drops the index
+    def insert(self, *args):
+        self._index = None
+        super().insert(*args)
+
+    def remove(self, elem):
+        self._index = None
+        super().remove(elem)
+
+    def pop(self, *args):
+        self._index = None
+        return super().pop(*args)
+
+    def clear(self):
+        self._index = None
+        super().clear()
+
+    def __setitem__(self, *args):
+        self._index = None
+        super().__setitem__(*args)
 
+    def __delitem__(self, key):
+        self._index = None
+        super().__delitem__(key)
+
+    def __imul__(self, n):
+        self._index = None
+        return super().__imul__(n)
+
+
+@dataclass(slots=True, kw_only=True)
 class Subgraph(MermaidFlowchartElement):
     elements: list["Subgraph | Node"]
     display: Optional[str] = None
 
+    def __post_init__(self):
+        # id_name : element, hash-based lookup for membership checks, also after direct changes of 'elements'
+        if not isinstance(self.elements, Elements):
+            self.elements = Elements(self.elements)
+
+    def _get_index(self) -> dict[str, "Subgraph | Node"]:
+        return self.elements.get_index()  # type: ignore[attr-defined]
+
+    def add(self, *elements: "Subgraph | Node") -> bool:
+        """Adds elements which are not yet part of this subgraph (by 'id_name').
+
+        Returns:
+            bool: True if at least one element was added
+        """
+        index = self._get_index()
+        added = False
+        for elem in elements:
+            if elem.id_name not in index:
+                index[elem.id_name] = elem
+                self.elements.append(elem)
+                added = True
+        return added
+
     def __contains__(self, name):
-        return name in [elem.id_name for elem in self.elements]
+        return name in self._get_index()
 
     def __getitem__(self, name):
-        if name in self.elements:
-            return [elem.id_name for elem in self.elements if elem.id_name == name][0]  # exactly one expected
+        return self._get_index()[name]
 
-    def __str__(self):
-        return (
+    def write_mermaid(self, stream: TextIO) -> int:
+        # nested subgraphs are streamed element by element, instead of building their full string first
+        written = stream.write(
             self.comments_to_mermaid()
             # supporting subgraph id and short-name syntax
             # https://mermaid-js.github.io/mermaid/#/flowchart?id=subgraphs
             + f"""
 subgraph "{self.id_name}" ["{self.display if self.display else self.id_name}"]
-{NEWLINE.join([f'  {elem}' for elem in self.elements])}
-end
 """
         )
+        for i, elem in enumerate(self.elements):
+            written += stream.write(f"{NEWLINE if i else ''}  ")
+            written += elem.write_mermaid(stream)
+        written += stream.write(f"{NEWLINE}end{NEWLINE}")
+        return written
 
-
-Subgraph.update_forward_refs()
+    def __str__(self):
+        buffer = io.StringIO()
+        self.write_mermaid(buffer)
+        return buffer.getvalue()
 
 
 # '''
@@ -176,15 +288,31 @@ class GraphRegistry:
     A graph reqistry is
     * a list of elements and edges to render (representing the "graph")
     * provides a registry for lookup of already created subgraphs by name for reuse ("get_or_create")
+    * skips duplicate edges ("add_edge")
     * supports printing the graph in a mermaid-compatible format
     """
 
-    def __init__(self, elements=[]):
+    def __init__(self, elements: Optional[list] = None):
         self.subgraph_registry: dict[ReprEnum, Subgraph] = {}
         # nested
-        self.elements: list[Subgraph | Node | Edge] = elements
-        # final block of edges
+        self.elements: list[Subgraph | Node | Edge] = elements if elements is not None else []
+        # final block of edges, in insertion order
         self.edges: list[Edge] = []
+        # (edge-type, source, dest) of all edges, to skip duplicate links
+        self._edge_keys: set[tuple[type, str, str]] = set()
+
+    def add_edge(self, edge: Edge) -> bool:
+        """Adds the edge, if no edge of the same type between the same nodes exists yet.
+
+        Returns:
+            bool: True if the edge was added
+        """
+        key = (type(edge), edge.id_name, edge.dest)
+        if key in self._edge_keys:
+            return False
+        self._edge_keys.add(key)
+        self.edges.append(edge)
+        return True
 
     def get_or_create(self, subgraph_type: ReprEnum, subgraph_short_name: Optional[str] = None) -> Subgraph:
         return self.subgraph_registry.setdefault(
@@ -202,18 +330,33 @@ class GraphRegistry:
     #         for elem in self.elements:
     #             print(elem.name)
 
-    def to_mermaid(self) -> str:
-        mermaid_flowchart = "\n".join(
-            (
-                ["graph LR", f"%% {timestamp()} - Script generated Mermaid diagram"]
-                + list(map(
-                    str,
-                    # elements of cls 'Subgraph', will dump themselves recursively
-                    self.elements
-                    + [f"%% all {len(self.edges)} links connecting the above nodes"]
-                    + self.edges
-                ))  # fmt: skip
-            )
-        )
+    def write_mermaid(self, stream: TextIO, to_markdown: bool = False) -> int:
+        """Streams the mermaid diagram element by element, to keep memory flat for large graphs.
+
+        Args:
+            stream (TextIO): like an open file or 'sys.stdout'
+            to_markdown (bool, optional): Encapsulate the diagram in Markdown syntax. Defaults to False.
 
-        return mermaid_flowchart
+        Returns:
+            int: number of written characters
+        """
+        written = stream.write(MARKDOWN_HEADER) if to_markdown else 0
+        written += stream.write(f"graph LR{NEWLINE}%% {timestamp()} - Script generated Mermaid diagram")
+        # elements of cls 'Subgraph', will dump themselves recursively
+        for elem in self.elements:
+            written += stream.write(NEWLINE)
+            written += elem.write_mermaid(stream)
+
+        written += stream.write(f"{NEWLINE}%% all {len(self.edges)} links connecting the above nodes")
+        for edge in self.edges:
+            written += stream.write(NEWLINE)
+            written += edge.write_mermaid(stream)
+
+        if to_markdown:
+            written += stream.write(MARKDOWN_FOOTER)
+        return written
+
+    def to_mermaid(self) -> str:
+        buffer = io.StringIO()
+        self.write_mermaid(buffer)
+        return buffer.getvalue()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from ..app_config import ScopeCtxType
+from ..common.tracing import traced
+from .base import CommandBase
+
+if TYPE_CHECKING:
+    from cognite.client.data_classes import Group
+
+# exit code of 'diff' if the deployed state drifted from the configuration
+DRIFT_EXIT_CODE = 2
+
+SPACE_NAME_RE = re.compile(r"[^a-zA-Z0-9-_]").sub
+
+
+def canonical(value: Any) -> Any:
+    """Order-insensitive form of a capability, with sorted keys, actions and ids.
+    Empty lists are dropped, as CDF returns RAW scopes like '{"db": {}}' as '{"db": {"tables": []}}'.
+    """
+    if isinstance(value, dict):
+        return {key: canonical(item) for key, item in sorted(value.items()) if item != []}
+    if isinstance(value, (list, tuple)):
+        return sorted((canonical(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True))
+    return value
+
+
+def freeze(value: Any) -> Any:
+    """Hashable and order-insensitive form of a capability, to compare them as sets.
+    Much cheaper than 'canonical()', which is only used for the reported differences.
+    """
+    if isinstance(value, dict):
+        return frozenset([(key, freeze(item)) for key, item in value.items() if item != []])
+    if isinstance(value, (list, tuple)):
+        # lists in capabilities are of one type, mostly long lists of ids, actions or table names
+        if value and isinstance(value[0], (dict, list, tuple)):
+            return frozenset([freeze(item) for item in value])
+        return frozenset(value)
+    return value
+
+
+def get_capability_keys(capabilities: list[dict[str, Any]]) -> dict[Any, dict[str, Any]]:
+    """Capabilities by their frozen form"""
+    return {freeze(capability): capability for capability in capabilities}
+
+
+def get_sorted_capabilities(capabilities: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    return sorted((canonical(capability) for capability in capabilities), key=lambda c: json.dumps(c, sort_keys=True))
+
+
+@dataclass
+class ResourceDiff:
+    # in the configuration, but not deployed
+    missing: list[str] = field(default_factory=list)
+    # deployed with a name managed by the configuration, but not in it
+    extra: list[str] = field(default_factory=list)
+    # deployed, but different from the configuration
+    # name : {property : {"expected": .., "deployed": ..}}
+    divergent: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.missing or self.extra or self.divergent)
+
+
+class CommandDiff(CommandBase):
+    # '''
+    #       .o8   o8o   .o88o.  .o88o.
+    #      "888   `"'   888 `"  888 `"
+    #  .oooo888  oooo  o888oo  o888oo
+    # d88' `888  `888   888     888
+    # 888   888   888   888     888
+    # 888   888   888   888     888
+    # `Y8bod88P" o888o o888o   o888o
+    # '''
+
+    # deployed group id : capabilities by frozen form
+    deployed_capability_keys: dict[int, dict[Any, dict[str, Any]]]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.deployed_capability_keys = {}
+
+    @traced()
+    def command(self, output: Optional[str] = None) -> bool:
+        """Compares the configuration with the deployed CDF resources, without any writes.
+
+        Args:
+            output (str, optional): file to write the JSON report to, else it is printed to stdout.
+
+        Returns:
+            bool: True if the deployed state drifted from the configuration
+        """
+        target_raw_db_names, target_space_names = self.set_target_scopes()
+
+        diffs: dict[str, ResourceDiff] = {"datasets": self.diff_datasets()}
+        if self.with_raw_capability:
+            diffs["raw_dbs"] = self.diff_names(target_raw_db_names, self.deployed.raw_dbs.get_names())
+        if self.with_datamodel_capability:
+            diffs["spaces"] = self.diff_names(target_space_names, self.deployed.spaces.get_names(), space_names=True)
+        diffs["groups"] = self.diff_groups()
+
+        has_drift = any(diff.has_drift for diff in diffs.values())
+        report = {
+            "cdf_project": self.cdf_project,
+            "drift": has_drift,
+            "summary": {
+                resource_type: {
+                    "missing": len(diff.missing),
+                    "extra": len(diff.extra),
+                    "divergent": len(diff.divergent),
+                }
+                for resource_type, diff in diffs.items()
+            },
+            **{resource_type: asdict(diff) for resource_type, diff in diffs.items()},
+        }
+        report_json = json.dumps(report, indent=2, default=str)
+        if output:
+            Path(output).write_text(report_json + "\n")
+            logging.info(f"Diff report written to {output}")
+        else:
+            print(report_json)
+
+        for resource_type, counts in report["summary"].items():
+            logging.info(f"Diff of {resource_type}: {counts}")
+        logging.info(f"CDF Project <{self.cdf_project}> {'drifted from' if has_drift else 'matches'} the configuration")
+        return has_drift
+
+    def set_target_scopes(self) -> tuple[set[str], set[str]]:
+        """Same targets and group scopes as 'deploy' would create
+
+        Returns:
+            tuple[set[str], set[str]]: target RAW DB and space names, empty if disabled
+        """
+        self.exclude_disabled_acl_types()
+        target_raw_db_names = self.generate_target_raw_dbs() if self.with_raw_capability else set()
+        target_space_names = self.generate_target_spaces() if self.with_datamodel_capability else set()
+        self.all_scoped_ctx = {
+            ScopeCtxType.RAWDB: list(target_raw_db_names),
+            ScopeCtxType.DATASET: list(self.generate_target_datasets()),
+            ScopeCtxType.SPACE: list(target_space_names),
+        }
+        return target_raw_db_names, target_space_names
+
+    def get_managed_prefixes(self, space_names: bool = False) -> tuple[str, ...]:
+        """Name prefixes of resources owned by this configuration: its namespaces and the aggregated level.
+        Other resources in the CDF project (and deprecated '_DEPR_' datasets) are never reported as 'extra'.
+        """
+        roots = [ns.ns_name for ns in self.bootstrap_config.namespaces] + [CommandBase.AGGREGATED_LEVEL_NAME]
+        if space_names:
+            # same character replacement as 'get_space_name_template()', like 'src:001' > 'src-001'
+            return tuple(f"{SPACE_NAME_RE('-', root)}-" for root in roots)
+        return tuple(f"{root}:" for root in roots)
+
+    def diff_names(self, target_names: set[str], deployed_names: list[str], space_names: bool = False) -> ResourceDiff:
+        """RAW DBs and spaces have no properties to compare, only missing and extra ones"""
+        managed_prefixes = self.get_managed_prefixes(space_names)
+        deployed = set(deployed_names)
+        return ResourceDiff(
+            missing=sorted(target_names - deployed),
+            extra=sorted(name for name in deployed - target_names if name.startswith(managed_prefixes)),
+        )
+
+    @traced()
+    def diff_datasets(self) -> ResourceDiff:
+        target_datasets = self.generate_target_datasets()
+        deployed_names = set(self.deployed.datasets.get_names())
+        managed_prefixes = self.get_managed_prefixes()
+        diff = ResourceDiff(
+            missing=sorted(set(target_datasets) - deployed_names),
+            extra=sorted(name for name in deployed_names - set(target_datasets) if name.startswith(managed_prefixes)),
+        )
+
+        # the properties 'deploy' updates
+        for ds in self.deployed.datasets:
+            if (payload := target_datasets.get(ds.name)) is None:
+                continue
+            expected = {
+                "description": payload.get("description"),
+                "external_id": payload.get("external_id"),
+                "metadata": payload.get("metadata") or {},
+            }
+            deployed = {"description": ds.description, "external_id": ds.external_id, "metadata": ds.metadata or {}}
+            if differences := {
+                key: {"expected": expected[key], "deployed": deployed[key]}
+                for key in expected
+                # unset and empty descriptions are the same
+                if (expected[key] or None) != (deployed[key] or None)
+            }:
+                diff.divergent.setdefault(ds.name, {}).update(differences)
+        return diff
+
+    @traced()
+    def get_target_groups(self) -> dict[str, tuple[Optional[str], dict[Any, dict[str, Any]]]]:
+        """The groups 'deploy' would create
+
+        Returns:
+            dict[str, tuple[Optional[str], dict[Any, dict[str, Any]]]]:
+                group_name : (idp source-id, capabilities by frozen form)
+        """
+        idp_cdf_mappings_by_group = self.bootstrap_config.get_idp_cdf_mappings_by_group(self.cdf_project)
+        create_only_mapped_cdf_groups = self.bootstrap_config.create_only_mapped_cdf_groups(self.cdf_project)
+
+        target_groups: dict[str, tuple[Optional[str], dict[Any, dict[str, Any]]]] = {}
+        for group_level in self.get_group_levels():
+            group_name, group_capabilities = self.generate_group_name_and_capabilities(**group_level)
+            mapping = idp_cdf_mappings_by_group.get(group_name)
+            idp_source_id = mapping.idp_source_id if mapping else None
+            # like 'create_group()', which deletes a deployed group with this name
+            if create_only_mapped_cdf_groups and not idp_source_id:
+                continue
+            target_groups[group_name] = (idp_source_id, get_capability_keys(group_capabilities))
+        return target_groups
+
+    def get_deployed_capability_keys(self, group: Group) -> dict[Any, dict[str, Any]]:
+        """Capabilities of a deployed group by their frozen form.
+        CDF groups are never changed in place (an update creates a new group with a new id),
+        so they are computed once per group id.
+        """
+        if (capability_keys := self.deployed_capability_keys.get(group.id)) is None:
+            capability_keys = get_capability_keys([c.dump(camel_case=True) for c in group.capabilities or []])
+            self.deployed_capability_keys[group.id] = capability_keys
+        return capability_keys
+
+    @traced()
+    def diff_groups(self) -> ResourceDiff:
+        target_groups = self.get_target_groups()
+
+        deployed_groups: dict[str, list] = {}
+        for group in self.deployed.groups:
+            deployed_groups.setdefault(group.name, []).append(group)
+
+        group_prefixes = tuple(f"{CommandBase.GROUP_NAME_PREFIX}{prefix}" for prefix in self.get_managed_prefixes())
+        diff = ResourceDiff(
+            missing=sorted(set(target_groups) - set(deployed_groups)),
+            extra=sorted(
+                name
+                for name in set(deployed_groups) - set(target_groups)
+                if name.startswith(group_prefixes) or name == f"{CommandBase.GROUP_NAME_PREFIX}root"
+            ),
+        )
+
+        for group_name, (idp_source_id, capability_keys) in target_groups.items():
+            for group in deployed_groups.get(group_name, []):
+                differences: dict[str, Any] = {}
+                if (group.source_id or None) != idp_source_id:
+                    differences["source_id"] = {"expected": idp_source_id, "deployed": group.source_id}
+                deployed_keys = self.get_deployed_capability_keys(group)
+                if deployed_keys.keys() != capability_keys.keys():
+                    differences["capabilities"] = {
+                        "missing": get_sorted_capabilities(
+                            capability_keys[key] for key in capability_keys.keys() - deployed_keys.keys()
+                        ),
+                        "extra": get_sorted_capabilities(
+                            deployed_keys[key] for key in deployed_keys.keys() - capability_keys.keys()
+                        ),
+                    }
+                if len(deployed_groups[group_name]) > 1:
+                    # left over from an interrupted 'deploy', which creates the new group before deleting the old
+                    differences["duplicates"] = len(deployed_groups[group_name])
+                if differences:
+                    diff.divergent[group_name] = differences
+                    break
+        return diff
@@ -2,6 +2,8 @@ import logging
 
 from bootstrap.app_config import IdpCdfMapping
 
+from ..common.logs import Lazy
+from ..common.tracing import traced
 from .base import CommandBase
 
 
@@ -15,6 +17,7 @@ class CommandPrepare(CommandBase):
     #   888                           888
     #  o888o                         o888o
     # '''
+    @traced()
     def command(self, idp_source_id: str) -> None:
         group_name = f"{CommandBase.GROUP_NAME_PREFIX}bootstrap"
 
@@ -31,7 +34,7 @@ class CommandPrepare(CommandBase):
             cdf_group=group_name, idp_source_id=idp_source_id, idp_source_name=f"IdP group ID: {idp_source_id}"
         )
 
-        logging.debug(f"GROUPS in CDF:\n{self.deployed.groups.get_names()}")
+        logging.debug("GROUPS in CDF:\n%s", Lazy(self.deployed.groups.get_names))
 
         if self.is_dry_run:
             logging.info(f"Dry run - Creating minimum CDF Group for bootstrap: <{group_name=}> with {idp_mapping=}")
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from ..app_config import CommandMode, ScopeCtxType
+from ..app_config_cache import ConfigCache, hash_config_file, hash_include_files
+from ..app_container import ContainerSelector, init_container
+from ..app_exceptions import BootstrapConfigError
+from ..common.api_metrics import API_METRICS
+from ..common.tracing import TRACER, traced
+from .diff import CommandDiff, ResourceDiff
+
+if TYPE_CHECKING:
+    from cognite.client.data_classes import DataSetList
+
+
+class CommandReconcile(CommandDiff):
+    # '''
+    #                                                                     o8o   oooo
+    #                                                                     `"'   `888
+    # oooo d8b   .ooooo.    .ooooo.    .ooooo.   ooo. .oo.     .ooooo.   oooo    888    .ooooo.
+    # `888""8P  d88' `88b  d88' `"Y8  d88' `88b  `888P"Y88b   d88' `"Y8  `888    888   d88' `88b
+    #  888      888ooo888  888        888   888   888   888   888         888    888   888ooo888
+    #  888      888    .o  888   .o8  888   888   888   888   888   .o8   888    888   888    .o
+    # d888b     `Y8bod8P'  `Y8bod8P'  `Y8bod8P'  o888o o888o  `Y8bod8P'  o888o  o888o  `Y8bod8P'
+    # '''
+    def __init__(
+        self,
+        config_path: str,
+        command: CommandMode,
+        debug: bool,
+        dry_run: bool = False,
+        dotenv_path: str | Path | None = None,
+        config_cache_dir: str | Path | None = None,
+        logging_settings: Optional[dict] = None,
+        cognite_settings: Optional[dict] = None,
+    ):
+        super().__init__(
+            config_path,
+            command=command,
+            debug=debug,
+            dry_run=dry_run,
+            dotenv_path=dotenv_path,
+            config_cache_dir=config_cache_dir,
+            logging_settings=logging_settings,
+            cognite_settings=cognite_settings,
+        )
+        # to reload the configuration when it changed
+        self.config_path = config_path
+        self.dotenv_path = dotenv_path
+        self.config_cache_dir = config_cache_dir
+        self.cognite_settings = cognite_settings
+        self.config_hash: Optional[str] = self.get_config_hash()
+
+        # groups 'deploy' would create, only computed again if the configuration or the dataset ids changed
+        self.target_groups: dict[str, tuple[Optional[str], dict[Any, dict[str, Any]]]] = {}
+        self.target_groups_key: Optional[tuple] = None
+
+    def command(self, interval: int, ticks: Optional[int] = None) -> None:
+        """Reconciles the CDF project with the configuration every 'interval' seconds, until stopped.
+        Not traced as a whole, as it never ends, each tick is.
+
+        Args:
+            interval (int): seconds from the start of one tick to the next
+            ticks (int, optional): stop after this number of ticks. Defaults to None, to run until stopped.
+        """
+        tick = 0
+        try:
+            while True:
+                started = time.monotonic()
+                tick += 1
+                # spans ('--trace') and API metrics are kept per tick, as the process never exits
+                TRACER.reset()
+                API_METRICS.reset()
+                try:
+                    # the deployed state was just loaded at startup
+                    changes = self.reconcile(refresh=tick > 1)
+                    logging.info(
+                        f"Reconcile tick {tick} finished in {time.monotonic() - started:.1f}s, "
+                        f"created or updated: {changes}"
+                    )
+                except Exception:
+                    # neither an invalid configuration nor an unavailable CDF project stops the process,
+                    # the next tick tries again
+                    logging.exception(f"Reconcile tick {tick} failed")
+                if API_METRICS.calls():
+                    logging.info(f"CDF API calls of tick {tick}:\n{API_METRICS.format_summary()}")
+
+                if ticks is not None and tick >= ticks:
+                    break
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            logging.info(f"Reconcile stopped after {tick} ticks")
+
+    @traced()
+    def reconcile(self, refresh: bool = True) -> dict[str, int]:
+        """One tick: reloads a changed configuration, refreshes the deployed state and applies the deltas only.
+        Like 'deploy', resources which are not in the configuration are never deleted.
+
+        Args:
+            refresh (bool, optional): list the deployed resources again. Defaults to True.
+
+        Returns:
+            dict[str, int]: number of created or updated resources per type
+        """
+        # hashed before it is read, that a change while reloading is picked up on the next tick
+        config_file_hash = hash_config_file(self.config_path)
+        if self.get_config_hash(config_file_hash) != self.config_hash:
+            logging.info(f"Configuration <{self.config_path}> changed, reloading it")
+            # a partially loaded configuration is loaded again on the next tick, even if the file is reverted
+            self.config_hash = None
+            self.reload_config()
+            # with the 'bootstrap.includes' of the reloaded configuration, which can differ from the previous ones
+            self.config_hash = self.get_config_hash(config_file_hash)
+
+        if refresh:
+            from ..app_cache import CogniteDeployedCache
+
+            with TRACER.span("deployed_cache"):
+                self.deployed = CogniteDeployedCache(self.client)
+            # forget the capabilities of deleted groups
+            self.deployed_capability_keys = {
+                group.id: self.deployed_capability_keys[group.id]
+                for group in self.deployed.groups
+                if group.id in self.deployed_capability_keys
+            }
+
+        self.set_target_scopes()
+        changes: dict[str, int] = {}
+        if self.with_raw_capability:
+            changes["raw_dbs"] = len(self.generate_missing_raw_dbs()[1])
+        if self.with_datamodel_capability:
+            changes["spaces"] = len(self.generate_missing_spaces()[1])
+        # before the groups, as their scopes need the ids of new datasets
+        changes["datasets"] = self.apply_dataset_deltas(self.diff_datasets())
+        changes["groups"] = self.apply_group_deltas(self.diff_groups())
+        return changes
+
+    def get_config_hash(self, config_file_hash: Optional[str] = None) -> str:
+        """Hash of the configuration file, the environment variables it references and its 'bootstrap.includes'
+        of the loaded configuration
+
+        Args:
+            config_file_hash (str, optional): hash of the configuration file. Defaults to None, to hash it now.
+        """
+        digest = hashlib.sha256((config_file_hash or hash_config_file(self.config_path)).encode())
+        try:
+            fragment_hashes = hash_include_files(self.container.config(), Path(self.config_path))
+        except (BootstrapConfigError, OSError) as e:
+            # a removed or unreadable fragment counts as a change, the configuration file may not include it anymore
+            logging.debug(f"Included config fragments of <{self.config_path}> changed: {e}")
+            fragment_hashes = {"<missing>": str(e)}
+        for fragment_path, fragment_hash in sorted(fragment_hashes.items()):
+            digest.update(f"\0{fragment_path}={fragment_hash}".encode())
+        return digest.hexdigest()
+
+    @traced()
+    def reload_config(self) -> None:
+        """Loads and validates the changed configuration, keeping the CDF client, deployed state and logging.
+        Changes to the 'cognite' and 'logging' sections require a restart.
+        If the new configuration is invalid, nothing is applied until it is fixed.
+        """
+        self.config_cache = ConfigCache(self.config_cache_dir, self.config_path) if self.config_cache_dir else None
+        self.container = init_container(
+            ContainerSelector[CommandMode.RECONCILE],
+            config_path=self.config_path,
+            dotenv_path=self.dotenv_path,
+            config_cache=self.config_cache,
+            cognite_settings=self.cognite_settings,
+            keep_logging=True,
+        )
+        self.load_bootstrap_config()
+        # resolved again from the new configuration on next access
+        self.__dict__.pop("resolved", None)
+        (
+            self.validate_config_length_limits()
+            .validate_config_shared_access()
+            .validate_config_is_cdf_project_in_mappings()
+        )  # fmt:skip
+        self.store_config_cache(CommandMode.RECONCILE)
+
+    def get_target_groups(self) -> dict[str, tuple[Optional[str], dict[Any, dict[str, Any]]]]:
+        # group scopes only change with the configuration and the ids of its datasets
+        ids_by_name = self.deployed.datasets.get_ids_by_name()
+        target_groups_key = (
+            self.config_hash,
+            tuple(
+                (name, tuple(ids_by_name.get(name, []))) for name in sorted(self.all_scoped_ctx[ScopeCtxType.DATASET])
+            ),
+        )
+        if target_groups_key != self.target_groups_key:
+            self.target_groups, self.target_groups_key = super().get_target_groups(), target_groups_key
+        return self.target_groups
+
+    @traced()
+    def apply_dataset_deltas(self, diff: ResourceDiff) -> int:
+        """Creates the missing and updates the divergent datasets, like 'generate_missing_datasets()'
+        does for all of them
+        """
+        from cognite.client.data_classes import DataSet, DataSetUpdate
+
+        target_datasets = self.generate_target_datasets()
+        if diff.missing:
+            datasets_to_be_created = [
+                DataSet(
+                    name=name,
+                    description=target_datasets[name].get("description"),
+                    external_id=target_datasets[name].get("external_id"),
+                    metadata=target_datasets[name].get("metadata"),
+                    write_protected=True,
+                )
+                for name in diff.missing
+            ]
+            if self.is_dry_run:
+                logging.info(f"Dry run - Creating missing datasets: {diff.missing}")
+            else:
+                logging.info(f"Creating missing datasets: {diff.missing}")
+                created_datasets: DataSet | DataSetList = self.client.data_sets.create(datasets_to_be_created)
+                self.deployed.datasets.create(resources=created_datasets)
+
+        if diff.divergent:
+            ids_by_name = self.deployed.datasets.get_ids_by_name()
+            datasets_to_be_updated = [
+                DataSetUpdate(id=dataset_id)
+                .description.set(target_datasets[name].get("description"))
+                .external_id.set(target_datasets[name].get("external_id"))
+                .metadata.set(target_datasets[name].get("metadata", {}))
+                for name in diff.divergent
+                for dataset_id in ids_by_name[name]
+            ]
+            if self.is_dry_run:
+                logging.info(f"Dry run - Updating divergent datasets: {diff.divergent}")
+            else:
+                logging.info(f"Updating divergent datasets: {diff.divergent}")
+                updated_datasets: DataSet | DataSetList = self.client.data_sets.update(datasets_to_be_updated)
+                self.deployed.datasets.update(resources=updated_datasets)
+
+        return len(diff.missing) + len(diff.divergent)
+
+    @traced()
+    def apply_group_deltas(self, diff: ResourceDiff) -> int:
+        """Creates the missing and recreates the divergent groups, with the upsert of 'create_group()'"""
+        for group_name in diff.missing + list(diff.divergent):
+            logging.info(
+                f"Group <{group_name}> is "
+                + (f"divergent: {sorted(diff.divergent[group_name])}" if group_name in diff.divergent else "missing")
+            )
+            _, capability_keys = self.target_groups[group_name]
+            self.create_group(group_name, list(capability_keys.values()))
+        return len(diff.missing) + len(diff.divergent)
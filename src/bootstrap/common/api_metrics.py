@@ -0,0 +1,282 @@
+"""Instrumentation of the CDF API calls made through a CogniteClient.
+
+Per endpoint (like 'POST /groups/list') it records call count, payload bytes, latencies,
+retries and throttled (HTTP 429) responses. Counting the items needs the request and response
+bodies parsed again, so it is only done if 'count_items' is set ('--api-metrics-json' and tests).
+One 'ApiMetrics' instance is shared by all clients of a run ('API_METRICS'), so commands can log
+a summary at the end and tests can assert request budgets:
+
+    API_METRICS.reset()
+    CommandDeploy(...).command()
+    assert API_METRICS.calls("POST /groups") <= 1
+
+The calls are recorded by wrapping methods of the SDK's private 'HTTPClient', which is only
+done for the SDK versions in 'INSTRUMENTED_SDK_VERSIONS'.
+"""
+from __future__ import annotations
+
+import gzip
+import inspect
+import json
+import logging
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import requests
+    from cognite.client import CogniteClient
+
+# path templates, that names of RAW DBs/tables or internal ids don't create an endpoint each
+ENDPOINT_TEMPLATES = [
+    # but not 'POST /raw/dbs/delete'
+    (re.compile(r"/raw/dbs/(?!delete$)[^/]+"), "/raw/dbs/{db}"),
+    (re.compile(r"/tables/[^/]+"), "/tables/{table}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{id}"),
+]
+PROJECT_PATH = re.compile(r"^/api/v1/projects/[^/]+")
+PERCENTILES = (50, 90, 99)
+HTTP_TOO_MANY_REQUESTS = 429
+# major versions of cognite-sdk whose private 'HTTPClient.request' and '_do_request' are wrapped
+INSTRUMENTED_SDK_VERSIONS = ("7",)
+# arguments of both methods, which the wrappers read
+INSTRUMENTED_SDK_PARAMETERS = ("method", "url", "data", "headers", "stream")
+
+
+def get_endpoint(method: str, url: str) -> str:
+    """'GET https://api.cognitedata.com/api/v1/projects/shiny-dev/raw/dbs/src:001:sap/tables' > 'GET /raw/dbs/{db}/tables'"""  # noqa
+    path = re.sub(r"^[a-z]+://[^/]+", "", url).split("?", 1)[0]
+    path = PROJECT_PATH.sub("", path)
+    for pattern, template in ENDPOINT_TEMPLATES:
+        path = pattern.sub(template, path)
+    return f"{method.upper()} {path or '/'}"
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def count_items(payload: Any, gzipped: bool = False) -> int:
+    """Number of 'items' in a CDF API request or response body, 0 if it has none"""
+    try:
+        if isinstance(payload, (bytes, str)):
+            if gzipped and isinstance(payload, bytes):
+                payload = gzip.decompress(payload)
+            payload = json.loads(payload) if payload else None
+        items = payload.get("items") if isinstance(payload, dict) else None
+        return len(items) if isinstance(items, list) else 0
+    except (ValueError, OSError, TypeError):
+        return 0
+
+
+@dataclass(slots=True)
+class EndpointMetrics:
+    calls: int = 0
+    # requests sent incl. retries
+    attempts: int = 0
+    items: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    throttled: int = 0
+    errors: int = 0
+    latencies_s: list[float] = field(default_factory=list, repr=False)
+
+    def summary(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies_s)
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "items": self.items,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "latency_s": {
+                **{f"p{pct}": round(percentile(latencies, pct), 4) for pct in PERCENTILES},
+                "max": round(latencies[-1], 4) if latencies else 0.0,
+                "total": round(sum(latencies), 4),
+            },
+        }
+
+
+class ApiMetrics:
+    """Thread-safe store of the API calls of a run, by endpoint"""
+
+    def __init__(self, count_items: bool = False) -> None:
+        self._lock = threading.Lock()
+        self.by_endpoint: dict[str, EndpointMetrics] = {}
+        # parse the bodies again to count their items, too expensive to be always on
+        self.count_items = count_items
+
+    def reset(self) -> None:
+        with self._lock:
+            self.by_endpoint = {}
+
+    def record(
+        self,
+        endpoint: str,
+        latency_s: float,
+        attempts: int = 1,
+        throttled: int = 0,
+        items: int = 0,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            metrics = self.by_endpoint.setdefault(endpoint, EndpointMetrics())
+            metrics.calls += 1
+            metrics.attempts += attempts
+            metrics.retries += attempts - 1
+            metrics.throttled += throttled
+            metrics.items += items
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+            metrics.errors += error
+            metrics.latencies_s.append(latency_s)
+
+    def calls(self, endpoint: Optional[str] = None) -> int:
+        """Number of calls to 'endpoint' (like 'GET /groups'), or to all endpoints"""
+        with self._lock:
+            if endpoint:
+                return self.by_endpoint[endpoint].calls if endpoint in self.by_endpoint else 0
+            return sum(metrics.calls for metrics in self.by_endpoint.values())
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """JSON compatible summary by endpoint, sorted by total latency"""
+        with self._lock:
+            summaries = {endpoint: metrics.summary() for endpoint, metrics in self.by_endpoint.items()}
+        return dict(sorted(summaries.items(), key=lambda kv: -kv[1]["latency_s"]["total"]))
+
+    def format_summary(self) -> str:
+        header = (
+            f"{'endpoint':<40} {'calls':>6} {'items':>7} {'sent':>10} {'received':>10} "
+            f"{'p50 [s]':>8} {'p90 [s]':>8} {'p99 [s]':>8} {'retries':>8} {'429s':>5}"
+        )
+        rows = [header]
+        for endpoint, s in self.summary().items():
+            latency = s["latency_s"]
+            items = s["items"] if self.count_items else "-"
+            rows.append(
+                f"{endpoint:<40} {s['calls']:>6} {items:>7} {s['request_bytes']:>10} {s['response_bytes']:>10} "
+                f"{latency['p50']:>8.3f} {latency['p90']:>8.3f} {latency['p99']:>8.3f} "
+                f"{s['retries']:>8} {s['throttled']:>5}"
+            )
+        return "\n".join(rows)
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.summary(), indent=2) + "\n")
+
+
+# shared by all CogniteClients of this process
+API_METRICS = ApiMetrics()
+
+
+def get_uninstrumentable_reason() -> Optional[str]:
+    """Why the installed cognite-sdk can't be instrumented, None if it can"""
+    from cognite.client import __version__ as sdk_version
+
+    if sdk_version.split(".", 1)[0] not in INSTRUMENTED_SDK_VERSIONS:
+        return f"cognite-sdk {sdk_version} is not one of the instrumented versions {INSTRUMENTED_SDK_VERSIONS}"
+    try:
+        from cognite.client._api_client import APIClient  # noqa: F401
+        from cognite.client._http_client import HTTPClient
+
+        for method in (HTTPClient.request, HTTPClient._do_request):
+            if missing := set(INSTRUMENTED_SDK_PARAMETERS) - set(inspect.signature(method).parameters):
+                return f"cognite-sdk {sdk_version} 'HTTPClient.{method.__name__}' has no {sorted(missing)}"
+    except (ImportError, AttributeError) as e:
+        return f"cognite-sdk {sdk_version} has no 'APIClient' or 'HTTPClient': {e}"
+    return None
+
+
+def instrument_cognite_client(client: "CogniteClient", api_metrics: ApiMetrics = API_METRICS) -> "CogniteClient":
+    """Records all CDF API calls of the 'client' into 'api_metrics'.
+
+    Each SDK API (groups, data_sets, raw.databases, ..) has its own HTTP clients, which retry throttled
+    and failed requests internally. Their 'request' (one call) and '_do_request' (one attempt) are wrapped,
+    to count the retries and 429s of each call.
+    If the installed SDK changed these private methods, the client is returned as is, without API metrics.
+    """
+    if reason := get_uninstrumentable_reason():
+        logging.warning(f"CDF API calls are not recorded: {reason}")
+        return client
+
+    from cognite.client._api_client import APIClient
+    from cognite.client._http_client import HTTPClient
+
+    # attempts (status-code or None for connection errors) of the running call, per thread
+    local = threading.local()
+
+    def wrap_http_client(http_client: HTTPClient) -> None:
+        do_request, request = http_client._do_request, http_client.request
+
+        def instrumented_do_request(*args, **kwargs) -> "requests.Response":
+            try:
+                response = do_request(*args, **kwargs)
+            except Exception:
+                local.attempts.append(None)
+                raise
+            local.attempts.append(response.status_code)
+            return response
+
+        def instrumented_request(method: str, url: str, *args, **kwargs) -> "requests.Response":
+            local.attempts = []
+            data, headers = kwargs.get("data"), kwargs.get("headers") or {}
+            response: Optional["requests.Response"] = None
+            start = time.perf_counter()
+            try:
+                response = request(method, url, *args, **kwargs)
+                return response
+            finally:
+                latency_s = time.perf_counter() - start
+                # streamed responses (file downloads) are not read, to not consume them
+                is_read = response is not None and not kwargs.get("stream")
+                items = 0
+                if api_metrics.count_items:
+                    items = count_items(response.content, gzipped=False) if is_read else 0
+                    if not items and data:
+                        items = count_items(data, gzipped=headers.get("Content-Encoding") == "gzip")
+                # already read by the SDK, 'len()' doesn't copy it
+                response_bytes = len(response.content) if is_read else 0
+                api_metrics.record(
+                    get_endpoint(method, url),
+                    latency_s=latency_s,
+                    attempts=len(local.attempts) or 1,
+                    throttled=local.attempts.count(HTTP_TOO_MANY_REQUESTS),
+                    items=items,
+                    request_bytes=len(data) if isinstance(data, (bytes, str)) else 0,
+                    response_bytes=response_bytes,
+                    error=response is None or response.status_code >= 400,
+                )
+
+        # instance attributes take precedence over the methods
+        http_client._do_request = instrumented_do_request  # type: ignore[method-assign]
+        http_client.request = instrumented_request  # type: ignore[method-assign]
+
+    seen: set[int] = set()
+
+    def walk(obj: Any) -> None:
+        for value in vars(obj).values():
+            if id(value) in seen:
+                continue
+            if isinstance(value, APIClient):
+                seen.add(id(value))
+                walk(value)
+            elif isinstance(value, HTTPClient):
+                seen.add(id(value))
+                wrap_http_client(value)
+
+    walk(client)
+    logging.debug(f"Instrumented {len(seen)} CDF API clients")
+    return client
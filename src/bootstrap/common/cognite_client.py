@@ -1,12 +1,13 @@
 import logging.config
-from typing import Optional
-
-# TODO: PEP 484 Stub Files issue?
-from cognite.client import ClientConfig, CogniteClient
-from cognite.client.credentials import OAuthClientCredentials
+from typing import TYPE_CHECKING, Optional
 
+from ..common.api_metrics import instrument_cognite_client
 from ..common.base_model import Model
 
+if TYPE_CHECKING:
+    # TODO: PEP 484 Stub Files issue?
+    from cognite.client import CogniteClient
+
 
 class CogniteIdpConfig(Model):
     # fields required for OIDC client-credentials authentication
@@ -15,12 +16,31 @@ class CogniteIdpConfig(Model):
     secret: str
     scopes: list[str]
     token_url: str
+    # opt-in directory for an encrypted cache of access tokens, reused by later cli runs
+    token_cache_dir: Optional[str] = None
+
+
+class CogniteConnectionConfig(Model):
+    # HTTP settings of the SDK, which are process-wide ('global_config'), unset keeps the SDK defaults
+    # retries of throttled (429), unavailable (502-504) and read-only requests (SDK default: 10)
+    max_retries: Optional[int] = None
+    # retries of failed connection attempts (SDK default: 3)
+    max_retries_connect: Optional[int] = None
+    # max seconds of the exponential backoff between retries (SDK default: 30)
+    max_retry_backoff: Optional[int] = None
+    # open connections kept for reuse, should not be lower than 'max-workers' (SDK default: 50)
+    max_connection_pool_size: Optional[int] = None
 
 
 class CogniteConfig(Model):
     host: str
     project: str
     idp_authentication: CogniteIdpConfig
+    # parallel requests of one SDK call, like chunked creates (SDK default: 5)
+    max_workers: Optional[int] = None
+    # seconds to wait for a response (SDK default: 30)
+    timeout: Optional[int] = None
+    connection: CogniteConnectionConfig = CogniteConnectionConfig()
 
     # compatibility properties to keep get_cognite_client() in sync with other solutions
     # which are using flat-property list, no nesting and a bit different names
@@ -49,30 +69,79 @@ class CogniteConfig(Model):
         return self.idp_authentication.secret
 
 
-def get_cognite_client(cognite_config: CogniteConfig) -> CogniteClient:
+def apply_connection_config(cognite_config: CogniteConfig) -> None:
+    """Applies the concurrency, retry and connection-pool settings to the SDK 'global_config'"""
+    from cognite.client import global_config
+    from cognite.client._http_client import get_global_requests_session
+
+    connection = cognite_config.connection
+    if cognite_config.max_workers is not None:
+        global_config.max_workers = cognite_config.max_workers
+    for name in ("max_retries", "max_retries_connect", "max_retry_backoff"):
+        if (value := getattr(connection, name)) is not None:
+            setattr(global_config, name, value)
+    if (
+        connection.max_connection_pool_size is not None
+        and connection.max_connection_pool_size != global_config.max_connection_pool_size
+    ):
+        global_config.max_connection_pool_size = connection.max_connection_pool_size
+        # the shared session is created once with the pool size, recreate it on next use
+        get_global_requests_session.cache_clear()
+    logging.debug(
+        f"CDF API settings: {global_config.max_workers=}, {global_config.max_retries=}, "
+        f"{global_config.max_retries_connect=}, {global_config.max_retry_backoff=}, "
+        f"{global_config.max_connection_pool_size=}, timeout={cognite_config.timeout or 'default'}"
+    )
+
+
+def get_cognite_client(cognite_config: CogniteConfig) -> "CogniteClient":
     """Get an authenticated CogniteClient for the given project and user
     Returns:
         CogniteClient: The authenticated CogniteClient
     """
+    # imported on first use, the SDK is the largest part of the cli startup time
+    from cognite.client import ClientConfig, CogniteClient
+    from cognite.client.credentials import OAuthClientCredentials
+
     try:
         logging.debug("Attempt to create CogniteClient")
 
-        credentials = OAuthClientCredentials(
+        credentials_args = dict(
             token_url=cognite_config.token_url,
             client_id=cognite_config.client_id,
             client_secret=cognite_config.client_secret,
             scopes=cognite_config.scopes,
         )
+        credentials = None
+        if cognite_config.idp_authentication.token_cache_dir:
+            from .token_cache import (
+                CachedOAuthClientCredentials,
+                TokenCache,
+                get_uncachable_reason,
+            )
+
+            if reason := get_uncachable_reason():
+                logging.warning(f"Token cache directory is not used: {reason}")
+            else:
+                token_cache = TokenCache(
+                    cache_dir=cognite_config.idp_authentication.token_cache_dir, **credentials_args
+                )
+                credentials = CachedOAuthClientCredentials(**credentials_args, token_cache=token_cache)
+        if credentials is None:
+            credentials = OAuthClientCredentials(**credentials_args)
 
         cnf = ClientConfig(
             client_name=cognite_config.client_name,
             base_url=cognite_config.base_url,
             project=cognite_config.project,
             credentials=credentials,
+            timeout=cognite_config.timeout,
         )
+        apply_connection_config(cognite_config)
         logging.debug(f"get CogniteClient for {cognite_config.project=}")
 
-        return CogniteClient(cnf)
+        # records calls, latencies and retries per endpoint for the summary at the end of the command
+        return instrument_cognite_client(CogniteClient(cnf))
     except Exception as e:
         logging.critical(f"Unable to create CogniteClient: {e}")
         raise
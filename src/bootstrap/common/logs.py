@@ -0,0 +1,122 @@
+"""Logging helpers for large configurations.
+
+- 'Lazy': defers an expensive log payload (like the names of all groups) until a handler
+  really formats the record, so disabled levels cost nothing
+- 'JsonFormatter': one JSON object per line, for log collectors ('--log-format json')
+- 'start_queue_logging()': moves the configured root handlers behind a QueueHandler, and lets
+  a QueueListener thread do the formatting and the file and console I/O ('--log-queue')
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Optional
+
+# attributes of every LogRecord, everything else was passed with 'extra={..}'
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+# the running listener with its logger and queue handler, only one per process as it owns the handlers
+_queue_logging: Optional[tuple[QueueListener, logging.Logger, QueueHandler]] = None
+
+
+class Lazy:
+    """Log argument calling 'func(*args)' only when the message is formatted, once for all handlers
+
+    Example:
+        logging.debug("GROUPS in CDF:\\n%s", Lazy(self.deployed.groups.get_names))
+    """
+
+    __slots__ = ("func", "args", "_value")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+        self._value: Optional[str] = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = str(self.func(*self.args))
+        return self._value
+
+    __repr__ = __str__
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as JSON lines with time, level, logger, thread and message,
+    plus the 'extra={..}' fields and the formatted exception, if any.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler which leaves the formatting to the listener thread.
+
+    The stdlib 'QueueHandler.prepare()' formats each record with the handler's formatter before it is
+    queued, and drops the exception info (to be safe with unpicklable records in a multiprocessing queue).
+    In-process only the message arguments must be resolved, as they could change after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg, record.args = record.getMessage(), None
+        return record
+
+
+def set_json_formatter(logger: Optional[logging.Logger] = None) -> None:
+    """Replaces the formatter of all handlers of the (root) logger"""
+    for handler in (logger or logging.getLogger()).handlers:
+        handler.setFormatter(JsonFormatter())
+
+
+def start_queue_logging(logger: Optional[logging.Logger] = None) -> QueueListener:
+    """Moves all handlers of the (root) logger to a QueueListener thread, which is stopped at exit"""
+    global _queue_logging
+    stop_queue_logging()
+
+    logger = logger or logging.getLogger()
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    # records no handler accepts are not queued, which would resolve their 'Lazy' arguments
+    queue_handler.setLevel(min((handler.level for handler in handlers), default=logging.NOTSET))
+    logger.addHandler(queue_handler)
+
+    # handlers keep their own levels, like 'INFO' on console and 'DEBUG' to file
+    listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_logging = (listener, logger, queue_handler)
+    return listener
+
+
+def stop_queue_logging() -> None:
+    """Flushes all queued records, stops the listener thread and gives the handlers back to the logger"""
+    global _queue_logging
+    if _queue_logging is None:
+        return
+    (listener, logger, queue_handler), _queue_logging = _queue_logging, None
+    listener.stop()
+    logger.removeHandler(queue_handler)
+    for handler in listener.handlers:
+        logger.addHandler(handler)
+
+
+atexit.register(stop_queue_logging)
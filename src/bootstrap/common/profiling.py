@@ -0,0 +1,141 @@
+"""Profiling of a whole command run with cProfile and optionally tracemalloc ('--profile').
+
+Writes
+- '<output>.prof': cProfile stats of all threads, for 'snakeviz', 'pstats' or 'flameprof'
+- '<output>.txt': the top-N hotspots (by own and by cumulative time) and, with memory profiling,
+  the peak memory per phase (the tracing spans)
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .task_graph import TaskGraph
+from .tracing import TRACER, Span
+
+MIB = 1024 * 1024
+
+
+@dataclass(slots=True)
+class PhaseMemory:
+    name: str
+    depth: int
+    duration_s: float = 0.0
+    # peak of traced memory while the phase was running, including its sub-phases
+    peak_bytes: int = 0
+
+
+class CommandProfiler:
+    """cProfile for the main thread and all threads started while profiling (like the TaskGraph stages),
+    merged into one report. With 'with_memory', tracemalloc records the peak memory of each phase.
+    Its peak is process-wide, so the stages of a TaskGraph run one at a time while profiling memory,
+    that the phases of their threads are nested in the running phase of the main thread.
+    """
+
+    def __init__(self, output: str | Path, top: int = 25, with_memory: bool = False):
+        self.output = Path(output)
+        self.top = top
+        self.with_memory = with_memory
+        self._profile = cProfile.Profile()
+        self._thread_profiles: list[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        # running phases of all threads by their span, and all phases in start order
+        self._phase_stack: list[tuple[Span, PhaseMemory]] = []
+        self.phases: list[PhaseMemory] = []
+        self._default_max_workers = TaskGraph.default_max_workers
+
+    def _profile_thread(self, *args) -> None:
+        # called by 'threading.setprofile' on the first event of a new thread,
+        # replaced by the thread's own profiler with 'enable()'
+        profile = cProfile.Profile()
+        with self._lock:
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def start(self) -> "CommandProfiler":
+        if self.with_memory:
+            tracemalloc.start()
+            TRACER.listeners.append(self)
+            self._default_max_workers, TaskGraph.default_max_workers = TaskGraph.default_max_workers, 1
+        threading.setprofile(self._profile_thread)
+        self._profile.enable()
+        return self
+
+    def stop(self) -> None:
+        self._profile.disable()
+        threading.setprofile(None)  # type: ignore[arg-type]
+        if self.with_memory:
+            TRACER.listeners.remove(self)
+            TaskGraph.default_max_workers = self._default_max_workers
+            tracemalloc.stop()
+
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        prof_file = self.output.with_suffix(".prof")
+        report_file = self.output.with_suffix(".txt")
+
+        stats = pstats.Stats(self._profile, *self._thread_profiles)
+        stats.dump_stats(prof_file)
+        report = self.format_report(stats)
+        report_file.write_text(report)
+
+        logging.info(f"Profile written to {prof_file} and {report_file}:\n{report}")
+
+    #
+    # tracing span listener, peak memory per phase
+    #
+    def span_started(self, span: Span) -> None:
+        with self._lock:
+            if self._phase_stack:
+                # the peak is reset for the new phase, keep it for the running parent phase
+                _, parent = self._phase_stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes, tracemalloc.get_traced_memory()[1])
+            phase = PhaseMemory(name=span.name, depth=len(self._phase_stack))
+            self._phase_stack.append((span, phase))
+            self.phases.append(phase)
+            tracemalloc.reset_peak()
+
+    def span_ended(self, span: Span) -> None:
+        with self._lock:
+            # the last one, unless spans of other threads (not a TaskGraph stage) overlap
+            index = next((i for i in reversed(range(len(self._phase_stack))) if self._phase_stack[i][0] is span), None)
+            if index is None:
+                return
+            _, phase = self._phase_stack.pop(index)
+            phase.peak_bytes = max(phase.peak_bytes, tracemalloc.get_traced_memory()[1])
+            phase.duration_s = span.duration_ns / 1e9
+            span.set(memory_peak_bytes=phase.peak_bytes)
+            if self._phase_stack:
+                _, parent = self._phase_stack[-1]
+                parent.peak_bytes = max(parent.peak_bytes, phase.peak_bytes)
+            tracemalloc.reset_peak()
+
+    def format_report(self, stats: Optional[pstats.Stats] = None) -> str:
+        sections = []
+        if stats is not None:
+            for sort_key, title in (("tottime", "own time"), ("cumulative", "cumulative time")):
+                stream = io.StringIO()
+                stats.stream = stream  # type: ignore[attr-defined]
+                stats.sort_stats(sort_key).print_stats(self.top)
+                # skip the pstats header lines up to the table
+                table = stream.getvalue()
+                table = table[table.find("   ncalls") :].rstrip()
+                sections.append(f"Top {self.top} hotspots by {title}:\n{table}")
+
+        if self.phases:
+            name_width = max(2 * phase.depth + len(phase.name) for phase in self.phases)
+            rows = [f"{'phase':<{name_width}} {'duration [s]':>13} {'peak [MiB]':>11}"]
+            rows.extend(
+                f"{'  ' * phase.depth + phase.name:<{name_width}} "
+                f"{phase.duration_s:>13.3f} {phase.peak_bytes / MIB:>11.1f}"
+                for phase in self.phases
+            )
+            sections.append("Peak memory per phase (tracemalloc):\n" + "\n".join(rows))
+
+        return "\n\n".join(sections) + "\n"
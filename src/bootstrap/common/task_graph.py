@@ -0,0 +1,169 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from .tracing import TRACER
+
+# because within f'' strings no backslash-character is allowed
+NEWLINE = "\n"
+
+
+@dataclass
+class StageTiming:
+    """Start and end of a stage, relative to the start of the TaskGraph run (in seconds)"""
+
+    name: str
+    depends_on: tuple[str, ...]
+    start: float = 0.0
+    end: float = 0.0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[], Any]
+    depends_on: tuple[str, ...] = field(default_factory=tuple)
+
+
+class TaskGraph:
+    """A small DAG executor for command stages.
+
+    Stages are plain callables without arguments. A stage is submitted to the thread-pool
+    as soon as all stages it depends on have finished, so independent stages run in parallel
+    and the wall-clock time approaches the longest path through the graph instead of the sum.
+
+    Example:
+        graph = TaskGraph("deploy")
+        graph.add_stage("datasets", create_datasets)
+        graph.add_stage("raw_dbs", create_raw_dbs)
+        graph.add_stage("groups", create_groups, depends_on=["datasets"])
+        results = graph.run()
+        graph.log_timing_report()
+    """
+
+    # for graphs without 'max_workers', set to 1 while profiling memory ('--profile-memory'),
+    # as the peak of tracemalloc is process-wide and can't be attributed to parallel stages
+    default_max_workers: Optional[int] = None
+
+    def __init__(self, name: str, max_workers: Optional[int] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.stages: dict[str, Stage] = {}
+        self.results: dict[str, Any] = {}
+        self.timings: dict[str, StageTiming] = {}
+        self.wall_time: float = 0.0
+
+    def add_stage(self, name: str, func: Callable[[], Any], depends_on: Optional[list[str]] = None) -> "TaskGraph":
+        if name in self.stages:
+            raise ValueError(f"Stage <{name}> already registered in TaskGraph <{self.name}>")
+        self.stages[name] = Stage(name=name, func=func, depends_on=tuple(depends_on or []))
+
+        # return self for chaining
+        return self
+
+    def validate(self) -> None:
+        """Check that all dependencies are registered and the graph has no cycles"""
+        for stage in self.stages.values():
+            if unknown := [dep for dep in stage.depends_on if dep not in self.stages]:
+                raise ValueError(f"Stage <{stage.name}> depends on unknown stage(s): {unknown}")
+
+        # Kahn's algorithm, only to detect cycles
+        in_degree = {name: len(stage.depends_on) for name, stage in self.stages.items()}
+        ready = [name for name, degree in in_degree.items() if degree == 0]
+        visited = 0
+        while ready:
+            current = ready.pop()
+            visited += 1
+            for stage in self.stages.values():
+                if current in stage.depends_on:
+                    in_degree[stage.name] -= 1
+                    if in_degree[stage.name] == 0:
+                        ready.append(stage.name)
+        if visited != len(self.stages):
+            raise ValueError(f"TaskGraph <{self.name}> contains a dependency cycle")
+
+    def run(self) -> dict[str, Any]:
+        """Run all stages respecting their dependencies.
+        The first failing stage stops scheduling of new stages, waits for the running ones
+        and re-raises its exception.
+
+        Returns:
+            dict[str, Any]: return value of each stage by stage-name
+        """
+        self.validate()
+
+        graph_start = time.perf_counter()
+        finished: set[str] = set()
+        running: dict[Future, str] = {}
+        error: Optional[BaseException] = None
+
+        def is_ready(stage: Stage) -> bool:
+            return stage.name not in finished and all(dep in finished for dep in stage.depends_on)
+
+        def timed(stage: Stage) -> Any:
+            timing = self.timings[stage.name] = StageTiming(name=stage.name, depends_on=stage.depends_on)
+            timing.start = time.perf_counter() - graph_start
+            try:
+                with TRACER.span(f"{self.name}.{stage.name}", depends_on=", ".join(stage.depends_on)):
+                    return stage.func()
+            finally:
+                timing.end = time.perf_counter() - graph_start
+
+        max_workers = self.max_workers or TaskGraph.default_max_workers or max(len(self.stages), 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.name) as executor:
+            pending = dict(self.stages)
+            while pending or running:
+                if error is None:
+                    for stage in [stage for stage in pending.values() if is_ready(stage)]:
+                        # a copy of the context per stage, that its spans are nested below the current span
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, timed, stage)] = stage.name
+                        del pending[stage.name]
+
+                if not running:
+                    # nothing left to wait for (only possible after an error)
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if (exc := future.exception()) is not None:
+                        logging.error(f"Stage <{name}> of <{self.name}> failed: {exc}")
+                        error = error or exc
+                    else:
+                        self.results[name] = future.result()
+                        finished.add(name)
+
+        self.wall_time = time.perf_counter() - graph_start
+
+        if error is not None:
+            raise error
+
+        return self.results
+
+    def log_timing_report(self) -> None:
+        """Log the per-stage timing report, with wall-clock time compared to the sum of all stages"""
+        if not self.timings:
+            return
+
+        name_width = max(len(name) for name in self.timings)
+        total = sum(timing.duration for timing in self.timings.values())
+        logging.info(
+            f"Stage timings for <{self.name}>:\n"
+            + NEWLINE.join(
+                [
+                    f"  {timing.name:<{name_width}} {timing.start:8.3f}s -> {timing.end:8.3f}s "
+                    f"({timing.duration:8.3f}s)"
+                    + (f" after {', '.join(timing.depends_on)}" if timing.depends_on else "")
+                    for timing in sorted(self.timings.values(), key=lambda t: t.start)
+                ]
+            )
+            + f"\n  wall-clock: {self.wall_time:.3f}s (sum of stages: {total:.3f}s)"
+        )
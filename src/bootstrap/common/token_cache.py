@@ -0,0 +1,109 @@
+"""Opt-in encrypted on-disk cache of OAuth access tokens, shared between cli invocations.
+
+Pipelines run several commands in a row (prepare, diagram, deploy, delete), each doing a
+client-credentials exchange with the IdP. With a token cache directory, a still valid token
+of a previous run is reused, until 'token_expiry_leeway_seconds' before it expires.
+
+Entries are keyed by token-url, client-id and scopes, and encrypted (Fernet) with a key
+derived from the client-secret, so only holders of the secret can read them. A rotated
+secret makes old entries unreadable, which is handled as a cache miss.
+
+The cache overrides the SDK's private 'OAuthClientCredentials._refresh_access_token', which is only
+done for the SDK versions in 'INSTRUMENTED_SDK_VERSIONS', like the API metrics.
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from cognite.client.credentials import OAuthClientCredentials
+
+from .api_metrics import INSTRUMENTED_SDK_VERSIONS
+
+
+def get_uncachable_reason() -> Optional[str]:
+    """Why tokens of the installed cognite-sdk can't be cached, None if they can"""
+    from cognite.client import __version__ as sdk_version
+
+    if sdk_version.split(".", 1)[0] not in INSTRUMENTED_SDK_VERSIONS:
+        return f"cognite-sdk {sdk_version} is not one of the supported versions {INSTRUMENTED_SDK_VERSIONS}"
+    refresh_access_token = getattr(OAuthClientCredentials, "_refresh_access_token", None)
+    if refresh_access_token is None or list(inspect.signature(refresh_access_token).parameters) != ["self"]:
+        return f"cognite-sdk {sdk_version} changed 'OAuthClientCredentials._refresh_access_token'"
+    return None
+
+
+class TokenCache:
+    def __init__(self, cache_dir: str | Path, token_url: str, client_id: str, client_secret: str, scopes: list[str]):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.key = hashlib.sha256("\0".join([token_url, client_id, *sorted(scopes)]).encode()).hexdigest()
+        self._client_secret = client_secret
+
+    @property
+    def cache_file(self) -> Path:
+        return self.cache_dir / f"token-{self.key}.bin"
+
+    def _fernet(self):
+        # imported only if the cache is used
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+        key = HKDF(
+            algorithm=hashes.SHA256(), length=32, salt=self.key.encode(), info=b"bootstrap-cli token-cache"
+        ).derive(self._client_secret.encode())
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    def load(self) -> Optional[tuple[str, float]]:
+        """Cached access-token and its expiry timestamp, or None"""
+        from cryptography.fernet import InvalidToken
+
+        try:
+            entry = json.loads(self._fernet().decrypt(self.cache_file.read_bytes()))
+            return entry["access_token"], float(entry["expires_at"])
+        except FileNotFoundError:
+            logging.debug(f"Token cache miss: {self.cache_file}")
+        except (InvalidToken, ValueError, KeyError, TypeError) as e:
+            # other secret, corrupt or incompatible entries are treated as a miss and overwritten later
+            logging.debug(f"Ignoring unreadable token cache entry {self.cache_file}: {e!r}")
+        return None
+
+    def store(self, access_token: str, expires_at: float) -> None:
+        entry = json.dumps({"access_token": access_token, "expires_at": expires_at}).encode()
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # 'NamedTemporaryFile' creates the file with mode 0600
+            # write to a temp-file and rename, so parallel runs never read a partial entry
+            with tempfile.NamedTemporaryFile("wb", dir=self.cache_dir, delete=False, suffix=".tmp") as f:
+                f.write(self._fernet().encrypt(entry))
+            os.replace(f.name, self.cache_file)
+            logging.debug(f"Token cache stored: {self.cache_file}")
+        except OSError as e:
+            # caching is an optimisation only, never fail a command because of it
+            logging.warning(f"Unable to store token cache entry {self.cache_file}: {e}")
+
+
+class CachedOAuthClientCredentials(OAuthClientCredentials):
+    """OAuth client-credentials, reusing valid tokens from a 'TokenCache' before asking the IdP"""
+
+    def __init__(self, *args, token_cache: TokenCache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.token_cache = token_cache
+
+    def _refresh_access_token(self) -> tuple[str, float]:
+        cached = self.token_cache.load()
+        if cached is not None and cached[1] > time.time() + self.token_expiry_leeway_seconds:
+            logging.debug(f"Token cache hit: {self.token_cache.cache_file}")
+            return cached
+
+        access_token, expires_at = super()._refresh_access_token()
+        self.token_cache.store(access_token, expires_at)
+        return access_token, expires_at
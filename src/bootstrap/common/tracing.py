@@ -0,0 +1,240 @@
+"""Nested tracing spans for the phases of a command, without an OpenTelemetry SDK or collector.
+
+Spans are recorded by the process-wide 'TRACER' and can be written after the run
+- as OTLP/JSON ('otel'), the format of the OpenTelemetry collector file exporter,
+  which can be imported into Jaeger, Grafana Tempo, ..
+- as Chrome trace ('chrome'), to be opened in 'chrome://tracing' or https://ui.perfetto.dev
+
+Usage:
+    with TRACER.span("deployed_cache.groups", resource_type="groups"):
+        ...
+
+    @traced()
+    def generate_groups(self):
+        ...
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import ReprEnum  # new in 3.11
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol, TypeVar
+
+from .. import __version__
+
+SERVICE_NAME = "bootstrap-cli"
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class TraceFormat(str, ReprEnum):
+    otel = "otel"
+    chrome = "chrome"
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    # wall-clock start for the exports, durations are measured with 'perf_counter_ns'
+    start_unix_ns: int
+    start_perf_ns: int
+    end_perf_ns: Optional[int] = None
+    thread_id: int = field(default_factory=threading.get_native_id)
+    thread_name: str = field(default_factory=lambda: threading.current_thread().name)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_perf_ns or time.perf_counter_ns()) - self.start_perf_ns
+
+    @property
+    def end_unix_ns(self) -> int:
+        return self.start_unix_ns + self.duration_ns
+
+    def set(self, **attributes: Any) -> "Span":
+        self.attributes.update(attributes)
+        return self
+
+
+class SpanListener(Protocol):
+    def span_started(self, span: Span) -> None:
+        ...
+
+    def span_ended(self, span: Span) -> None:
+        ...
+
+
+def otel_value(value: Any) -> dict[str, Any]:
+    """OTLP/JSON 'AnyValue' of an attribute"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # int64 are strings in OTLP/JSON
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    """Thread-safe recorder of nested spans.
+
+    The parent of a new span is the current span of its context ('contextvars'),
+    threads started through 'TaskGraph' inherit the context of the submitting thread.
+    """
+
+    def __init__(self, recording: bool = True) -> None:
+        self._lock = threading.Lock()
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+        # keep the finished spans for 'write()', else spans are only passed to the listeners
+        self.recording = recording
+        self.spans: list[Span] = []
+        self.trace_id = os.urandom(16).hex()
+        # notified in the thread of the span, like the profiler measuring memory per phase
+        self.listeners: list[SpanListener] = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = []
+            self.trace_id = os.urandom(16).hex()
+
+    def current_span(self) -> Optional[Span]:
+        return self._current.get()
+
+    def set_attributes(self, **attributes: Any) -> None:
+        """Adds attributes to the current span, if any"""
+        if span := self.current_span():
+            span.set(**attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        parent = self.current_span()
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_unix_ns=time.time_ns(),
+            start_perf_ns=time.perf_counter_ns(),
+            attributes=attributes,
+        )
+        if self.recording:
+            with self._lock:
+                self.spans.append(span)
+        token = self._current.set(span)
+        for listener in self.listeners:
+            listener.span_started(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_perf_ns = time.perf_counter_ns()
+            self._current.reset(token)
+            for listener in self.listeners:
+                listener.span_ended(span)
+
+    def to_otel(self) -> dict[str, Any]:
+        """OTLP/JSON 'TracesData' with all finished and running spans"""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": otel_value(SERVICE_NAME)},
+                            {"key": "service.version", "value": otel_value(__version__)},
+                            {"key": "process.pid", "value": otel_value(os.getpid())},
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": SERVICE_NAME, "version": __version__},
+                            "spans": [
+                                {
+                                    "traceId": span.trace_id,
+                                    "spanId": span.span_id,
+                                    **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                                    "name": span.name,
+                                    # SPAN_KIND_INTERNAL
+                                    "kind": 1,
+                                    "startTimeUnixNano": str(span.start_unix_ns),
+                                    "endTimeUnixNano": str(span.end_unix_ns),
+                                    "attributes": [
+                                        {"key": key, "value": otel_value(value)}
+                                        for key, value in {**span.attributes, "thread.name": span.thread_name}.items()
+                                    ],
+                                    # STATUS_CODE_OK, STATUS_CODE_ERROR
+                                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def to_chrome(self) -> dict[str, Any]:
+        """Chrome 'Trace Event Format' with one complete event ('X') per span"""
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        thread_names = {span.thread_id: span.thread_name for span in spans}
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                for tid, thread_name in thread_names.items()
+            ]
+            + [
+                {
+                    "name": span.name,
+                    "cat": SERVICE_NAME,
+                    "ph": "X",
+                    # microseconds
+                    "ts": span.start_unix_ns / 1000,
+                    "dur": span.duration_ns / 1000,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                    "args": {**span.attributes, **({"error": span.error} if span.error else {})},
+                }
+                for span in spans
+            ],
+        }
+
+    def write(self, path: str | Path, trace_format: TraceFormat = TraceFormat.otel) -> None:
+        trace = self.to_chrome() if trace_format == TraceFormat.chrome else self.to_otel()
+        Path(path).write_text(json.dumps(trace, default=str) + "\n")
+
+
+# shared by all commands of this process, only recording with '--trace'
+TRACER = Tracer(recording=False)
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable[[F], F]:
+    """Decorator to run a function in a span, named by its qualified name by default"""
+
+    def decorator(func: F) -> F:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(span_name, **attributes):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
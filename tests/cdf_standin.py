@@ -0,0 +1,397 @@
+"""Local stand-in for the CDF API, to run and benchmark commands without a CDF project.
+
+Serves the OAuth token endpoint and the endpoints bootstrap-cli uses from an in-memory store:
+- groups: list, create, delete
+- datasets: list, create, update, retrieve
+- RAW databases: list, create, delete
+- data-model spaces: list, apply, delete
+
+List endpoints are paginated with cursors like CDF. To benchmark under realistic conditions
+it can add latency to each request, limit the request rate (answering '429 Too Many Requests')
+and inject errors, either randomly or for the next calls of an endpoint.
+
+Usage:
+    with CdfStandin(project="shiny-prod", latency_s=0.05, rate_limit=20) as cdf:
+        os.environ.update(cdf.envs())
+        cdf.inject_error("POST /groups", status=503)
+        ...
+"""
+import gzip
+import itertools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl
+
+# resource-type : list endpoint below '/api/v1/projects/{project}'
+LIST_ENDPOINTS = {
+    "groups": ("GET", "/groups"),
+    "datasets": ("POST", "/datasets/list"),
+    "raw_dbs": ("GET", "/raw/dbs"),
+    "spaces": ("GET", "/models/spaces"),
+}
+# resource-type : key of its items in the store
+ITEM_KEYS = {"groups": "id", "datasets": "id", "raw_dbs": "name", "spaces": "space"}
+# like CDF, if a request has no 'limit'
+DEFAULT_LIMIT = 25
+
+Handler = Callable[[dict], tuple[int, dict]]
+
+
+def error(status: int, message: str, **details: Any) -> tuple[int, dict]:
+    """CDF API error response, like '{"error": {"code": 400, "message": "..", "missing": [..]}}'"""
+    return status, {"error": {"code": status, "message": message, **details}}
+
+
+@dataclass
+class InjectedError:
+    # like 'POST /groups', or '*' for all endpoints
+    endpoint: str
+    status: int
+    times: int
+    # CDF marks some errors as retryable, which the SDK retries for all endpoints
+    auto_retryable: bool = False
+
+
+class TokenBucket:
+    """Allows 'rate' requests per second on average, with bursts of up to 'burst' requests"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class CdfStandin:
+    def __init__(
+        self,
+        project: str = "shiny-prod",
+        resources: Optional[dict[str, list[dict[str, Any]]]] = None,
+        latency_s: float = 0.0,
+        page_size: int = 1000,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            resources: initial items by resource-type, in CDF API (camelCase) format
+            latency_s: added to each request, which are served concurrently
+            page_size: max items per page of list endpoints, independent of the requested 'limit'
+            rate_limit: max requests per second (with 'burst'), above that requests are answered with 429
+            error_rate: share of API requests answered with a retryable 'error_status' (reproducible with 'seed')
+        """
+        self.project = project
+        # resource-type : items in CDF API (camelCase) format
+        self.resources: dict[str, list[dict[str, Any]]] = {name: [] for name in LIST_ENDPOINTS}
+        self.resources.update({name: list(items) for name, items in (resources or {}).items()})
+        self.latency_s = latency_s
+        self.page_size = page_size
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self.injected_errors: list[InjectedError] = []
+        # (method, path) of each handled request, in order
+        self.requests: list[tuple[str, str]] = []
+        # responses by status-code, like '{200: 12, 429: 3}'
+        self.responses: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._group_ids = itertools.count(max((item["id"] for item in self.resources["groups"]), default=0) + 1)
+        self._dataset_ids = itertools.count(max((item["id"] for item in self.resources["datasets"]), default=0) + 1)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        assert self._server, "CdfStandin is not started"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def envs(self) -> dict[str, str]:
+        """Environment variables to point the 'cognite' section of a config to this stand-in"""
+        return {
+            "BOOTSTRAP_CDF_HOST": self.base_url,
+            "BOOTSTRAP_CDF_PROJECT": self.project,
+            "BOOTSTRAP_IDP_TOKEN_URL": f"{self.base_url}/token",
+            "BOOTSTRAP_IDP_SCOPES": f"{self.base_url}/.default",
+            "BOOTSTRAP_IDP_CLIENT_ID": "standin-client-id",
+            "BOOTSTRAP_IDP_CLIENT_SECRET": "standin-client-secret",
+            # oauthlib refuses token-urls w/o https otherwise
+            "OAUTHLIB_INSECURE_TRANSPORT": "1",
+        }
+
+    def start(self) -> "CdfStandin":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="cdf-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "CdfStandin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def names(self, resource_type: str) -> list[str]:
+        """Names of the stored items, like 'cdf.names("groups")'"""
+        key = "space" if resource_type == "spaces" else "name"
+        with self._lock:
+            return [item[key] for item in self.resources[resource_type]]
+
+    def inject_error(self, endpoint: str = "*", status: int = 503, times: int = 1, auto_retryable: bool = False):
+        """Answers the next 'times' requests to 'endpoint' (like 'POST /groups') with an error 'status'"""
+        with self._lock:
+            self.injected_errors.append(InjectedError(endpoint, status, times, auto_retryable))
+
+    #
+    # routing
+    #
+    def route(self, method: str, path: str) -> Optional[Handler]:
+        """Handler of a request, getting the json body (or GET query parameters), returning status and payload"""
+        if method == "POST" and path == "/token":
+            return lambda body: (200, {"access_token": "standin-token", "token_type": "Bearer", "expires_in": 3600})
+
+        match = re.fullmatch(rf"/api/v1/projects/{re.escape(self.project)}(?P<endpoint>/.*)", path)
+        if not match:
+            return None
+        endpoint = f"{method} {match.group('endpoint')}"
+        handler = {
+            "GET /groups": lambda body: self.list_items("groups", body, paginated=False),
+            "POST /groups": self.create_groups,
+            "POST /groups/delete": lambda body: self.delete_items("groups", body["items"]),
+            "POST /datasets/list": lambda body: self.list_items("datasets", body),
+            "POST /datasets": self.create_datasets,
+            "POST /datasets/update": self.update_datasets,
+            "POST /datasets/byids": self.retrieve_datasets,
+            "GET /raw/dbs": lambda body: self.list_items("raw_dbs", body),
+            "POST /raw/dbs": self.create_raw_dbs,
+            "POST /raw/dbs/delete": lambda body: self.delete_items("raw_dbs", [i["name"] for i in body["items"]]),
+            "GET /models/spaces": lambda body: self.list_items("spaces", body),
+            "POST /models/spaces": self.apply_spaces,
+            "POST /models/spaces/delete": self.delete_spaces,
+        }.get(endpoint)
+        if handler is None:
+            return None
+        return lambda body: self.admit(endpoint) or handler(body)
+
+    def admit(self, endpoint: str) -> Optional[tuple[int, dict]]:
+        """Error response for requests which are rate-limited or have an error injected, else None"""
+        with self._lock:
+            for injected in self.injected_errors:
+                if injected.endpoint in ("*", endpoint):
+                    injected.times -= 1
+                    if injected.times <= 0:
+                        self.injected_errors.remove(injected)
+                    return error(injected.status, "Injected error", isAutoRetryable=injected.auto_retryable)
+            random_error = self.error_rate and self._random.random() < self.error_rate
+        if self.rate_limiter and not self.rate_limiter.acquire():
+            return error(429, "Too many requests")
+        if random_error:
+            # transient errors, which the SDK retries
+            return error(self.error_status, "Injected error", isAutoRetryable=True)
+        return None
+
+    #
+    # endpoints
+    #
+    def list_items(self, resource_type: str, body: dict, paginated: bool = True) -> tuple[int, dict]:
+        with self._lock:
+            items = list(self.resources[resource_type])
+        if not paginated:
+            return 200, {"items": items}
+        # cursors are the offset of the next page
+        offset = int(body.get("cursor") or 0)
+        limit = min(int(body.get("limit") or DEFAULT_LIMIT), self.page_size)
+        page = {"items": items[offset : offset + limit]}
+        if offset + limit < len(items):
+            page["nextCursor"] = str(offset + limit)
+        return 200, page
+
+    def delete_items(self, resource_type: str, keys: list) -> tuple[int, dict]:
+        key = ITEM_KEYS[resource_type]
+        with self._lock:
+            existing = {item[key] for item in self.resources[resource_type]}
+            if missing := [k for k in keys if k not in existing]:
+                return error(400, f"Not found: {resource_type}", missing=[{key: k} for k in missing])
+            delete_keys = set(keys)
+            self.resources[resource_type] = [i for i in self.resources[resource_type] if i[key] not in delete_keys]
+        return 200, {}
+
+    def create_groups(self, body: dict) -> tuple[int, dict]:
+        with self._lock:
+            # CDF allows groups with the same name
+            created = [{"id": next(self._group_ids), "metadata": {}, **item} for item in body["items"]]
+            self.resources["groups"].extend(created)
+        return 200, {"items": created}
+
+    def create_datasets(self, body: dict) -> tuple[int, dict]:
+        now = int(time.time() * 1000)
+        with self._lock:
+            existing = {item.get("externalId") for item in self.resources["datasets"]} - {None}
+            if duplicated := [item["externalId"] for item in body["items"] if item.get("externalId") in existing]:
+                return error(409, "Duplicated external ids", duplicated=[{"externalId": x} for x in duplicated])
+            created = [
+                {"metadata": {}, "writeProtected": False, **item, "id": next(self._dataset_ids)}
+                | {"createdTime": now, "lastUpdatedTime": now}
+                for item in body["items"]
+            ]
+            self.resources["datasets"].extend(created)
+        return 200, {"items": created}
+
+    def find_datasets(self, identifiers: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Stored datasets by '{"id": ..}' or '{"externalId": ..}', and the missing identifiers"""
+        by_id = {item["id"]: item for item in self.resources["datasets"]}
+        by_external_id = {item["externalId"]: item for item in self.resources["datasets"] if item.get("externalId")}
+        found, missing = [], []
+        for identifier in identifiers:
+            item = by_id.get(identifier["id"]) if "id" in identifier else by_external_id.get(identifier["externalId"])
+            (found if item else missing).append(item or identifier)
+        return found, missing
+
+    def retrieve_datasets(self, body: dict) -> tuple[int, dict]:
+        with self._lock:
+            found, missing = self.find_datasets(body["items"])
+        if missing and not body.get("ignoreUnknownIds"):
+            return error(400, "Ids not found", missing=missing)
+        return 200, {"items": found}
+
+    def update_datasets(self, body: dict) -> tuple[int, dict]:
+        now = int(time.time() * 1000)
+        with self._lock:
+            found, missing = self.find_datasets(body["items"])
+            if missing:
+                return error(400, "Ids not found", missing=missing)
+            for item, change in zip(found, body["items"]):
+                for field_name, update in change["update"].items():
+                    if "set" in update:
+                        item[field_name] = update["set"]
+                    elif update.get("setNull"):
+                        item.pop(field_name, None)
+                    else:
+                        # 'add' and 'remove' of metadata keys
+                        metadata = item.setdefault(field_name, {})
+                        metadata.update(update.get("add", {}))
+                        for metadata_key in update.get("remove", []):
+                            metadata.pop(metadata_key, None)
+                item["lastUpdatedTime"] = now
+            updated = [dict(item) for item in found]
+        return 200, {"items": updated}
+
+    def create_raw_dbs(self, body: dict) -> tuple[int, dict]:
+        with self._lock:
+            existing = {item["name"] for item in self.resources["raw_dbs"]}
+            if duplicated := [item["name"] for item in body["items"] if item["name"] in existing]:
+                return error(400, "Databases already created", duplicated=[{"name": x} for x in duplicated])
+            created = [{"name": item["name"]} for item in body["items"]]
+            self.resources["raw_dbs"].extend(created)
+        return 200, {"items": created}
+
+    def apply_spaces(self, body: dict) -> tuple[int, dict]:
+        now = int(time.time() * 1000)
+        with self._lock:
+            spaces = {item["space"]: item for item in self.resources["spaces"]}
+            applied = []
+            for item in body["items"]:
+                created_time = spaces.get(item["space"], {}).get("createdTime", now)
+                # upsert, like CDF
+                spaces[item["space"]] = {
+                    **item,
+                    "isGlobal": False,
+                    "createdTime": created_time,
+                    "lastUpdatedTime": now,
+                }
+                applied.append(spaces[item["space"]])
+            self.resources["spaces"] = list(spaces.values())
+        return 200, {"items": applied}
+
+    def delete_spaces(self, body: dict) -> tuple[int, dict]:
+        delete_spaces = {item["space"] for item in body["items"]}
+        with self._lock:
+            # unknown spaces are ignored, the response has the deleted ones
+            deleted = [{"space": i["space"]} for i in self.resources["spaces"] if i["space"] in delete_spaces]
+            self.resources["spaces"] = [i for i in self.resources["spaces"] if i["space"] not in delete_spaces]
+        return 200, {"items": deleted}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        standin = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            # keep-alive, like the CDF API, that connection pooling of the client is effective
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, don't delay the body waiting for an ACK
+            disable_nagle_algorithm = True
+
+            def _handle(self, method: str):
+                path, _, query = self.path.partition("?")
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                if self.headers.get("Content-Encoding") == "gzip":
+                    # the SDK compresses the bodies of POST requests
+                    raw_body = gzip.decompress(raw_body)
+                with standin._lock:
+                    standin.requests.append((method, path))
+
+                handler = standin.route(method, path)
+                if handler is None:
+                    status, payload = error(404, f"Not found: {method} {path}")
+                else:
+                    if standin.latency_s:
+                        time.sleep(standin.latency_s)
+                    try:
+                        # GET parameters are the POST body of CDF list endpoints
+                        body = json.loads(raw_body) if raw_body.startswith(b"{") else dict(parse_qsl(query))
+                    except ValueError:
+                        body = {}
+                    try:
+                        status, payload = handler(body)
+                    except (KeyError, TypeError) as e:
+                        status, payload = error(400, f"Invalid request body: {e!r}")
+
+                with standin._lock:
+                    standin.responses[status] += 1
+                content = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug(f"cdf-standin: {format % args}")
+
+        return RequestHandler
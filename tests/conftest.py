@@ -0,0 +1,61 @@
+"""
+Fixtures of the tests running commands with a real CogniteClient against the local CDF stand-in.
+"""
+import logging
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from benchmarks.synthetic_config import write_config
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.deploy import CommandDeploy
+from tests.cdf_standin import CdfStandin
+
+CDF_PROJECT = "standin"
+
+
+@pytest.fixture
+def cdf(monkeypatch: pytest.MonkeyPatch):
+    """Running stand-in, with the environment variables of the synthetic configs pointing to it"""
+    with CdfStandin(project=CDF_PROJECT) as cdf:
+        for name, value in cdf.envs().items():
+            monkeypatch.setenv(name, value)
+        # the commands log each resource, not needed here
+        logging.disable(logging.INFO)
+        yield cdf
+        logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def config_factory(tmp_path: Path) -> Callable[..., Path]:
+    """Writes a synthetic config for the stand-in project, with all groups created (not only the mapped ones)"""
+
+    def write(nodes: int = 4, nodes_per_namespace: int = 2, name: str = "config.yml") -> Path:
+        return write_config(
+            tmp_path / name, nodes, nodes_per_namespace, cdf_project=CDF_PROJECT, only_mapped_groups=False
+        )
+
+    return write
+
+
+@pytest.fixture
+def config_path(config_factory: Callable[..., Path]) -> Path:
+    """Synthetic config of 4 nodes in 2 namespaces"""
+    return config_factory()
+
+
+@pytest.fixture
+def deploy() -> Callable[[Path], None]:
+    """Validates and deploys a config, like the cli does"""
+
+    def run(config_path: Path) -> None:
+        (
+            CommandDeploy(str(config_path), command=CommandMode.DEPLOY, debug=False)
+            .validate_config_length_limits()
+            .validate_config_shared_access()
+            .validate_config_is_cdf_project_in_mappings()
+            .command(with_raw_capability=True)
+        )
+
+    return run
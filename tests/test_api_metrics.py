@@ -0,0 +1,98 @@
+import cognite.client
+import pytest
+
+from bootstrap.common.api_metrics import (
+    API_METRICS,
+    get_endpoint,
+    get_uninstrumentable_reason,
+    percentile,
+)
+from bootstrap.common.cognite_client import CogniteConfig, get_cognite_client
+from tests.cdf_standin import CdfStandin
+
+GROUPS = [{"id": 1, "name": "cdf:src:001:sap:owner", "sourceId": "", "capabilities": []}]
+
+
+def get_client(cdf: CdfStandin, monkeypatch: pytest.MonkeyPatch):
+    envs = cdf.envs()
+    monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", envs["OAUTHLIB_INSECURE_TRANSPORT"])
+    return get_cognite_client(
+        CogniteConfig(
+            host=envs["BOOTSTRAP_CDF_HOST"],
+            project=envs["BOOTSTRAP_CDF_PROJECT"],
+            idp_authentication={
+                "client_id": envs["BOOTSTRAP_IDP_CLIENT_ID"],
+                "secret": envs["BOOTSTRAP_IDP_CLIENT_SECRET"],
+                "scopes": [envs["BOOTSTRAP_IDP_SCOPES"]],
+                "token_url": envs["BOOTSTRAP_IDP_TOKEN_URL"],
+            },
+        )
+    )
+
+
+def test_endpoint_templates_and_percentiles():
+    assert get_endpoint("get", "https://api.cognitedata.com/api/v1/projects/shiny-dev/groups") == "GET /groups"
+    assert (
+        get_endpoint("POST", "http://127.0.0.1:8080/api/v1/projects/shiny-dev/raw/dbs/src:001:sap/tables/t1/rows")
+        == "POST /raw/dbs/{db}/tables/{table}/rows"
+    )
+    assert get_endpoint("GET", "https://h/api/v1/projects/p/datasets/123?x=1") == "GET /datasets/{id}"
+    assert get_endpoint("POST", "https://h/api/v1/projects/p/raw/dbs/delete") == "POST /raw/dbs/delete"
+
+    latencies = [float(i) for i in range(1, 101)]
+    assert (percentile(latencies, 50), percentile(latencies, 90), percentile(latencies, 99)) == (50, 90, 99)
+    assert percentile([], 50) == 0.0
+
+
+def test_sdk_internals_are_instrumentable():
+    # fails if an update of cognite-sdk changed the private methods which are wrapped
+    assert get_uninstrumentable_reason() is None
+
+
+def test_api_metrics_record_calls_items_and_bytes(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(API_METRICS, "count_items", True)
+    with CdfStandin(resources={"groups": GROUPS}) as cdf:
+        client = get_client(cdf, monkeypatch)
+        API_METRICS.reset()
+        client.iam.groups.list(all=True)
+        client.raw.databases.list(limit=None)
+
+    assert API_METRICS.calls() == 2
+    groups = API_METRICS.summary()["GET /groups"]
+    assert (groups["calls"], groups["items"], groups["retries"], groups["throttled"]) == (1, 1, 0, 0)
+    assert groups["response_bytes"] > 0 and groups["latency_s"]["p50"] > 0
+    assert API_METRICS.calls("GET /raw/dbs") == 1
+    assert "GET /groups" in API_METRICS.format_summary()
+
+
+def test_api_metrics_count_retries_of_throttled_calls(monkeypatch: pytest.MonkeyPatch):
+    with CdfStandin() as cdf:
+        client = get_client(cdf, monkeypatch)
+        cdf.inject_error("GET /groups", status=429)
+        API_METRICS.reset()
+        client.iam.groups.list(all=True)
+
+    groups = API_METRICS.summary()["GET /groups"]
+    assert (groups["calls"], groups["attempts"], groups["retries"], groups["throttled"]) == (1, 2, 1, 1)
+    assert groups["errors"] == 0
+
+
+def test_api_metrics_count_items_only_on_request(monkeypatch: pytest.MonkeyPatch):
+    with CdfStandin(resources={"groups": GROUPS}) as cdf:
+        client = get_client(cdf, monkeypatch)
+        API_METRICS.reset()
+        client.iam.groups.list(all=True)
+
+    groups = API_METRICS.summary()["GET /groups"]
+    assert (groups["calls"], groups["items"]) == (1, 0) and groups["response_bytes"] > 0
+
+
+def test_unknown_sdk_version_is_not_instrumented(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture):
+    monkeypatch.setattr(cognite.client, "__version__", "8.0.0")
+    with CdfStandin(resources={"groups": GROUPS}) as cdf:
+        client = get_client(cdf, monkeypatch)
+        API_METRICS.reset()
+        client.iam.groups.list(all=True)
+
+    assert not API_METRICS.calls()
+    assert "CDF API calls are not recorded: cognite-sdk 8.0.0" in caplog.text
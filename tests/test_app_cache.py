@@ -0,0 +1,17 @@
+from cognite.client.data_classes import DataSet, DataSetList
+
+from bootstrap.app_cache import CogniteResourceCache
+
+
+def test_ids_by_name_follow_cache_changes():
+    cache = CogniteResourceCache(
+        RESOURCE=DataSet, resources=DataSetList([DataSet(id=1, name="src:001:sap:dataset"), DataSet(id=2, name="dup")])
+    )
+    assert cache.get_ids_by_name() == {"src:001:sap:dataset": [1], "dup": [2]}
+
+    cache.create(resources=DataSet(id=3, name="dup"))
+    assert cache.get_ids_by_name()["dup"] == [2, 3]
+
+    cache.update(resources=DataSet(id=1, name="_DEPR_src:001:sap:dataset"))
+    cache.delete(resources=DataSet(id=2, name="dup"))
+    assert cache.get_ids_by_name() == {"dup": [3], "_DEPR_src:001:sap:dataset": [1]}
@@ -0,0 +1,48 @@
+import os
+from pathlib import Path
+
+from bootstrap.app_config import CommandMode
+from bootstrap.app_config_cache import (
+    ConfigCache,
+    ConfigCacheEntry,
+    without_sensitive_keys,
+)
+from bootstrap.app_container import ContainerSelector, init_container
+from tests.constants import ROOT_DIRECTORY
+
+EXAMPLE_CONFIG = ROOT_DIRECTORY / "example/config-deploy-example-01.0.yml"
+EXAMPLE_DOTENV = ROOT_DIRECTORY / "example/.env_mock"
+
+
+def test_config_cache_hit_skips_validation_and_keeps_secrets_out(tmp_path: Path):
+    ContainerCls = ContainerSelector[CommandMode.DIAGRAM]
+
+    # 1st run: miss, the command stores the entry
+    config_cache = ConfigCache(cache_dir=tmp_path, config_path=EXAMPLE_CONFIG)
+    container = init_container(ContainerCls, EXAMPLE_CONFIG, EXAMPLE_DOTENV, config_cache=config_cache)
+    assert config_cache.entry is None
+    config_cache.store(
+        ConfigCacheEntry(config=without_sensitive_keys(container.config()), bootstrap=container.bootstrap())
+    )
+
+    # 2nd run: hit, 'bootstrap' comes from the cache
+    config_cache = ConfigCache(cache_dir=tmp_path, config_path=EXAMPLE_CONFIG)
+    container = init_container(ContainerCls, EXAMPLE_CONFIG, EXAMPLE_DOTENV, config_cache=config_cache)
+    assert config_cache.entry is not None
+    assert container.bootstrap() == config_cache.entry.bootstrap
+    # 'cognite.project' is kept for 'diagram', but the IdP secret is never written to disk
+    assert container.config()["cognite"]["project"] == "shiny-prod"
+    assert b"very314159265359314159265359secret" not in config_cache.cache_file.read_bytes()
+
+
+def test_config_cache_key_depends_on_used_envvars(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("BOOTSTRAP_CDF_PROJECT", "shiny-dev")
+    key_dev = ConfigCache(cache_dir=tmp_path, config_path=EXAMPLE_CONFIG).key
+
+    monkeypatch.setenv("BOOTSTRAP_CDF_PROJECT", "shiny-prod")
+    key_prod = ConfigCache(cache_dir=tmp_path, config_path=EXAMPLE_CONFIG).key
+
+    # not referenced in the config
+    monkeypatch.setenv("SOME_UNRELATED_ENVVAR", os.urandom(4).hex())
+    assert ConfigCache(cache_dir=tmp_path, config_path=EXAMPLE_CONFIG).key == key_prod
+    assert key_dev != key_prod
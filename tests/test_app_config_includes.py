@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from bootstrap.app_config import CommandMode, Namespace, NamespaceFragment
+from bootstrap.app_config_cache import ConfigCache, ConfigCacheEntry
+from bootstrap.app_config_includes import merge_namespaces
+from bootstrap.app_container import ContainerSelector, init_container
+from bootstrap.app_exceptions import BootstrapConfigError
+
+MAIN_CONFIG = """
+bootstrap:
+  includes:
+    - teams
+  namespaces:
+    - ns-name: src
+      description: Customer source systems
+      ns-nodes:
+        - node-name: src:001:sap
+          description: Sources 001; from SAP
+"""
+
+TEAM_A_FRAGMENT = """
+namespaces:
+  - ns-name: src
+    description: ignored, already described in the main config
+    ns-nodes:
+      - node-name: src:002:weather
+        description: Sources 002; from Weather.com
+"""
+
+TEAM_B_FRAGMENT = """
+namespaces:
+  - ns-name: uc
+    description: Use cases
+    ns-nodes:
+      - node-name: uc:001:demand
+        description: Use case 001; ${BOOTSTRAP_UC_DESCRIPTION:demand forecast}
+        shared-access:
+          read:
+            - node-name: src:002:weather
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    (tmp_path / "teams").mkdir()
+    (tmp_path / "teams/a.yml").write_text(TEAM_A_FRAGMENT)
+    (tmp_path / "teams/b.yaml").write_text(TEAM_B_FRAGMENT)
+    config_path = tmp_path / "config.yml"
+    config_path.write_text(MAIN_CONFIG)
+    return config_path
+
+
+def test_includes_are_merged_into_namespaces(config_path: Path):
+    container = init_container(ContainerSelector[CommandMode.DIAGRAM], config_path)
+    namespaces = {ns.ns_name: ns for ns in container.bootstrap().namespaces}
+
+    assert list(namespaces) == ["src", "uc"]
+    assert namespaces["src"].description == "Customer source systems"
+    assert [node.node_name for node in namespaces["src"].ns_nodes] == ["src:001:sap", "src:002:weather"]
+    # envvar interpolation like in the main config
+    assert namespaces["uc"].ns_nodes[0].description == "Use case 001; demand forecast"
+
+
+def test_includes_reject_duplicate_node_names(config_path: Path):
+    (config_path.parent / "teams/c.yml").write_text(TEAM_A_FRAGMENT)
+    with pytest.raises(BootstrapConfigError, match="src:002:weather"):
+        init_container(ContainerSelector[CommandMode.DIAGRAM], config_path)
+
+
+def test_merged_namespaces_are_validated(tmp_path: Path):
+    main = [Namespace(ns_name="src", description=None, ns_nodes=[])]
+    # like an outdated fragment from the cache, never validated against the current model
+    fragment = [Namespace.model_construct(ns_name="src", description=["not", "a", "string"], ns_nodes=[])]
+
+    with pytest.raises(ValidationError, match="description"):
+        merge_namespaces([(tmp_path / "config.yml", main), (tmp_path / "teams/a.yml", fragment)])
+
+
+def test_includes_only_revalidate_changed_fragments(config_path: Path, tmp_path: Path, monkeypatch):
+    validated_fragments = []
+    model_validate = NamespaceFragment.model_validate
+
+    def spy_model_validate(obj, *args, **kwargs):
+        validated_fragments.extend(ns["ns-name"] for ns in obj["namespaces"])
+        return model_validate(obj, *args, **kwargs)
+
+    monkeypatch.setattr(NamespaceFragment, "model_validate", spy_model_validate)
+    cache_dir = tmp_path / "cache"
+
+    def load_namespaces():
+        config_cache = ConfigCache(cache_dir=cache_dir, config_path=config_path)
+        container = init_container(ContainerSelector[CommandMode.DIAGRAM], config_path, config_cache=config_cache)
+        if not config_cache.entry:
+            # like the command does after a miss
+            config_cache.store(ConfigCacheEntry(config=container.config(), bootstrap=container.bootstrap()))
+        return config_cache, [node.node_name for ns in container.bootstrap().namespaces for node in ns.ns_nodes]
+
+    load_namespaces()
+    assert validated_fragments == ["src", "uc"]
+
+    # nothing changed: the whole config is a cache hit
+    config_cache, _ = load_namespaces()
+    assert config_cache.entry and validated_fragments == ["src", "uc"]
+
+    # team b changed its fragment: the config is a miss, but only that fragment is validated again
+    validated_fragments.clear()
+    (config_path.parent / "teams/b.yaml").write_text(TEAM_B_FRAGMENT.replace("uc:001:demand", "uc:002:supply"))
+    config_cache, node_names = load_namespaces()
+    assert config_cache.entry is None
+    assert node_names == ["src:001:sap", "src:002:weather", "uc:002:supply"]
+    assert validated_fragments == ["uc"]
@@ -3,7 +3,12 @@ from pathlib import Path
 import pytest
 from rich import print as rprint
 
-from bootstrap.app_config import CommandMode
+from bootstrap.app_config import (
+    BootstrapCoreConfig,
+    CommandMode,
+    IdpCdfMapping,
+    IdpCdfMappingProjects,
+)
 from bootstrap.app_container import (  # PrepareCommandContainer,
     ContainerSelector,
     DeleteCommandContainer,
@@ -11,6 +16,7 @@ from bootstrap.app_container import (  # PrepareCommandContainer,
     DiagramCommandContainer,
     init_container,
 )
+from bootstrap.app_exceptions import BootstrapConfigError
 from tests.constants import ROOT_DIRECTORY
 
 # print(ROOT_DIRECTORY)
@@ -117,3 +123,25 @@ def test_delete_config_03_is_valid(example_file: Path, dotenv_path: Path):
 
     # must be able to instantiate a CogniteClient (even with mocked client/secret)
     assert container.cognite_client().config.project
+
+
+def test_duplicated_idp_cdf_mapping_only_fails_when_looked_up():
+    config = BootstrapCoreConfig(
+        idp_cdf_mappings=[
+            IdpCdfMappingProjects(
+                cdf_project="shiny-dev",
+                mappings=[
+                    IdpCdfMapping(cdf_group="cdf:src:001:sap:owner", idp_source_id="id-1", idp_source_name=None),
+                    IdpCdfMapping(cdf_group="cdf:src:001:sap:owner", idp_source_id="id-2", idp_source_name=None),
+                    IdpCdfMapping(cdf_group="cdf:src:001:sap:read", idp_source_id="id-3", idp_source_name=None),
+                ],
+            )
+        ]
+    )
+
+    mappings_by_group = config.get_idp_cdf_mappings_by_group("shiny-dev")
+    assert mappings_by_group["cdf:src:001:sap:read"].idp_source_id == "id-3"
+    assert mappings_by_group.get("cdf:src:001:sap:other") is None
+    for lookup in (mappings_by_group.get, mappings_by_group.__getitem__):
+        with pytest.raises(BootstrapConfigError, match="more than one mapping for cdf_group cdf:src:001:sap:owner"):
+            lookup("cdf:src:001:sap:owner")
@@ -0,0 +1,53 @@
+import pytest
+from cognite.client.data_classes import DataSet, Group
+from cognite.client.data_classes.data_modeling import SpaceApply
+from cognite.client.exceptions import CogniteAPIError, CogniteDuplicatedError
+
+from tests.cdf_standin import CdfStandin
+from tests.test_api_metrics import get_client
+
+
+def test_standin_serves_the_write_endpoints_of_bootstrap(monkeypatch: pytest.MonkeyPatch):
+    with CdfStandin() as cdf:
+        client = get_client(cdf, monkeypatch)
+
+        group = client.iam.groups.create(Group(name="cdf:src:001:sap:owner", source_id="123", capabilities=[]))
+        assert [g.name for g in client.iam.groups.list(all=True)] == ["cdf:src:001:sap:owner"]
+        client.iam.groups.delete(group.id)
+        assert cdf.names("groups") == []
+
+        created = client.data_sets.create([DataSet(external_id=f"ds:{i}", name=f"ds:{i}") for i in range(12)])
+        dataset = client.data_sets.retrieve(id=created[0].id)
+        dataset.name, dataset.metadata = "_DEPR_ds:0", {"archived": True}
+        client.data_sets.update(dataset)
+        assert client.data_sets.retrieve(external_id="ds:0").dump()["metadata"] == {"archived": True}
+        assert len(client.data_sets.list(limit=None)) == 12
+        with pytest.raises(CogniteDuplicatedError):
+            client.data_sets.create(DataSet(external_id="ds:1", name="ds:1"))
+
+        client.raw.databases.create(["src:001:sap:rawdb", "src:001:sap:rawdb:state"])
+        client.raw.databases.delete(["src:001:sap:rawdb:state"], recursive=False)
+        assert [db.name for db in client.raw.databases.list(limit=None)] == ["src:001:sap:rawdb"]
+
+        client.data_modeling.spaces.apply([SpaceApply(space="src-001-sap-space"), SpaceApply(space="other-space")])
+        client.data_modeling.spaces.delete(["other-space"])
+        assert [s.space for s in client.data_modeling.spaces.list(limit=None)] == ["src-001-sap-space"]
+
+
+def test_standin_paginates_limits_rate_and_injects_errors(monkeypatch: pytest.MonkeyPatch):
+    raw_dbs = [{"name": f"db:{i:03d}"} for i in range(25)]
+    with CdfStandin(resources={"raw_dbs": raw_dbs}, page_size=10, rate_limit=1000, burst=1) as cdf:
+        client = get_client(cdf, monkeypatch)
+        assert len(client.raw.databases.list(limit=None)) == 25
+        assert cdf.requests.count(("GET", "/api/v1/projects/shiny-prod/raw/dbs")) >= 3
+
+        cdf.inject_error("POST /raw/dbs", status=500)
+        with pytest.raises(CogniteAPIError) as e:
+            client.raw.databases.create("db:new")
+        assert e.value.code == 500
+        # only the next call fails
+        client.raw.databases.create("db:new")
+        assert "db:new" in cdf.names("raw_dbs")
+
+    # requests above the rate and burst got a 429 (retried by the SDK) or were served
+    assert set(cdf.responses) <= {200, 429, 500}
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.constants import ROOT_DIRECTORY
+
+SRC_DIRECTORY = ROOT_DIRECTORY.parent / "src"
+
+# cold-start budget for 'import bootstrap.__main__', the Cognite SDK alone takes longer than this
+IMPORT_BUDGET_MS = int(os.getenv("BOOTSTRAP_IMPORT_BUDGET_MS", 500))
+
+# runs the cli in a fresh interpreter and reports the loaded heavy modules
+CHECK_LOADED_MODULES = """
+import sys
+from bootstrap.__main__ import bootstrap_cli
+try:
+    bootstrap_cli(sys.argv[1:], standalone_mode=False)
+except SystemExit:
+    pass
+heavy_modules = {name.split(".")[0] for name in sys.modules} & {"cognite", "pandas"}
+print("loaded-modules:" + ",".join(sorted(heavy_modules)))
+"""
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT_DIRECTORY.parent,
+        env=dict(os.environ, PYTHONPATH=str(SRC_DIRECTORY)),
+    )
+
+
+@pytest.mark.parametrize(
+    "cli_args",
+    [
+        ["--help"],
+        ["diagram", "--help"],
+        [
+            "--dotenv-path",
+            str(ROOT_DIRECTORY / "example/.env_mock"),
+            "diagram",
+            str(ROOT_DIRECTORY / "example/config-deploy-example-01.0.yml"),
+        ],
+    ],
+)
+def test_cli_does_not_import_cognite_sdk(cli_args: list[str]):
+    stdout = run_python("-c", CHECK_LOADED_MODULES, *cli_args).stdout
+    assert stdout.splitlines()[-1] == "loaded-modules:"
+
+
+def test_cli_import_time_budget():
+    def import_time_ms() -> float:
+        # last line of '-X importtime' is the top-level module: 'import time: self | cumulative | name'
+        stderr = run_python("-X", "importtime", "-c", "import bootstrap.__main__").stderr
+        line = [line for line in stderr.splitlines() if line.endswith("| bootstrap.__main__")][-1]
+        return int(line.split("|")[1]) / 1000
+
+    # best of three, to be robust against a busy machine
+    best_ms = min(import_time_ms() for _ in range(3))
+    assert best_ms < IMPORT_BUDGET_MS, f"'import bootstrap.__main__' took {best_ms:.0f}ms > {IMPORT_BUDGET_MS}ms"
@@ -0,0 +1,38 @@
+import pytest
+from cognite.client import global_config
+
+from bootstrap.__main__ import get_cognite_settings
+from bootstrap.app_config import CommandMode
+from bootstrap.app_container import ContainerSelector, init_container
+from bootstrap.common.cognite_client import CogniteConfig
+from tests.constants import ROOT_DIRECTORY
+
+
+@pytest.fixture
+def sdk_global_config(monkeypatch: pytest.MonkeyPatch):
+    # restored after the test, the settings are process-wide
+    for name in ("max_workers", "max_retries", "max_retries_connect", "max_retry_backoff", "max_connection_pool_size"):
+        monkeypatch.setattr(global_config, name, getattr(global_config, name))
+    return global_config
+
+
+def test_cli_settings_override_the_cognite_section(sdk_global_config):
+    settings = get_cognite_settings(max_workers=12, timeout=None, max_retries=3, max_connection_pool_size=24)
+    assert settings == {"max-workers": 12, "connection": {"max-retries": 3, "max-connection-pool-size": 24}}
+
+    container = init_container(
+        ContainerSelector[CommandMode.DEPLOY],
+        ROOT_DIRECTORY / "example/config-deploy-example-01.0.yml",
+        ROOT_DIRECTORY / "example/.env_mock",
+        cognite_settings=settings,
+    )
+    cognite_config: CogniteConfig = container.cognite_config()
+    assert (cognite_config.max_workers, cognite_config.timeout) == (12, None)
+    assert cognite_config.connection.max_retries == 3
+
+    client = container.cognite_client()
+    assert client.config.timeout == 30
+    assert (sdk_global_config.max_workers, sdk_global_config.max_retries) == (12, 3)
+    assert sdk_global_config.max_connection_pool_size == 24
+    # unset settings keep the SDK defaults
+    assert sdk_global_config.max_retry_backoff == 30
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from bootstrap.app_config import CommandMode
+from bootstrap.app_exceptions import BootstrapConfigError
+from bootstrap.commands.diagram import CommandDiagram, DiagramDepth
+from tests.constants import ROOT_DIRECTORY
+
+
+@pytest.fixture
+def command() -> CommandDiagram:
+    return CommandDiagram(
+        str(ROOT_DIRECTORY / "example/config-deploy-example-01.4.yml"),
+        command=CommandMode.DIAGRAM,
+        debug=False,
+        dotenv_path=ROOT_DIRECTORY / "example/.env_mock",
+    )
+
+
+def test_diagram_selection_includes_shared_access_nodes(command: CommandDiagram):
+    assert command.get_diagram_selection() is None
+    # 'src:001:sap' has no shared-access
+    assert command.get_diagram_selection(node_names=["src:001:sap"]) == ({"src"}, {"src:001:sap"})
+    # 'src:002:weather' has owner shared-access to 'src:001:sap'
+    assert command.get_diagram_selection(node_names=["src:002:weather"]) == (
+        {"src"},
+        {"src:001:sap", "src:002:weather"},
+    )
+
+    with pytest.raises(BootstrapConfigError, match="src:003:unknown"):
+        command.get_diagram_selection(node_names=["src:003:unknown"])
+
+
+def test_diagram_subtree_and_depth(command: CommandDiagram, tmp_path: Path):
+    output = tmp_path / "diagram.txt"
+
+    command.command(output=str(output), node_names=["src:001:sap"])
+    diagram = output.read_text()
+    assert "cdf:src:001:sap:owner" in diagram and "src:001:sap:dataset__owner__datasets" in diagram
+    assert "cdf:src:002:weather:owner" not in diagram
+
+    command.command(output=str(output), depth=DiagramDepth.node)
+    diagram = output.read_text()
+    assert "cdf:src:002:weather:owner" in diagram
+    # no scope expansion
+    assert "__datasets" not in diagram
+
+
+def test_diagram_all_projects_skips_unchanged_files(command: CommandDiagram, tmp_path: Path):
+    assert command.write_all_projects(tmp_path) == {"shiny-dev": True, "shiny-prod": True}
+    assert (tmp_path / "shiny-dev.mmd").read_text() != (tmp_path / "shiny-prod.mmd").read_text()
+
+    # same diagrams, only the timestamp differs
+    assert command.write_all_projects(tmp_path) == {"shiny-dev": False, "shiny-prod": False}
+
+    (tmp_path / "shiny-dev.mmd").write_text("outdated")
+    assert command.write_all_projects(tmp_path) == {"shiny-dev": True, "shiny-prod": False}
+    assert "cdf:src:001:sap:owner" in (tmp_path / "shiny-dev.mmd").read_text()
@@ -0,0 +1,56 @@
+import io
+import json
+
+from bootstrap.commands.diagram_utils.exporters import (
+    to_json_adjacency,
+    write_dot,
+    write_json,
+)
+from bootstrap.commands.diagram_utils.mermaid import SubroutineNode
+from tests.test_mermaid import create_graph
+
+
+def test_write_dot_nests_subgraphs_as_clusters():
+    graph = create_graph()
+    graph.get_or_create("inner").elements.append(
+        SubroutineNode(id_name='c"quoted"', display="C", comments=["IdP objectId: 123"])
+    )
+
+    stream = io.StringIO()
+    written = write_dot(graph, stream)
+    dot = stream.getvalue()
+
+    assert written == len(dot)
+    assert dot.startswith('digraph "bootstrap" {\n') and dot.endswith("}\n")
+    assert (
+        '  subgraph "cluster_outer" {\n'
+        '    label="outer";\n'
+        "    // node a\n"
+        '    "a" [label="A", shape=box];\n'
+        '    subgraph "cluster_inner" {\n'
+        '      label="inner";\n'
+        '      "b" [label="B", shape=box];\n'
+        "      // IdP objectId: 123\n"
+        '      "c\\"quoted\\"" [label="C", shape=box, peripheries=2];\n'
+        "    }\n"
+        "  }\n"
+    ) in dot
+    assert '  "a" -> "b";\n  "b" -> "a" [style=dashed];\n' in dot
+
+
+def test_write_json_adjacency_with_subgraph_membership():
+    graph = create_graph()
+
+    stream = io.StringIO()
+    written = write_json(graph, stream)
+
+    assert written == len(stream.getvalue())
+    assert json.loads(stream.getvalue()) == to_json_adjacency(graph)
+    assert to_json_adjacency(graph) == {
+        "subgraphs": {"outer": {"label": "outer", "parent": None}, "inner": {"label": "inner", "parent": "outer"}},
+        "nodes": {
+            "a": {"label": "A", "shape": "rect", "subgraph": "outer"},
+            "b": {"label": "B", "shape": "rect", "subgraph": "inner"},
+        },
+        "edges": [["a", "b", "solid"], ["b", "a", "dotted"]],
+    }
@@ -0,0 +1,73 @@
+"""
+'diff' against the local CDF stand-in: a fresh deploy has no drift, changes made in CDF are reported.
+"""
+import json
+from pathlib import Path
+from typing import Callable
+
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.diff import CommandDiff, canonical, freeze
+from bootstrap.common.api_metrics import API_METRICS
+from tests.cdf_standin import CdfStandin
+
+NODE = "ns001:00002:node"
+
+
+def diff(config_path: Path, output: Path) -> dict:
+    CommandDiff(str(config_path), command=CommandMode.DIFF, debug=False).command(output=str(output))
+    return json.loads(output.read_text())
+
+
+def test_canonical_capabilities_ignore_order():
+    deployed = {"rawAcl": {"actions": ["WRITE", "READ"], "scope": {"tableScope": {"dbsToTables": {"b": {}, "a": {}}}}}}
+    target = {
+        "rawAcl": {
+            "scope": {"tableScope": {"dbsToTables": {"a": {"tables": []}, "b": {}}}},
+            "actions": ["READ", "WRITE"],
+        }
+    }
+    assert canonical(deployed) == canonical(target)
+    assert freeze(deployed) == freeze(target)
+    assert canonical({"datasetsAcl": {"scope": {"idScope": {"ids": [2, 1]}}}}) == canonical(
+        {"datasetsAcl": {"scope": {"idScope": {"ids": [1, 2]}}}}
+    )
+
+
+def test_no_drift_after_deploy(cdf: CdfStandin, deploy: Callable[[Path], None], config_path: Path, tmp_path: Path):
+    deploy(config_path)
+    API_METRICS.reset()
+
+    report = diff(config_path, tmp_path / "diff.json")
+
+    assert report["drift"] is False, report
+    # read-only: only the list calls of the deployed cache
+    assert set(API_METRICS.summary()) == {"GET /groups", "POST /datasets/list", "GET /raw/dbs", "GET /models/spaces"}
+
+
+def test_drift_is_reported(cdf: CdfStandin, deploy: Callable[[Path], None], config_path: Path, tmp_path: Path):
+    deploy(config_path)
+    resources = cdf.resources
+    # dataset changed in CDF
+    dataset = next(ds for ds in resources["datasets"] if ds["name"] == f"{NODE}:dataset")
+    dataset["description"] = "changed in Fusion"
+    # RAW DB deleted, an unmanaged and a managed one added
+    resources["raw_dbs"] = [db for db in resources["raw_dbs"] if db["name"] != f"{NODE}:rawdb"]
+    resources["raw_dbs"] += [{"name": "other-team-db"}, {"name": "ns001:00099:node:rawdb"}]
+    # capability removed from a group, and a group deleted
+    group = next(g for g in resources["groups"] if g["name"] == f"cdf:{NODE}:read")
+    removed_capability = group["capabilities"].pop(0)
+    resources["groups"] = [g for g in resources["groups"] if g["name"] != "cdf:allprojects:read"]
+
+    report = diff(config_path, tmp_path / "diff.json")
+
+    assert report["drift"] is True
+    assert report["datasets"]["divergent"] == {
+        f"{NODE}:dataset": {"description": {"expected": "Node 2", "deployed": "changed in Fusion"}}
+    }
+    assert report["raw_dbs"]["missing"] == [f"{NODE}:rawdb"]
+    assert report["raw_dbs"]["extra"] == ["ns001:00099:node:rawdb"]
+    assert report["groups"]["missing"] == ["cdf:allprojects:read"]
+    assert report["groups"]["divergent"][f"cdf:{NODE}:read"]["capabilities"]["missing"] == [
+        canonical(removed_capability)
+    ]
+    assert report["summary"]["spaces"] == {"missing": 0, "extra": 0, "divergent": 0}
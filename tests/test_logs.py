@@ -0,0 +1,128 @@
+import json
+import logging
+
+import pytest
+
+from bootstrap.app_container import init_logging
+from bootstrap.common.logs import (
+    JsonFormatter,
+    Lazy,
+    start_queue_logging,
+    stop_queue_logging,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.lines: list[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("test-logs")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    stop_queue_logging()
+    for handler in list(logger.handlers):
+        if isinstance(handler, ListHandler):
+            logger.removeHandler(handler)
+
+
+def test_lazy_payload_is_only_computed_for_enabled_levels(logger: logging.Logger):
+    handler = ListHandler()
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    calls = []
+
+    def get_names():
+        calls.append(1)
+        return ["a", "b"]
+
+    logger.debug("names: %s", Lazy(get_names))
+    assert not calls
+    logger.info("names: %s", Lazy(get_names))
+    assert calls == [1]
+    assert handler.lines == ["names: ['a', 'b']"]
+
+
+def test_lazy_payload_is_not_computed_for_queued_levels_no_handler_accepts(
+    logger: logging.Logger, monkeypatch: pytest.MonkeyPatch
+):
+    # like the default logging config: 'DEBUG' root logger with 'INFO' handlers only (w/o pytest's capture handlers)
+    monkeypatch.setattr(logger, "handlers", [ListHandler(logging.INFO)])
+    calls = []
+
+    def get_names():
+        calls.append(1)
+        return ["a", "b"]
+
+    start_queue_logging(logger)
+    logger.debug("names: %s", Lazy(get_names))
+    stop_queue_logging()
+    assert not calls
+
+
+def test_json_formatter(logger: logging.Logger):
+    handler = ListHandler()
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+
+    logger.info("created %s groups", 3, extra={"cdf_project": "shiny-dev"})
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    created, failed = (json.loads(line) for line in handler.lines)
+    assert created["message"] == "created 3 groups"
+    assert (created["level"], created["logger"], created["cdf_project"]) == ("INFO", "test-logs", "shiny-dev")
+    assert failed["level"] == "ERROR"
+    assert "ValueError: boom" in failed["exception"]
+
+
+def test_queue_logging_keeps_handler_levels_and_restores_handlers(logger: logging.Logger):
+    console, file = ListHandler(logging.INFO), ListHandler(logging.DEBUG)
+    logger.addHandler(console)
+    logger.addHandler(file)
+
+    start_queue_logging(logger)
+    assert [type(h).__name__ for h in logger.handlers] == ["DeferredQueueHandler"]
+    names = ["a"]
+    logger.debug("debug %s", names)
+    # arguments are resolved when queued
+    names.append("b")
+    logger.info("info")
+    stop_queue_logging()
+
+    # pytest can add its capture handlers too
+    assert [h for h in logger.handlers if isinstance(h, ListHandler)] == [console, file]
+    assert console.lines == ["info"]
+    assert file.lines == ["debug ['a']", "info"]
+
+
+def test_init_logging_with_json_and_queue():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        for handler in handlers:
+            root.removeHandler(handler)
+        resource = init_logging(None, None, log_format="json", log_queue=True)
+        next(resource)
+        assert [type(h).__name__ for h in root.handlers] == ["DeferredQueueHandler"]
+
+        # the container shutdown stops the listener, and the console handler is back
+        with pytest.raises(StopIteration):
+            next(resource)
+        (console,) = root.handlers
+        assert isinstance(console.formatter, JsonFormatter)
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
@@ -0,0 +1,80 @@
+import io
+
+from bootstrap.commands.diagram_utils.mermaid import (
+    MARKDOWN_FOOTER,
+    MARKDOWN_HEADER,
+    DottedEdge,
+    Edge,
+    GraphRegistry,
+    Node,
+)
+
+
+def create_graph() -> GraphRegistry:
+    graph = GraphRegistry(elements=[])
+    outer = graph.get_or_create("outer")
+    inner = graph.get_or_create("inner")
+    graph.elements.append(outer)
+    outer.elements.extend([Node(id_name="a", display="A", comments=["node a"]), inner])
+    inner.elements.append(Node(id_name="b", display="B", comments=[]))
+    graph.edges.extend(
+        [
+            Edge(id_name="a", dest="b", annotation=None, comments=[]),
+            DottedEdge(id_name="b", dest="a", annotation=None, comments=[]),
+        ]
+    )
+    return graph
+
+
+def test_write_mermaid_streams_same_diagram_as_to_mermaid():
+    graph = create_graph()
+
+    stream = io.StringIO()
+    written = graph.write_mermaid(stream)
+    mermaid_code = graph.to_mermaid()
+
+    # ignore the timestamp comment in the 2nd line
+    assert stream.getvalue().splitlines()[2:] == mermaid_code.splitlines()[2:]
+    assert written == len(stream.getvalue())
+    assert 'subgraph "inner" ["inner"]\n  b["B"]\nend' in mermaid_code
+    assert mermaid_code.endswith("a-->b\nb-.->a")
+
+
+def test_write_mermaid_wraps_markdown():
+    stream = io.StringIO()
+    create_graph().write_mermaid(stream, to_markdown=True)
+
+    assert stream.getvalue().startswith(MARKDOWN_HEADER + "graph LR\n")
+    assert stream.getvalue().endswith("b-.->a" + MARKDOWN_FOOTER)
+
+
+def test_subgraph_and_edges_skip_duplicates():
+    graph = GraphRegistry()
+    subgraph = graph.get_or_create("scopes")
+
+    assert subgraph.add(Node(id_name="a", display="A", comments=[]))
+    assert not subgraph.add(Node(id_name="a", display="A again", comments=[]))
+    # elements appended directly are indexed too
+    subgraph.elements.append(Node(id_name="b", display="B", comments=[]))
+    assert "b" in subgraph and subgraph["a"].display == "A"
+
+    assert graph.add_edge(Edge(id_name="a", dest="b", annotation="owner", comments=[]))
+    assert not graph.add_edge(Edge(id_name="a", dest="b", annotation="read", comments=[]))
+    # different link-type between the same nodes
+    assert graph.add_edge(DottedEdge(id_name="a", dest="b", annotation=None, comments=[]))
+    assert len(graph.edges) == 2
+
+
+def test_subgraph_index_follows_replaced_and_removed_elements():
+    subgraph = GraphRegistry().get_or_create("scopes")
+    subgraph.add(Node(id_name="a", display="A", comments=[]), Node(id_name="b", display="B", comments=[]))
+
+    subgraph.elements[0] = Node(id_name="c", display="C", comments=[])
+    assert "a" not in subgraph and subgraph["c"].display == "C"
+
+    # same number of elements as before
+    subgraph.elements.remove(subgraph["b"])
+    assert subgraph.add(Node(id_name="d", display="D", comments=[]))
+    assert "b" not in subgraph and "d" in subgraph
+    assert subgraph.add(Node(id_name="b", display="B again", comments=[]))
+    assert [elem.id_name for elem in subgraph.elements] == ["c", "d", "b"]
@@ -0,0 +1,58 @@
+import pstats
+from pathlib import Path
+from typing import Callable
+
+from bootstrap.common.profiling import CommandProfiler
+from bootstrap.common.task_graph import TaskGraph
+from bootstrap.common.tracing import TRACER
+from tests.cdf_standin import CdfStandin
+
+
+def allocate_in_stage() -> int:
+    return len([str(i) for i in range(100_000)])
+
+
+def test_profile_includes_threads_and_memory_per_phase(tmp_path: Path):
+    profiler = CommandProfiler(tmp_path / "profile", top=5, with_memory=True).start()
+    try:
+        with TRACER.span("phase"):
+            with TRACER.span("sub-phase"):
+                graph = TaskGraph("profiled")
+                graph.add_stage("allocate", allocate_in_stage)
+                graph.run()
+    finally:
+        profiler.stop()
+
+    # the TaskGraph stage ran in a thread of the pool
+    stats = pstats.Stats(str(tmp_path / "profile.prof"))
+    assert any(func == "allocate_in_stage" for _, _, func in stats.stats)
+
+    report = (tmp_path / "profile.txt").read_text()
+    assert "Top 5 hotspots by own time" in report and "Top 5 hotspots by cumulative time" in report
+    phase, sub_phase, stage = profiler.phases
+    assert (phase.name, phase.depth, sub_phase.name, sub_phase.depth) == ("phase", 0, "sub-phase", 1)
+    # the stage of the worker thread is a phase too
+    assert (stage.name, stage.depth) == ("profiled.allocate", 2)
+    # a list of 100k strings is several MiB, and the parent phases include their sub-phases
+    assert stage.peak_bytes > 4 * 1024 * 1024
+    assert phase.peak_bytes >= sub_phase.peak_bytes >= stage.peak_bytes
+    assert "  sub-phase" in report and "    profiled.allocate" in report
+    assert not TRACER.listeners
+
+
+def test_memory_profile_includes_phases_of_deploy_stages(
+    cdf: CdfStandin, deploy: Callable[[Path], None], config_path: Path, tmp_path: Path
+):
+    profiler = CommandProfiler(tmp_path / "profile", with_memory=True).start()
+    try:
+        deploy(config_path)
+    finally:
+        profiler.stop()
+
+    # the stages ran in threads of the TaskGraph, one at a time, nested in the deploy phase
+    phases = {phase.name: phase for phase in profiler.phases}
+    deploy, groups = phases["CommandDeploy.command"], phases["deploy.groups"]
+    assert (deploy.depth, groups.depth, phases["CommandBase.generate_groups"].depth) == (0, 1, 2)
+    assert groups.peak_bytes > 0 and deploy.peak_bytes >= groups.peak_bytes
+    assert "  deploy.groups" in (tmp_path / "profile.txt").read_text()
+    assert TaskGraph.default_max_workers is None
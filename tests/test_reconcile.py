@@ -0,0 +1,166 @@
+"""
+'reconcile' against the local CDF stand-in: a tick only writes the deltas, and picks up configuration changes.
+"""
+import logging
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from benchmarks.synthetic_config import dump_config, generate_config
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.diff import CommandDiff
+from bootstrap.commands.reconcile import CommandReconcile
+from bootstrap.common.api_metrics import API_METRICS
+from bootstrap.common.tracing import TRACER
+from tests.cdf_standin import CdfStandin
+
+NODE = "ns001:00002:node"
+LIST_ENDPOINTS = {"GET /groups", "POST /datasets/list", "GET /raw/dbs", "GET /models/spaces"}
+
+
+def has_drift(config_path: Path, tmp_path: Path) -> bool:
+    return CommandDiff(str(config_path), command=CommandMode.DIFF, debug=False).command(
+        output=str(tmp_path / "diff.json")
+    )
+
+
+def write_config_with_fragment(config_path: Path, cdf_project: str) -> dict[str, Any]:
+    """Config of 5 nodes, with the namespace of the 5th node in the included 'fragment.yml'"""
+    config = generate_config(5, 2, cdf_project=cdf_project, only_mapped_groups=False)
+    *namespaces, included_namespace = config["bootstrap"]["namespaces"]
+    config["bootstrap"].update(namespaces=namespaces, includes=["fragment.yml"])
+    with open(config_path.parent / "fragment.yml", "w") as stream:
+        dump_config({"namespaces": [included_namespace]}, stream)
+    with open(config_path, "w") as stream:
+        dump_config(config, stream)
+    return included_namespace
+
+
+@pytest.fixture
+def reconciler(cdf: CdfStandin, deploy: Callable[[Path], None], config_path: Path) -> CommandReconcile:
+    deploy(config_path)
+    return CommandReconcile(str(config_path), command=CommandMode.RECONCILE, debug=False)
+
+
+def test_converged_project_is_only_listed(reconciler: CommandReconcile):
+    reconciler.command(interval=0, ticks=3)
+
+    # API metrics of the last tick only, which listed the deployed state again
+    assert {endpoint: summary["calls"] for endpoint, summary in API_METRICS.summary().items()} == {
+        endpoint: 1 for endpoint in LIST_ENDPOINTS
+    }
+    # w/o '--trace' the spans are not kept
+    assert not TRACER.spans
+
+
+def test_tick_keeps_spans_of_last_tick_only(reconciler: CommandReconcile, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(TRACER, "recording", True)
+
+    reconciler.command(interval=0, ticks=2)
+    spans_per_tick = len(TRACER.spans)
+    reconciler.command(interval=0, ticks=5)
+
+    assert spans_per_tick and len(TRACER.spans) == spans_per_tick
+
+
+def test_only_deltas_are_applied(
+    cdf: CdfStandin,
+    reconciler: CommandReconcile,
+    config_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(API_METRICS, "count_items", True)
+    resources = cdf.resources
+    dataset = next(ds for ds in resources["datasets"] if ds["name"] == f"{NODE}:dataset")
+    dataset["description"] = "changed in Fusion"
+    resources["raw_dbs"] = [db for db in resources["raw_dbs"] if db["name"] != f"{NODE}:rawdb"]
+    group = next(g for g in resources["groups"] if g["name"] == f"cdf:{NODE}:read")
+    group["capabilities"].pop(0)
+    API_METRICS.reset()
+
+    changes = reconciler.reconcile()
+
+    assert changes == {"raw_dbs": 1, "spaces": 0, "datasets": 1, "groups": 1}
+    assert set(API_METRICS.summary()) == LIST_ENDPOINTS | {
+        "POST /raw/dbs",
+        "POST /datasets/update",
+        "POST /groups",
+        "POST /groups/delete",
+    }
+    assert API_METRICS.summary()["POST /groups"]["items"] == 1
+    assert not has_drift(config_path, tmp_path)
+
+
+def test_changed_config_is_reloaded(
+    reconciler: CommandReconcile, config_factory: Callable[..., Path], config_path: Path, tmp_path: Path
+):
+    # one node more, in a new namespace
+    config_factory(nodes=5)
+
+    changes = reconciler.reconcile()
+
+    # datasets of the node and the namespace, read and owner groups of the node, the namespace and all namespaces
+    assert (changes["datasets"], changes["groups"]) == (2, 2 + 2 + 2)
+    assert not has_drift(config_path, tmp_path)
+    assert reconciler.reconcile() == {"raw_dbs": 0, "spaces": 0, "datasets": 0, "groups": 0}
+
+
+def test_changed_includes_are_hashed_after_reload(
+    cdf: CdfStandin,
+    reconciler: CommandReconcile,
+    config_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    included_namespace = write_config_with_fragment(config_path, cdf.project)
+    reloads = []
+    monkeypatch.setattr(reconciler, "reload_config", lambda r=reconciler.reload_config: reloads.append(r()))
+
+    assert reconciler.reconcile()["groups"] == 2 + 2 + 2
+    assert reconciler.reconcile() == {"raw_dbs": 0, "spaces": 0, "datasets": 0, "groups": 0}
+    assert len(reloads) == 1
+
+    # a change of the included fragment is picked up too
+    included_namespace["description"] = "changed"
+    with open(tmp_path / "fragment.yml", "w") as stream:
+        dump_config({"namespaces": [included_namespace]}, stream)
+    reconciler.reconcile()
+    assert len(reloads) == 2
+
+
+def test_removed_include_is_reloaded(cdf: CdfStandin, reconciler: CommandReconcile, config_path: Path):
+    write_config_with_fragment(config_path, cdf.project)
+    reconciler.reconcile()
+
+    # the include and its fragment are removed: the fragment listed in the loaded configuration is gone
+    config = generate_config(4, 2, cdf_project=cdf.project, only_mapped_groups=False)
+    with open(config_path, "w") as stream:
+        dump_config(config, stream)
+    (config_path.parent / "fragment.yml").unlink()
+
+    # the resources of the 5th node stay in CDF, as 'reconcile' never deletes,
+    # only the read and owner groups of all namespaces lose its scopes
+    assert reconciler.reconcile() == {"raw_dbs": 0, "spaces": 0, "datasets": 0, "groups": 2}
+    assert not reconciler.bootstrap_config.includes
+    assert reconciler.reconcile() == {"raw_dbs": 0, "spaces": 0, "datasets": 0, "groups": 0}
+
+
+def test_invalid_config_pauses_reconcile(
+    reconciler: CommandReconcile, config_path: Path, caplog: pytest.LogCaptureFixture
+):
+    valid_config = config_path.read_text()
+    config_path.write_text(valid_config.replace("idp-cdf-mappings", "idp-cdf-mappingz"))
+    API_METRICS.reset()
+
+    # each tick fails reloading the config, before any CDF call, and the process keeps running
+    reconciler.command(interval=0, ticks=2)
+    assert [r.getMessage() for r in caplog.records if r.levelno == logging.ERROR] == [
+        "Reconcile tick 1 failed",
+        "Reconcile tick 2 failed",
+    ]
+    assert not API_METRICS.summary()
+
+    config_path.write_text(valid_config)
+    assert reconciler.reconcile() == {"raw_dbs": 0, "spaces": 0, "datasets": 0, "groups": 0}
@@ -0,0 +1,202 @@
+"""
+Request budgets of 'deploy' and 'delete', run with a real CogniteClient against the local CDF stand-in.
+
+Each scenario asserts upper bounds for the calls per endpoint and the bytes sent, that regressions
+like per-dataset updates or additional list round-trips show up as failing tests.
+Endpoints missing in a budget must not be called at all.
+"""
+import math
+from pathlib import Path
+from typing import Callable
+
+import pytest
+import yaml
+
+from benchmarks.synthetic_config import COGNITE_SECTION
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.delete import CommandDelete
+from bootstrap.common.api_metrics import API_METRICS
+from tests.cdf_standin import CdfStandin
+
+NODES, NODES_PER_NAMESPACE = 4, 2
+# the node added to and removed from the config
+CHANGED_NODE = "ns002:00004:node"
+
+# the four list calls loading the deployed state, once per run
+LIST_CALLS = {"GET /groups": 1, "POST /datasets/list": 1, "GET /raw/dbs": 1, "GET /models/spaces": 1}
+# SDK chunk size of dataset creates and updates
+DATASETS_PER_REQUEST = 10
+# gzipped 'POST /groups' of a group with its scopes, plus the other requests
+BYTES_PER_GROUP, BYTES_OTHER = 800, 2_000
+
+
+def count_groups(nodes: int) -> int:
+    # owner and read group per node, namespace and the root level, plus 'cdf:root'
+    namespaces = math.ceil(nodes / NODES_PER_NAMESPACE)
+    return 2 * (nodes + namespaces + 1) + 1
+
+
+def count_datasets(nodes: int) -> int:
+    return nodes + math.ceil(nodes / NODES_PER_NAMESPACE) + 1
+
+
+def delete(config_path: Path) -> None:
+    CommandDelete(str(config_path), command=CommandMode.DELETE, debug=False).command()
+
+
+def assert_budget(max_calls: dict[str, int], max_request_bytes: int) -> None:
+    summary = API_METRICS.summary()
+    calls = {endpoint: s["calls"] for endpoint, s in summary.items()}
+    over_budget = {
+        endpoint: f"{count} > {max_calls.get(endpoint, 0)}"
+        for endpoint, count in calls.items()
+        if count > max_calls.get(endpoint, 0)
+    }
+    assert not over_budget, f"API calls over budget: {over_budget}"
+    request_bytes = sum(s["request_bytes"] for s in summary.values())
+    assert request_bytes <= max_request_bytes, f"{request_bytes} bytes sent > {max_request_bytes}"
+
+
+@pytest.fixture
+def configs(config_factory: Callable[..., Path]) -> dict[str, Path]:
+    return {
+        "base": config_factory(NODES, NODES_PER_NAMESPACE, name="base.yml"),
+        "added": config_factory(NODES + 1, NODES_PER_NAMESPACE, name="added.yml"),
+    }
+
+
+def write_delete_config(path: Path, cdf: CdfStandin, node_name: str) -> Path:
+    """Delete config of all resources of 'node_name'"""
+    space_name = node_name.replace(":", "-")
+    delete_or_deprecate = {
+        "groups": [name for name in cdf.names("groups") if name.startswith(f"cdf:{node_name}:")],
+        "spaces": [name for name in cdf.names("spaces") if name.startswith(space_name)],
+        "raw_dbs": [name for name in cdf.names("raw_dbs") if name.startswith(node_name)],
+        "datasets": [name for name in cdf.names("datasets") if name.startswith(node_name)],
+    }
+    path.write_text(yaml.safe_dump({"delete_or_deprecate": delete_or_deprecate, "cognite": COGNITE_SECTION}))
+    return path
+
+
+def test_deploy_fresh_project(cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path]):
+    groups, datasets = count_groups(NODES), count_datasets(NODES)
+    API_METRICS.reset()
+    deploy(configs["base"])
+
+    assert len(cdf.names("groups")) == groups
+    assert_budget(
+        {
+            **LIST_CALLS,
+            # one request per group, as each is created with its own IdP mapping
+            "POST /groups": groups,
+            "POST /datasets": math.ceil(datasets / DATASETS_PER_REQUEST),
+            "POST /datasets/update": math.ceil(datasets / DATASETS_PER_REQUEST),
+            "POST /raw/dbs": 1,
+            "POST /models/spaces": 1,
+        },
+        max_request_bytes=groups * BYTES_PER_GROUP + BYTES_OTHER,
+    )
+
+
+def test_deploy_noop_redeploy(cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path]):
+    groups, datasets = count_groups(NODES), count_datasets(NODES)
+    deploy(configs["base"])
+    API_METRICS.reset()
+    deploy(configs["base"])
+
+    # nothing new, groups are replaced (created and the old ones deleted)
+    assert len(cdf.names("groups")) == groups
+    assert_budget(
+        {
+            **LIST_CALLS,
+            "POST /groups": groups,
+            "POST /groups/delete": groups,
+            "POST /datasets/update": math.ceil(datasets / DATASETS_PER_REQUEST),
+        },
+        max_request_bytes=groups * BYTES_PER_GROUP + BYTES_OTHER,
+    )
+
+
+def test_deploy_one_node_added(cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path]):
+    deploy(configs["base"])
+    groups, datasets = count_groups(NODES + 1), count_datasets(NODES + 1)
+    API_METRICS.reset()
+    deploy(configs["added"])
+
+    assert CHANGED_NODE + ":dataset" in cdf.names("datasets")
+    assert_budget(
+        {
+            **LIST_CALLS,
+            "POST /groups": groups,
+            "POST /groups/delete": count_groups(NODES),
+            # the node's dataset, and the one of its new namespace
+            "POST /datasets": 1,
+            "POST /datasets/update": math.ceil(datasets / DATASETS_PER_REQUEST),
+            "POST /raw/dbs": 1,
+            "POST /models/spaces": 1,
+        },
+        max_request_bytes=groups * BYTES_PER_GROUP + BYTES_OTHER,
+    )
+
+
+def test_deploy_one_node_removed(cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path]):
+    deploy(configs["added"])
+    groups, datasets = count_groups(NODES), count_datasets(NODES)
+    API_METRICS.reset()
+    deploy(configs["base"])
+
+    # deploy never deletes, the groups of the removed node stay until a 'delete'
+    assert f"cdf:{CHANGED_NODE}:owner" in cdf.names("groups")
+    assert_budget(
+        {
+            **LIST_CALLS,
+            "POST /groups": groups,
+            "POST /groups/delete": groups,
+            "POST /datasets/update": math.ceil(datasets / DATASETS_PER_REQUEST),
+        },
+        max_request_bytes=groups * BYTES_PER_GROUP + BYTES_OTHER,
+    )
+
+
+def test_delete_fresh_project(cdf: CdfStandin, tmp_path: Path):
+    delete_config = write_delete_config(tmp_path / "delete.yml", cdf, CHANGED_NODE)
+    API_METRICS.reset()
+    delete(delete_config)
+
+    # nothing deployed, nothing to delete
+    assert_budget(LIST_CALLS, max_request_bytes=BYTES_OTHER)
+
+
+def test_delete_one_node_removed(
+    cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path], tmp_path: Path
+):
+    deploy(configs["added"])
+    delete_config = write_delete_config(tmp_path / "delete.yml", cdf, CHANGED_NODE)
+    API_METRICS.reset()
+    delete(delete_config)
+
+    assert not [name for name in cdf.names("groups") if CHANGED_NODE in name]
+    assert_budget(
+        {
+            **LIST_CALLS,
+            # one request per resource type
+            "POST /groups/delete": 1,
+            "POST /models/spaces/delete": 1,
+            "POST /raw/dbs/delete": 1,
+            # the node's dataset is deprecated
+            "POST /datasets/byids": 1,
+            "POST /datasets/update": 1,
+        },
+        max_request_bytes=BYTES_OTHER,
+    )
+
+
+def test_delete_noop(cdf: CdfStandin, deploy: Callable[[Path], None], configs: dict[str, Path], tmp_path: Path):
+    deploy(configs["added"])
+    delete_config = write_delete_config(tmp_path / "delete.yml", cdf, CHANGED_NODE)
+    delete(delete_config)
+    API_METRICS.reset()
+    delete(delete_config)
+
+    # groups, spaces and RAW DBs are gone, the deprecated dataset is renamed and not found anymore
+    assert_budget(LIST_CALLS, max_request_bytes=BYTES_OTHER)
@@ -0,0 +1,58 @@
+from bootstrap.app_config import CommandMode, RoleType, ScopeCtxType
+from bootstrap.commands.diagram import CommandDiagram
+from tests.constants import ROOT_DIRECTORY
+
+
+def test_resolved_config_expands_shared_access_once():
+    """
+    The namespace tree is expanded once into a shared structure,
+    which contains the scopes of 'shared-access' nodes too.
+    """
+    command = CommandDiagram(
+        str(ROOT_DIRECTORY / "example/config-deploy-example-01.4.yml"),
+        command=CommandMode.DIAGRAM,
+        debug=False,
+        dotenv_path=ROOT_DIRECTORY / "example/.env_mock",
+    )
+    resolved = command.validate_config_length_limits().validate_config_shared_access().resolved
+
+    # cached for the whole run
+    assert command.resolved is resolved
+
+    # 'src:002:weather' has owner shared-access to 'src:001:sap'
+    weather_owner = resolved.get_group(RoleType.OWNER, "src", "src:002:weather")
+    assert weather_owner.group_name == "cdf:src:002:weather:owner"
+    assert weather_owner.scope_ctx_by_role_type[RoleType.OWNER][ScopeCtxType.DATASET] == (
+        "src:002:weather:dataset",
+        "src:001:sap:dataset",
+    )
+    # same lookup used by group generation
+    assert command.get_scope_ctx_groupedby_role_type(RoleType.OWNER, "src", "src:002:weather") == (
+        weather_owner.scope_ctx_by_role_type
+    )
+
+    # targets contain the aggregated levels (using the default features)
+    assert {"allprojects:dataset", "src:allprojects:dataset", "src:001:sap:dataset"} <= set(resolved.datasets)
+    assert resolved.raw_dbs == command.generate_target_raw_dbs()
+    assert not resolved.invalid_shared_access
+
+
+def test_resolved_config_is_not_changed_through_copies():
+    command = CommandDiagram(
+        str(ROOT_DIRECTORY / "example/config-deploy-example-01.4.yml"),
+        command=CommandMode.DIAGRAM,
+        debug=False,
+        dotenv_path=ROOT_DIRECTORY / "example/.env_mock",
+    )
+    resolved = command.resolved
+
+    target_datasets = command.generate_target_datasets()
+    target_datasets["src:001:sap:dataset"]["metadata"] = {"changed": True}
+    target_datasets.clear()
+    scope_ctx_by_role_type = command.get_scope_ctx_groupedby_role_type(RoleType.OWNER, "src", "src:002:weather")
+    scope_ctx_by_role_type[RoleType.OWNER][ScopeCtxType.DATASET] = ()
+
+    assert resolved.datasets["src:001:sap:dataset"].get("metadata") != {"changed": True}
+    assert command.generate_target_datasets() == resolved.datasets
+    owner_scopes = resolved.get_group(RoleType.OWNER, "src", "src:002:weather").scope_ctx_by_role_type[RoleType.OWNER]
+    assert owner_scopes[ScopeCtxType.DATASET] == ("src:002:weather:dataset", "src:001:sap:dataset")
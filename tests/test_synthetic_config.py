@@ -0,0 +1,53 @@
+import pytest
+
+from benchmarks.synthetic_config import generate_config, write_config
+from bootstrap.app_config import CommandMode
+from bootstrap.commands.diagram import CommandDiagram
+from tests.constants import ROOT_DIRECTORY
+
+
+@pytest.mark.parametrize("nodes", [10, 1_000])
+def test_synthetic_config_passes_validations(nodes, tmp_path):
+    config_path = write_config(
+        tmp_path / "config.yml",
+        nodes,
+        nodes_per_namespace=50,
+        space_variants=2,
+        raw_variants=3,
+        shared_access_fanout=3,
+        idp_mappings=20,
+    )
+    command = CommandDiagram(
+        str(config_path),
+        command=CommandMode.DIAGRAM,
+        debug=False,
+        dotenv_path=ROOT_DIRECTORY / "example/.env_mock",
+    )
+    resolved = command.validate_config_length_limits().validate_config_shared_access().resolved
+
+    assert len(command.bootstrap_config.namespaces) == -(-nodes // 50)
+    # node, namespace and root level datasets
+    assert len(resolved.datasets) == nodes + len(command.bootstrap_config.namespaces) + 1
+    # each node has 2 variants and the default space
+    assert len(resolved.spaces) >= 3 * nodes
+    assert len(resolved.raw_dbs) >= 4 * nodes
+    assert len(command.bootstrap_config.get_idp_cdf_mappings_by_group("benchmark")) == 20
+
+
+def test_synthetic_config_is_deterministic_with_shared_access_to_other_nodes():
+    config = generate_config(5, nodes_per_namespace=2, shared_access_fanout=10, idp_mappings=3)
+    assert config == generate_config(5, nodes_per_namespace=2, shared_access_fanout=10, idp_mappings=3)
+
+    namespaces = config["bootstrap"]["namespaces"]
+    assert [ns["ns-name"] for ns in namespaces] == ["ns000", "ns001", "ns002"]
+    node = namespaces[0]["ns-nodes"][0]
+    shared_access = node["shared-access"]
+    # fan-out is limited by the number of other nodes
+    assert [n["node-name"] for n in shared_access["owner"]] == ["ns000:00001:node", "ns001:00002:node"]
+    assert [n["node-name"] for n in shared_access["read"]] == ["ns001:00003:node", "ns002:00004:node"]
+    mappings = config["bootstrap"]["idp-cdf-mappings"][0]["mappings"]
+    assert [m["cdf-group"] for m in mappings] == [
+        "cdf:allprojects:owner",
+        "cdf:allprojects:read",
+        "cdf:ns000:allprojects:owner",
+    ]
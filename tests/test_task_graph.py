@@ -0,0 +1,63 @@
+import threading
+import time
+
+import pytest
+
+from bootstrap.common.task_graph import TaskGraph
+
+
+def test_task_graph_runs_independent_stages_in_parallel():
+    """
+    'raw_dbs', 'spaces' and 'datasets' are independent and must overlap in time,
+    'groups' must only start after 'datasets' finished.
+    """
+    barrier = threading.Barrier(3, timeout=5)
+
+    def independent_stage(name: str):
+        def stage():
+            # only passes if all three independent stages are running at the same time
+            barrier.wait()
+            time.sleep(0.01)
+            return name
+
+        return stage
+
+    graph = TaskGraph("test-deploy")
+    graph.add_stage("raw_dbs", independent_stage("raw_dbs"))
+    graph.add_stage("spaces", independent_stage("spaces"))
+    graph.add_stage("datasets", independent_stage("datasets"))
+    graph.add_stage("groups", lambda: graph.results["datasets"] + ":groups", depends_on=["datasets"])
+
+    results = graph.run()
+
+    assert results["groups"] == "datasets:groups"
+    assert graph.timings["groups"].start >= graph.timings["datasets"].end
+    # wall-clock approaches the longest path, not the sum of all stages
+    assert graph.wall_time < sum(timing.duration for timing in graph.timings.values())
+
+
+def test_task_graph_stops_on_failing_stage():
+    def failing_stage():
+        raise RuntimeError("datasets failed")
+
+    graph = TaskGraph("test-deploy")
+    graph.add_stage("datasets", failing_stage)
+    graph.add_stage("groups", lambda: "never", depends_on=["datasets"])
+
+    with pytest.raises(RuntimeError, match="datasets failed"):
+        graph.run()
+
+    assert "groups" not in graph.timings
+
+
+def test_task_graph_rejects_cycles_and_unknown_dependencies():
+    graph = TaskGraph("test-cycle")
+    graph.add_stage("a", lambda: None, depends_on=["b"])
+    graph.add_stage("b", lambda: None, depends_on=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        graph.run()
+
+    graph = TaskGraph("test-unknown")
+    graph.add_stage("a", lambda: None, depends_on=["missing"])
+    with pytest.raises(ValueError, match="unknown"):
+        graph.run()
@@ -0,0 +1,91 @@
+import time
+from pathlib import Path
+
+import cognite.client
+import pytest
+
+from bootstrap.common.cognite_client import CogniteConfig, get_cognite_client
+from bootstrap.common.token_cache import TokenCache, get_uncachable_reason
+from tests.cdf_standin import CdfStandin
+
+
+def get_client(token_cdf: CdfStandin, token_cache_dir: Path, client_secret: str = "standin-client-secret"):
+    envs = token_cdf.envs()
+    return get_cognite_client(
+        CogniteConfig(
+            host=envs["BOOTSTRAP_CDF_HOST"],
+            project=envs["BOOTSTRAP_CDF_PROJECT"],
+            idp_authentication={
+                "client_id": envs["BOOTSTRAP_IDP_CLIENT_ID"],
+                "secret": client_secret,
+                "scopes": [envs["BOOTSTRAP_IDP_SCOPES"]],
+                "token_url": envs["BOOTSTRAP_IDP_TOKEN_URL"],
+                "token_cache_dir": str(token_cache_dir),
+            },
+        )
+    )
+
+
+@pytest.fixture
+def token_cdf(monkeypatch: pytest.MonkeyPatch):
+    """Own stand-in project, the clients are configured from its envs and not through the environment"""
+    with CdfStandin(project="token-cache") as token_cdf:
+        monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", "1")
+        yield token_cdf
+
+
+def token_requests(token_cdf: CdfStandin) -> int:
+    return token_cdf.requests.count(("POST", "/token"))
+
+
+def test_token_is_reused_by_later_clients(token_cdf: CdfStandin, tmp_path: Path):
+    get_client(token_cdf, tmp_path).iam.groups.list()
+    get_client(token_cdf, tmp_path).iam.groups.list()
+
+    assert token_requests(token_cdf) == 1
+    (cache_file,) = tmp_path.glob("token-*.bin")
+    # encrypted at rest
+    assert b"standin-token" not in cache_file.read_bytes()
+
+
+def test_other_secret_is_a_cache_miss(token_cdf: CdfStandin, tmp_path: Path):
+    get_client(token_cdf, tmp_path).iam.groups.list()
+    get_client(token_cdf, tmp_path, client_secret="rotated-secret").iam.groups.list()
+
+    assert token_requests(token_cdf) == 2
+
+
+def test_expiring_token_is_refreshed(token_cdf: CdfStandin, tmp_path: Path):
+    envs = token_cdf.envs()
+    token_cache = TokenCache(
+        tmp_path,
+        token_url=envs["BOOTSTRAP_IDP_TOKEN_URL"],
+        client_id=envs["BOOTSTRAP_IDP_CLIENT_ID"],
+        client_secret=envs["BOOTSTRAP_IDP_CLIENT_SECRET"],
+        scopes=[envs["BOOTSTRAP_IDP_SCOPES"]],
+    )
+    # within the SDK's expiry leeway (30s)
+    token_cache.store("almost-expired", time.time() + 10)
+    assert token_cache.load()[0] == "almost-expired"
+
+    get_client(token_cdf, tmp_path).iam.groups.list()
+
+    assert token_requests(token_cdf) == 1
+    assert token_cache.load()[0] == "standin-token"
+
+
+def test_sdk_internals_are_cachable():
+    # fails if an update of cognite-sdk changed the private method which is overridden
+    assert get_uncachable_reason() is None
+
+
+def test_unknown_sdk_version_is_not_cached(
+    token_cdf: CdfStandin, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    monkeypatch.setattr(cognite.client, "__version__", "8.0.0")
+    get_client(token_cdf, tmp_path).iam.groups.list()
+    get_client(token_cdf, tmp_path).iam.groups.list()
+
+    assert token_requests(token_cdf) == 2
+    assert not list(tmp_path.glob("token-*.bin"))
+    assert "Token cache directory is not used: cognite-sdk 8.0.0" in caplog.text
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from bootstrap.common.task_graph import TaskGraph
+from bootstrap.common.tracing import TraceFormat, Tracer, traced
+
+
+@pytest.fixture
+def tracer(monkeypatch: pytest.MonkeyPatch) -> Tracer:
+    tracer = Tracer()
+    monkeypatch.setattr("bootstrap.common.tracing.TRACER", tracer)
+    monkeypatch.setattr("bootstrap.common.task_graph.TRACER", tracer)
+    return tracer
+
+
+def test_spans_are_nested_across_task_graph_threads(tracer: Tracer):
+    @traced()
+    def load(resource_type: str) -> None:
+        tracer.set_attributes(resource_type=resource_type)
+
+    with tracer.span("command") as root:
+        graph = TaskGraph("deploy")
+        graph.add_stage("datasets", lambda: load("datasets"))
+        graph.add_stage("groups", lambda: load("groups"), depends_on=["datasets"])
+        graph.run()
+
+    spans = {(span.name, span.attributes.get("resource_type")): span for span in tracer.spans}
+    stage = spans[("deploy.groups", None)]
+    assert stage.parent_id == root.span_id and stage.thread_name.startswith("deploy")
+    assert spans[("test_spans_are_nested_across_task_graph_threads.<locals>.load", "groups")].parent_id == stage.span_id
+    assert all(span.end_perf_ns and span.trace_id == root.trace_id for span in tracer.spans)
+
+
+def test_span_errors_and_exports(tracer: Tracer, tmp_path: Path):
+    with pytest.raises(ValueError):
+        with tracer.span("command", dry_run=True):
+            with tracer.span("generate_groups", count=3):
+                raise ValueError("boom")
+
+    tracer.write(tmp_path / "trace.json")
+    otel_spans = json.loads((tmp_path / "trace.json").read_text())["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    command, groups = otel_spans
+    assert groups["parentSpanId"] == command["spanId"] and "parentSpanId" not in command
+    assert groups["status"] == {"code": 2, "message": "ValueError: boom"}
+    assert {"key": "count", "value": {"intValue": "3"}} in groups["attributes"]
+    assert {"key": "dry_run", "value": {"boolValue": True}} in command["attributes"]
+    assert int(groups["endTimeUnixNano"]) >= int(groups["startTimeUnixNano"])
+
+    tracer.write(tmp_path / "trace.chrome.json", TraceFormat.chrome)
+    events = json.loads((tmp_path / "trace.chrome.json").read_text())["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["command", "generate_groups"]
+    assert complete[1]["args"] == {"count": 3, "error": "ValueError: boom"}
+    assert complete[0]["dur"] >= complete[1]["dur"]
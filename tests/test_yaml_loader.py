@@ -0,0 +1,18 @@
+import pytest
+from dependency_injector import providers
+
+from bootstrap.app_container import get_yaml_loader
+from tests.constants import ROOT_DIRECTORY
+
+
+@pytest.mark.parametrize("config_path", sorted((ROOT_DIRECTORY / "example").glob("config-*.yml")))
+def test_fast_yaml_loader_gives_identical_config(config_path, monkeypatch):
+    monkeypatch.setenv("BOOTSTRAP_CDF_PROJECT", "shiny-dev")
+
+    configs = []
+    for fast in (False, True):
+        config = providers.Configuration()
+        config.from_yaml(config_path, required=True, loader=get_yaml_loader(fast=fast))
+        configs.append(config())
+
+    assert configs[0] == configs[1]